@@ -1,8 +1,18 @@
 from flask import Flask
 
 from app.api import register_blueprints
+from app.cli import register_commands
 from app.config import Config
 from app.extensions import db, jwt, migrate
+from app.services.bulk_matching import bulk_matching_jobs
+from app.services.match_cache import match_cache
+from app.services.matching_index import matching_index
+from app.services.metrics import request_metrics
+from app.services.password_hashing import password_hasher
+from app.services.profiler import request_profiler
+from app.services.response_cache import response_cache
+from app.services.subject_catalog import subject_catalog
+from app.services.token_revocation import token_revocation
 
 
 def create_app(config_class: type | None = None) -> Flask:
@@ -12,7 +22,18 @@ def create_app(config_class: type | None = None) -> Flask:
     db.init_app(app)
     migrate.init_app(app, db)
     jwt.init_app(app)
+    password_hasher.init_app(app)
+    token_revocation.init_app(app)
+    matching_index.init_app(app)
+    match_cache.init_app(app)
+    bulk_matching_jobs.init_app(app)
+    subject_catalog.init_app(app)
+    response_cache.init_app(app)
+    request_metrics.init_app(app)
+    # After request_metrics: its after_request hook must run later and still see the SQL log.
+    request_profiler.init_app(app)
 
     register_blueprints(app)
+    register_commands(app)
 
     return app
@@ -9,10 +9,12 @@ lesson_requests_bp = Blueprint("lesson_requests", __name__, url_prefix="/lesson-
 lessons_bp = Blueprint("lessons", __name__, url_prefix="/lessons")
 matching_bp = Blueprint("matching", __name__, url_prefix="/matching")
 subjects_bp = Blueprint("subjects", __name__, url_prefix="/subjects")
+metrics_bp = Blueprint("metrics", __name__)
+profiles_bp = Blueprint("profiles", __name__, url_prefix="/profiles")
 
 
 def register_blueprints(app: Flask) -> None:
-    from app.api import auth, availability, lesson_requests, lessons, matching, students, subjects, tutors  # noqa: F401
+    from app.api import auth, availability, lesson_requests, lessons, matching, metrics, profiles, students, subjects, tutors  # noqa: F401
 
     app.register_blueprint(auth_bp)
     app.register_blueprint(students_bp)
@@ -22,3 +24,5 @@ def register_blueprints(app: Flask) -> None:
     app.register_blueprint(lessons_bp)
     app.register_blueprint(matching_bp)
     app.register_blueprint(subjects_bp)
+    app.register_blueprint(metrics_bp)
+    app.register_blueprint(profiles_bp)
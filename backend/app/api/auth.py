@@ -2,6 +2,7 @@ from flask import jsonify, request
 from flask_jwt_extended import (
     create_access_token,
     create_refresh_token,
+    get_jwt,
     get_jwt_identity,
     jwt_required,
 )
@@ -9,10 +10,19 @@ from flask_jwt_extended import (
 from app.api import auth_bp
 from app.extensions import db
 from app.models import User
+from app.services.password_hashing import PasswordHasherBusy
+from app.services.token_revocation import token_revocation
+from app.utils.identity import claims_for_user
 
 ALLOWED_REGISTRATION_ROLES = {"student", "tutor"}
 
 
+def _hasher_busy():
+    response = jsonify({"message": "Too many sign-in attempts right now. Try again shortly."})
+    response.headers["Retry-After"] = "1"
+    return response, 503
+
+
 def _user_to_dict(user: User) -> dict:
     return {
         "id": user.id,
@@ -40,7 +50,10 @@ def register():
         return jsonify({"message": "Email already registered."}), 400
 
     user = User(email=email, role=role)
-    user.set_password(password)
+    try:
+        user.set_password(password)
+    except PasswordHasherBusy:
+        return _hasher_busy()
 
     db.session.add(user)
     db.session.commit()
@@ -58,10 +71,16 @@ def login():
         return jsonify({"message": "Email and password are required."}), 400
 
     user = User.query.filter_by(email=email).first()
-    if not user or not user.check_password(password):
-        return jsonify({"message": "Invalid credentials."}), 401
-
-    additional_claims = {"role": user.role}
+    try:
+        if not user or not user.check_password(password):
+            return jsonify({"message": "Invalid credentials."}), 401
+        if user.password_needs_rehash():
+            user.set_password(password)
+            db.session.commit()
+    except PasswordHasherBusy:
+        return _hasher_busy()
+
+    additional_claims = claims_for_user(user)
     access_token = create_access_token(
         identity=str(user.id), additional_claims=additional_claims
     )
@@ -81,6 +100,26 @@ def login():
     )
 
 
+@auth_bp.route("/refresh", methods=["POST"])
+@jwt_required(refresh=True)
+def refresh():
+    user = db.session.get(User, get_jwt_identity())
+    if not user or not user.is_active:
+        return jsonify({"message": "Invalid credentials."}), 401
+
+    # Claims are rebuilt so a profile created since login is picked up.
+    access_token = create_access_token(identity=str(user.id), additional_claims=claims_for_user(user))
+    return jsonify({"access_token": access_token}), 200
+
+
+@auth_bp.route("/logout", methods=["POST"])
+@jwt_required(verify_type=False)
+def logout():
+    """Revoke the presented token; call once with the access and once with the refresh token."""
+    token_revocation.revoke(get_jwt())
+    return jsonify({"message": "Token revoked."}), 200
+
+
 @auth_bp.route("/me", methods=["GET"])
 @jwt_required()
 def me():
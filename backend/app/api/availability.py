@@ -1,15 +1,22 @@
+import uuid
 from datetime import datetime
 
 from flask import Blueprint, jsonify, request
 from flask_jwt_extended import get_jwt, jwt_required
+from sqlalchemy import delete, func, insert
 
 from app.api import availability_bp
 from app.extensions import db
 from app.models import AvailabilitySlot
+from app.services.matching_index import matching_index
+from app.services.response_cache import conditional_get
+from app.utils.availability import TimeWindow, merge_windows
 
 # Blueprint imported from app.api to ensure shared registration
 assert isinstance(availability_bp, Blueprint)
 
+MAX_WEEKLY_SLOTS = 200
+
 
 def _parse_time(value: str):
     try:
@@ -27,8 +34,26 @@ def _serialize_slot(slot: AvailabilitySlot) -> dict:
     }
 
 
+def _serialize_slot_window(slot_id: str, window: TimeWindow) -> dict:
+    return {
+        "id": slot_id,
+        "day_of_week": window.day_of_week,
+        "start_time": window.start_time.strftime("%H:%M"),
+        "end_time": window.end_time.strftime("%H:%M"),
+    }
+
+
+def _availability_version():
+    claims = get_jwt()
+    user_id = claims.get("sub") or claims.get("user_id")
+    return db.session.query(
+        func.count(AvailabilitySlot.id), func.max(AvailabilitySlot.updated_at)
+    ).filter(AvailabilitySlot.user_id == user_id).one()
+
+
 @availability_bp.route("/me", methods=["GET"])
 @jwt_required()
+@conditional_get(_availability_version)
 def list_my_availability():
     claims = get_jwt()
     user_id = claims.get("sub") or claims.get("user_id")
@@ -37,6 +62,89 @@ def list_my_availability():
     return jsonify([_serialize_slot(slot) for slot in slots])
 
 
+@availability_bp.route("/me", methods=["PUT"])
+@jwt_required()
+def replace_my_availability():
+    """Replace the caller's whole weekly schedule in one transaction.
+
+    Accepts ``{"slots": [...]}`` (or a bare list) of ``day_of_week``/``start_time``/
+    ``end_time`` entries. Overlapping and touching entries are merged first, rows that
+    already match a merged window are kept, and the rest are deleted and inserted with
+    one bulk statement each.
+    """
+    claims = get_jwt()
+    user_id = claims.get("sub") or claims.get("user_id")
+    data = request.get_json(silent=True)
+    entries = data.get("slots") if isinstance(data, dict) else data
+
+    if not isinstance(entries, list):
+        return jsonify({"message": "Invalid data", "errors": {"slots": "Must be a list."}}), 400
+    if len(entries) > MAX_WEEKLY_SLOTS:
+        return (
+            jsonify({"message": "Invalid data", "errors": {"slots": f"At most {MAX_WEEKLY_SLOTS} slots."}}),
+            400,
+        )
+
+    errors = {}
+    windows = []
+    for position, entry in enumerate(entries):
+        if not isinstance(entry, dict):
+            errors[str(position)] = "Must be an object."
+            continue
+        day_of_week = entry.get("day_of_week")
+        start_time = _parse_time(entry.get("start_time"))
+        end_time = _parse_time(entry.get("end_time"))
+        entry_errors = {}
+        if day_of_week is None or not isinstance(day_of_week, int) or not 0 <= day_of_week <= 6:
+            entry_errors["day_of_week"] = "Must be an integer between 0 and 6."
+        if not start_time:
+            entry_errors["start_time"] = "Invalid start_time format. Use HH:MM."
+        if not end_time:
+            entry_errors["end_time"] = "Invalid end_time format. Use HH:MM."
+        if start_time and end_time and end_time <= start_time:
+            entry_errors["time_range"] = "end_time must be greater than start_time."
+        if entry_errors:
+            errors[str(position)] = entry_errors
+        else:
+            windows.append(TimeWindow(day_of_week, start_time, end_time))
+
+    if errors:
+        return jsonify({"message": "Invalid data", "errors": errors}), 400
+
+    wanted = set(merge_windows(windows))
+    kept = {}
+    stale_ids = []
+    for slot in AvailabilitySlot.query.filter_by(user_id=user_id):
+        window = TimeWindow(slot.day_of_week, slot.start_time, slot.end_time)
+        if window in wanted and window not in kept:
+            kept[window] = slot.id
+        else:
+            stale_ids.append(slot.id)
+
+    new_rows = [
+        {
+            "id": str(uuid.uuid4()),
+            "user_id": user_id,
+            "day_of_week": window.day_of_week,
+            "start_time": window.start_time,
+            "end_time": window.end_time,
+        }
+        for window in wanted
+        if window not in kept
+    ]
+    if stale_ids:
+        db.session.execute(delete(AvailabilitySlot).where(AvailabilitySlot.id.in_(stale_ids)))
+    if new_rows:
+        db.session.execute(insert(AvailabilitySlot), new_rows)
+    db.session.commit()
+    if stale_ids or new_rows:
+        matching_index.refresh_slots(user_id)
+
+    ids = dict(kept)
+    ids.update((TimeWindow(row["day_of_week"], row["start_time"], row["end_time"]), row["id"]) for row in new_rows)
+    return jsonify([_serialize_slot_window(ids[window], window) for window in sorted(ids)])
+
+
 @availability_bp.route("", methods=["POST"])
 @jwt_required()
 def create_availability():
@@ -69,6 +177,7 @@ def create_availability():
     )
     db.session.add(slot)
     db.session.commit()
+    matching_index.refresh_slots(user_id)
 
     return jsonify(_serialize_slot(slot)), 201
 
@@ -114,6 +223,7 @@ def update_availability(slot_id):
         return jsonify({"message": "Invalid data", "errors": errors}), 400
 
     db.session.commit()
+    matching_index.refresh_slots(user_id)
     return jsonify(_serialize_slot(slot))
 
 
@@ -129,4 +239,5 @@ def delete_availability(slot_id):
 
     db.session.delete(slot)
     db.session.commit()
+    matching_index.refresh_slots(user_id)
     return jsonify({"message": "Deleted"}), 200
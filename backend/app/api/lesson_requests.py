@@ -1,52 +1,127 @@
 from flask import Blueprint, jsonify, request
 from flask_jwt_extended import get_jwt, jwt_required
+from sqlalchemy import func
+from sqlalchemy.orm import selectinload
 
 from app.api import lesson_requests_bp
 from app.extensions import db
-from app.models import LessonRequest, StudentProfile
+from app.models import LessonRequest, LessonRequestSubject, StudentProfile, Subject
+from app.models.lesson import ALLOWED_LESSON_MODES
 from app.models.lesson_request import ALLOWED_REQUEST_STATUSES
+from app.services.match_cache import schedule_precompute
+from app.services.response_cache import conditional_get
+from app.utils.identity import current_profile_id
+from app.utils.security import role_required
 
 # Blueprint imported from app.api to ensure shared registration
 assert isinstance(lesson_requests_bp, Blueprint)
 
 
-def _get_current_student_profile():
+def _get_current_student_id():
     claims = get_jwt()
     role = claims.get("role")
     if role != "student":
         return None, (jsonify({"message": "Forbidden"}), 403)
 
-    user_id = claims.get("sub") or claims.get("user_id")
-    student = StudentProfile.query.filter_by(user_id=user_id).first()
-    if not student:
+    student_id = current_profile_id()
+    if not student_id:
         return None, (jsonify({"message": "Student profile not found"}), 404)
 
-    return student, None
+    return student_id, None
 
 
 def _serialize_request(request_obj: LessonRequest) -> dict:
     return request_obj.to_dict()
 
 
+def _with_links(query):
+    return query.options(
+        selectinload(LessonRequest.subject_links), selectinload(LessonRequest.mode_links)
+    )
+
+
+def _validate_subject_ids(subject_ids) -> str | None:
+    if not isinstance(subject_ids, list) or not subject_ids:
+        return "subject_ids must be a non-empty list of IDs."
+    wanted = {str(subject_id) for subject_id in subject_ids}
+    found = {
+        subject_id
+        for (subject_id,) in db.session.query(Subject.id).filter(Subject.id.in_(wanted))
+    }
+    if wanted - found:
+        return "Unknown subject_ids: " + ", ".join(sorted(wanted - found))
+    return None
+
+
+def _validate_preferred_modes(preferred_modes) -> str | None:
+    if not isinstance(preferred_modes, list):
+        return "preferred_modes must be a list."
+    if set(preferred_modes) - ALLOWED_LESSON_MODES:
+        return "Invalid preferred_modes."
+    return None
+
+
+@lesson_requests_bp.route("", methods=["GET"])
+@role_required("admin")
+def list_requests():
+    query = _with_links(LessonRequest.query)
+
+    status = request.args.get("status")
+    if status:
+        if status not in ALLOWED_REQUEST_STATUSES:
+            return jsonify({"message": "Invalid data", "errors": {"status": "Invalid status."}}), 400
+        query = query.filter(LessonRequest.status == status)
+
+    subject_id = request.args.get("subject_id")
+    if subject_id:
+        query = query.join(
+            LessonRequestSubject, LessonRequestSubject.lesson_request_id == LessonRequest.id
+        ).filter(LessonRequestSubject.subject_id == subject_id)
+
+    requests = query.order_by(LessonRequest.created_at.desc()).all()
+    return jsonify([_serialize_request(req) for req in requests])
+
+
+def _my_requests_version():
+    claims = get_jwt()
+    if claims.get("role") != "student":
+        return None
+    user_id = claims.get("sub") or claims.get("user_id")
+    profiles, count, updated_at = (
+        db.session.query(
+            func.count(StudentProfile.id.distinct()),
+            func.count(LessonRequest.id),
+            func.max(LessonRequest.updated_at),
+        )
+        .select_from(StudentProfile)
+        .outerjoin(LessonRequest, LessonRequest.student_id == StudentProfile.id)
+        .filter(StudentProfile.user_id == user_id)
+        .one()
+    )
+    # No profile: let the view answer 404 uncached.
+    return (count, updated_at) if profiles else None
+
+
 @lesson_requests_bp.route("/me", methods=["GET"])
 @jwt_required()
+@conditional_get(_my_requests_version)
 def list_my_requests():
-    student, error_response = _get_current_student_profile()
+    student_id, error_response = _get_current_student_id()
     if error_response:
         return error_response
 
-    requests = LessonRequest.query.filter_by(student_id=student.id).all()
+    requests = _with_links(LessonRequest.query).filter_by(student_id=student_id).all()
     return jsonify([_serialize_request(req) for req in requests])
 
 
 @lesson_requests_bp.route("/<request_id>", methods=["GET"])
 @jwt_required()
 def get_request(request_id):
-    student, error_response = _get_current_student_profile()
+    student_id, error_response = _get_current_student_id()
     if error_response:
         return error_response
 
-    req = LessonRequest.query.filter_by(id=request_id, student_id=student.id).first()
+    req = LessonRequest.query.filter_by(id=request_id, student_id=student_id).first()
     if not req:
         return jsonify({"message": "Not found"}), 404
 
@@ -56,7 +131,7 @@ def get_request(request_id):
 @lesson_requests_bp.route("", methods=["POST"])
 @jwt_required()
 def create_request():
-    student, error_response = _get_current_student_profile()
+    student_id, error_response = _get_current_student_id()
     if error_response:
         return error_response
 
@@ -66,17 +141,19 @@ def create_request():
     preferred_modes = data.get("preferred_modes") or []
 
     errors = {}
-    if not isinstance(subject_ids, list) or not subject_ids:
-        errors["subject_ids"] = "subject_ids must be a non-empty list of IDs."
+    subject_error = _validate_subject_ids(subject_ids)
+    if subject_error:
+        errors["subject_ids"] = subject_error
+    modes_error = _validate_preferred_modes(preferred_modes)
+    if modes_error:
+        errors["preferred_modes"] = modes_error
 
     if errors:
         return jsonify({"message": "Invalid data", "errors": errors}), 400
 
-    lesson_request = LessonRequest(student_id=student.id)
-    if isinstance(subject_ids, list):
-        lesson_request.set_subject_id_list(subject_ids)
-    if isinstance(preferred_modes, list):
-        lesson_request.set_preferred_modes(preferred_modes)
+    lesson_request = LessonRequest(student_id=student_id)
+    lesson_request.set_subject_id_list(subject_ids)
+    lesson_request.set_preferred_modes(preferred_modes)
 
     for field in [
         "budget_min",
@@ -91,6 +168,7 @@ def create_request():
 
     db.session.add(lesson_request)
     db.session.commit()
+    schedule_precompute(lesson_request.id)
 
     return jsonify(_serialize_request(lesson_request)), 201
 
@@ -98,14 +176,14 @@ def create_request():
 @lesson_requests_bp.route("/<request_id>", methods=["PUT"])
 @jwt_required()
 def update_request(request_id):
-    student, error_response = _get_current_student_profile()
+    student_id, error_response = _get_current_student_id()
     if error_response:
         return error_response
 
     data = request.get_json() or {}
 
     lesson_request = LessonRequest.query.filter_by(
-        id=request_id, student_id=student.id
+        id=request_id, student_id=student_id
     ).first()
     if not lesson_request:
         return jsonify({"message": "Not found"}), 404
@@ -114,15 +192,17 @@ def update_request(request_id):
 
     if "subject_ids" in data:
         subject_ids = data.get("subject_ids") or []
-        if not isinstance(subject_ids, list) or not subject_ids:
-            errors["subject_ids"] = "subject_ids must be a non-empty list of IDs."
+        subject_error = _validate_subject_ids(subject_ids)
+        if subject_error:
+            errors["subject_ids"] = subject_error
         else:
             lesson_request.set_subject_id_list(subject_ids)
 
     if "preferred_modes" in data:
         preferred_modes = data.get("preferred_modes") or []
-        if not isinstance(preferred_modes, list):
-            errors["preferred_modes"] = "preferred_modes must be a list."
+        modes_error = _validate_preferred_modes(preferred_modes)
+        if modes_error:
+            errors["preferred_modes"] = modes_error
         else:
             lesson_request.set_preferred_modes(preferred_modes)
 
@@ -146,18 +226,19 @@ def update_request(request_id):
         return jsonify({"message": "Invalid data", "errors": errors}), 400
 
     db.session.commit()
+    schedule_precompute(lesson_request.id)
     return jsonify(_serialize_request(lesson_request))
 
 
 @lesson_requests_bp.route("/<request_id>", methods=["DELETE"])
 @jwt_required()
 def delete_request(request_id):
-    student, error_response = _get_current_student_profile()
+    student_id, error_response = _get_current_student_id()
     if error_response:
         return error_response
 
     lesson_request = LessonRequest.query.filter_by(
-        id=request_id, student_id=student.id
+        id=request_id, student_id=student_id
     ).first()
     if not lesson_request:
         return jsonify({"message": "Not found"}), 404
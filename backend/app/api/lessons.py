@@ -1,16 +1,40 @@
-from datetime import datetime
+import json
+from datetime import datetime, timedelta
+from itertools import islice
 
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, Response, jsonify, request, stream_with_context
 from flask_jwt_extended import get_jwt, jwt_required
+from sqlalchemy import and_, case, func, or_
+from sqlalchemy.exc import IntegrityError
 
 from app.api import lessons_bp
 from app.extensions import db
 from app.models import Lesson, StudentProfile, Subject, TutorProfile
 from app.models.lesson import ALLOWED_LESSON_MODES, ALLOWED_LESSON_STATUSES
+from app.services.booking import (
+    BLOCKING_LESSON_STATUSES,
+    MAX_LESSON_MINUTES,
+    SLOT_STEP_MINUTES,
+    bookable_slots,
+    booking_errors,
+    booking_guard,
+    local_now,
+    to_local,
+)
+from app.services.response_cache import conditional_get
+from app.services.subject_catalog import subject_catalog
+from app.utils.identity import current_profile, current_profile_id
+from app.utils.pagination import decode_cursor, encode_cursor
 
 # Blueprint imported from app.api to ensure shared registration
 assert isinstance(lessons_bp, Blueprint)
 
+DEFAULT_LESSON_LIMIT = 50
+MAX_LESSON_LIMIT = 200
+LESSON_STREAM_BATCH = 500
+MAX_SLOT_WEEKS = 12
+MAX_SLOT_LIMIT = 50
+
 
 def _parse_iso_datetime(value: str):
     if not value:
@@ -18,60 +42,250 @@ def _parse_iso_datetime(value: str):
     try:
         if isinstance(value, str) and value.endswith("Z"):
             value = value.replace("Z", "+00:00")
-        return datetime.fromisoformat(value)
+        parsed = datetime.fromisoformat(value)
     except (TypeError, ValueError):
         return None
+    # Lesson times are naive local wall-clock times; naive input is taken as such.
+    return to_local(parsed)
 
 
-def _get_current_student():
-    claims = get_jwt()
-    if claims.get("role") != "student":
-        return None
-    user_id = claims.get("sub") or claims.get("user_id")
-    return StudentProfile.query.filter_by(user_id=user_id).first()
+def _lesson_too_long(start_datetime: datetime, end_datetime: datetime) -> bool:
+    return end_datetime - start_datetime > timedelta(minutes=MAX_LESSON_MINUTES)
 
 
-def _get_current_tutor():
-    claims = get_jwt()
-    if claims.get("role") != "tutor":
-        return None
-    user_id = claims.get("sub") or claims.get("user_id")
-    return TutorProfile.query.filter_by(user_id=user_id).first()
+def _booking_conflict(errors: dict):
+    return jsonify({"message": "Booking conflict", "errors": errors}), 409
+
+
+def _with_names(query):
+    """Add the subject, tutor and student names to a Lesson query as extra columns.
+
+    Rows come back as ``(lesson, subject_name, tutor_name, student_name)`` so
+    serialization never lazy-loads the related profiles.
+    """
+    return (
+        query.outerjoin(Subject, Subject.id == Lesson.subject_id)
+        .outerjoin(TutorProfile, TutorProfile.id == Lesson.tutor_id)
+        .outerjoin(StudentProfile, StudentProfile.id == Lesson.student_id)
+        .add_columns(Subject.name, TutorProfile.full_name, StudentProfile.full_name)
+    )
 
 
-def _serialize_lesson(lesson: Lesson) -> dict:
+def _serialize_lesson(lesson: Lesson, subject_name=None, tutor_name=None, student_name=None) -> dict:
     data = lesson.to_dict()
-    if lesson.subject:
-        data["subject_name"] = lesson.subject.name
-    if lesson.tutor:
-        data["tutor_name"] = lesson.tutor.full_name
-    if lesson.student:
-        data["student_name"] = lesson.student.full_name
+    if subject_name is not None:
+        data["subject_name"] = subject_name
+    if tutor_name is not None:
+        data["tutor_name"] = tutor_name
+    if student_name is not None:
+        data["student_name"] = student_name
     return data
 
 
+def _decode_lesson_cursor(value: str):
+    try:
+        start_datetime, lesson_id = decode_cursor(value)
+        return datetime.fromisoformat(start_datetime), str(lesson_id)
+    except (TypeError, ValueError):
+        return None
+
+
+def _stream_lessons(query):
+    yield "["
+    for index, row in enumerate(_with_names(query).yield_per(LESSON_STREAM_BATCH)):
+        yield ("," if index else "") + json.dumps(_serialize_lesson(*row))
+    yield "]"
+
+
+def _my_lessons_version():
+    """Version of the caller's lesson list; ``None`` for admins and unknown roles.
+
+    Covers the lessons, both parties' profiles (their names are serialized) and the
+    subject catalog. Counting upcoming lessons makes ``when=upcoming|past`` pages
+    change version as lessons start.
+    """
+    claims = get_jwt()
+    role = claims.get("role")
+    if role == "student":
+        own, other, own_key, other_key = StudentProfile, TutorProfile, Lesson.student_id, Lesson.tutor_id
+    elif role == "tutor":
+        own, other, own_key, other_key = TutorProfile, StudentProfile, Lesson.tutor_id, Lesson.student_id
+    else:
+        return None
+
+    user_id = claims.get("sub") or claims.get("user_id")
+    profiles, *version = (
+        db.session.query(
+            func.count(own.id.distinct()),
+            func.count(Lesson.id),
+            func.max(Lesson.updated_at),
+            func.sum(case((Lesson.start_datetime >= local_now(), 1), else_=0)),
+            func.max(own.updated_at),
+            func.max(other.updated_at),
+        )
+        .select_from(own)
+        .outerjoin(Lesson, own_key == own.id)
+        .outerjoin(other, other.id == other_key)
+        .filter(own.user_id == user_id)
+        .one()
+    )
+    if not profiles:
+        return None
+    return (*version, subject_catalog.snapshot().etag)
+
+
 @lessons_bp.route("/me", methods=["GET"])
 @jwt_required()
+@conditional_get(_my_lessons_version)
 def list_my_lessons():
+    """List the caller's lessons ordered by ``(start_datetime, id)``.
+
+    Query parameters: ``limit``, ``cursor`` (from the previous page's
+    ``X-Next-Cursor`` header), ``status``, ``from``/``to`` bounds on
+    ``start_datetime``, and ``when=upcoming|past``. Past lessons are listed newest
+    first. Without ``limit`` or ``cursor`` every matching lesson is returned, as
+    before paging existed; admins get that list as a streamed array. A ``cursor``
+    without ``limit`` pages by ``DEFAULT_LESSON_LIMIT``.
+    """
     claims = get_jwt()
     role = claims.get("role")
 
     if role == "student":
-        student = _get_current_student()
-        if not student:
+        student_id = current_profile_id()
+        if not student_id:
             return jsonify({"message": "Student profile not found"}), 404
-        lessons = Lesson.query.filter_by(student_id=student.id).all()
+        query = Lesson.query.filter_by(student_id=student_id)
     elif role == "tutor":
-        tutor = _get_current_tutor()
-        if not tutor:
+        tutor_id = current_profile_id()
+        if not tutor_id:
             return jsonify({"message": "Tutor profile not found"}), 404
-        lessons = Lesson.query.filter_by(tutor_id=tutor.id).all()
+        query = Lesson.query.filter_by(tutor_id=tutor_id)
     elif role == "admin":
-        lessons = Lesson.query.all()
+        query = Lesson.query
     else:
         return jsonify({"message": "Forbidden"}), 403
 
-    return jsonify([_serialize_lesson(lesson) for lesson in lessons])
+    errors = {}
+    paginate = "limit" in request.args or "cursor" in request.args
+    limit = request.args.get("limit", DEFAULT_LESSON_LIMIT, type=int)
+    if limit is None or not 1 <= limit <= MAX_LESSON_LIMIT:
+        errors["limit"] = f"Must be an integer between 1 and {MAX_LESSON_LIMIT}."
+
+    status = request.args.get("status")
+    if status:
+        if status not in ALLOWED_LESSON_STATUSES:
+            errors["status"] = "Invalid status."
+        else:
+            query = query.filter(Lesson.status == status)
+
+    if request.args.get("from"):
+        start_from = _parse_iso_datetime(request.args["from"])
+        if start_from is None:
+            errors["from"] = "Invalid from format."
+        else:
+            query = query.filter(Lesson.start_datetime >= start_from)
+
+    if request.args.get("to"):
+        start_to = _parse_iso_datetime(request.args["to"])
+        if start_to is None:
+            errors["to"] = "Invalid to format."
+        else:
+            query = query.filter(Lesson.start_datetime < start_to)
+
+    when = request.args.get("when")
+    descending = False
+    if when == "upcoming":
+        query = query.filter(Lesson.start_datetime >= local_now())
+    elif when == "past":
+        query = query.filter(Lesson.start_datetime < local_now())
+        descending = True
+    elif when:
+        errors["when"] = "Must be upcoming or past."
+
+    after = None
+    if request.args.get("cursor"):
+        after = _decode_lesson_cursor(request.args["cursor"])
+        if after is None:
+            errors["cursor"] = "Invalid cursor."
+
+    if errors:
+        return jsonify({"message": "Invalid data", "errors": errors}), 400
+
+    if descending:
+        query = query.order_by(Lesson.start_datetime.desc(), Lesson.id.desc())
+    else:
+        query = query.order_by(Lesson.start_datetime, Lesson.id)
+
+    if not paginate:
+        if role == "admin":
+            return Response(stream_with_context(_stream_lessons(query)), mimetype="application/json")
+        return jsonify([_serialize_lesson(*row) for row in _with_names(query).all()])
+
+    if after is not None:
+        after_start, after_id = after
+        if descending:
+            query = query.filter(
+                or_(
+                    Lesson.start_datetime < after_start,
+                    and_(Lesson.start_datetime == after_start, Lesson.id < after_id),
+                )
+            )
+        else:
+            query = query.filter(
+                or_(
+                    Lesson.start_datetime > after_start,
+                    and_(Lesson.start_datetime == after_start, Lesson.id > after_id),
+                )
+            )
+
+    rows = _with_names(query).limit(limit + 1).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    response = jsonify([_serialize_lesson(*row) for row in rows])
+    if has_more:
+        last = rows[-1][0]
+        response.headers["X-Next-Cursor"] = encode_cursor([last.start_datetime.isoformat(), last.id])
+    return response
+
+
+@lessons_bp.route("/bookable-slots", methods=["GET"])
+@jwt_required()
+def list_bookable_slots():
+    """Concrete start times the current student could book with ``tutor_id``.
+
+    Query parameters: ``tutor_id``, ``duration`` in minutes (default 60), ``weeks``
+    to look ahead (default 4) and ``limit`` (default 5).
+    """
+    claims = get_jwt()
+    if claims.get("role") != "student":
+        return jsonify({"message": "Forbidden"}), 403
+
+    student = current_profile()
+    if not student:
+        return jsonify({"message": "Student profile not found"}), 404
+
+    errors = {}
+    tutor_id = request.args.get("tutor_id")
+    tutor = TutorProfile.query.get(tutor_id) if tutor_id else None
+    if not tutor:
+        errors["tutor_id"] = "Invalid tutor_id."
+    duration = request.args.get("duration", 60, type=int)
+    if duration is None or not SLOT_STEP_MINUTES <= duration <= MAX_LESSON_MINUTES:
+        errors["duration"] = f"Must be an integer between {SLOT_STEP_MINUTES} and {MAX_LESSON_MINUTES}."
+    weeks = request.args.get("weeks", 4, type=int)
+    if weeks is None or not 1 <= weeks <= MAX_SLOT_WEEKS:
+        errors["weeks"] = f"Must be an integer between 1 and {MAX_SLOT_WEEKS}."
+    limit = request.args.get("limit", 5, type=int)
+    if limit is None or not 1 <= limit <= MAX_SLOT_LIMIT:
+        errors["limit"] = f"Must be an integer between 1 and {MAX_SLOT_LIMIT}."
+    if errors:
+        return jsonify({"message": "Invalid data", "errors": errors}), 400
+
+    slots = islice(bookable_slots(tutor, student, duration, weeks), limit)
+    return jsonify(
+        [{"start_datetime": start.isoformat(), "end_datetime": end.isoformat()} for start, end in slots]
+    )
 
 
 @lessons_bp.route("", methods=["POST"])
@@ -81,7 +295,7 @@ def create_lesson():
     if claims.get("role") != "student":
         return jsonify({"message": "Forbidden"}), 403
 
-    student = _get_current_student()
+    student = current_profile()
     if not student:
         return jsonify({"message": "Student profile not found"}), 404
 
@@ -108,27 +322,38 @@ def create_lesson():
         errors["end_datetime"] = "Invalid end_datetime format."
     if start_datetime and end_datetime and end_datetime <= start_datetime:
         errors["time_range"] = "end_datetime must be greater than start_datetime."
+    elif start_datetime and end_datetime and _lesson_too_long(start_datetime, end_datetime):
+        errors["time_range"] = f"Lessons can be at most {MAX_LESSON_MINUTES} minutes."
     if mode not in ALLOWED_LESSON_MODES:
         errors["mode"] = "Invalid mode."
 
     if errors:
         return jsonify({"message": "Invalid data", "errors": errors}), 400
 
-    lesson = Lesson(
-        tutor_id=tutor.id,
-        student_id=student.id,
-        subject_id=subject.id,
-        start_datetime=start_datetime,
-        end_datetime=end_datetime,
-        mode=mode,
-        location_description=location_description,
-        status="pending",
-    )
-
-    db.session.add(lesson)
-    db.session.commit()
-
-    return jsonify(_serialize_lesson(lesson)), 201
+    with booking_guard(tutor.id, student.id):
+        conflicts = booking_errors(tutor.id, tutor.user_id, student.id, start_datetime, end_datetime)
+        if conflicts:
+            return _booking_conflict(conflicts)
+
+        lesson = Lesson(
+            tutor_id=tutor.id,
+            student_id=student.id,
+            subject_id=subject.id,
+            start_datetime=start_datetime,
+            end_datetime=end_datetime,
+            mode=mode,
+            location_description=location_description,
+            status="pending",
+        )
+        db.session.add(lesson)
+        try:
+            db.session.commit()
+        except IntegrityError:
+            # Lost a race against a concurrent booking (PostgreSQL exclusion constraint).
+            db.session.rollback()
+            return _booking_conflict({"time_range": "This time was just booked."})
+
+    return jsonify(_serialize_lesson(lesson, subject.name, tutor.full_name, student.full_name)), 201
 
 
 @lessons_bp.route("/<lesson_id>", methods=["PATCH"])
@@ -137,22 +362,24 @@ def update_lesson(lesson_id):
     claims = get_jwt()
     role = claims.get("role")
 
-    lesson = Lesson.query.get(lesson_id)
-    if not lesson:
+    row = _with_names(Lesson.query.filter(Lesson.id == lesson_id)).first()
+    if not row:
         return jsonify({"message": "Not found"}), 404
+    lesson = row[0]
 
-    tutor = None
     if role == "tutor":
-        tutor = _get_current_tutor()
-        if not tutor:
+        tutor_id = current_profile_id()
+        if not tutor_id:
             return jsonify({"message": "Tutor profile not found"}), 404
-        if lesson.tutor_id != tutor.id:
+        if lesson.tutor_id != tutor_id:
             return jsonify({"message": "Not found"}), 404
     elif role != "admin":
         return jsonify({"message": "Forbidden"}), 403
 
     data = request.get_json() or {}
     errors = {}
+    booked_range = (lesson.start_datetime, lesson.end_datetime)
+    was_blocking = lesson.status in BLOCKING_LESSON_STATUSES
 
     if "status" in data:
         status = data.get("status")
@@ -177,6 +404,8 @@ def update_lesson(lesson_id):
 
     if lesson.start_datetime and lesson.end_datetime and lesson.end_datetime <= lesson.start_datetime:
         errors["time_range"] = "end_datetime must be greater than start_datetime."
+    elif lesson.start_datetime and lesson.end_datetime and _lesson_too_long(lesson.start_datetime, lesson.end_datetime):
+        errors["time_range"] = f"Lessons can be at most {MAX_LESSON_MINUTES} minutes."
 
     if "location_description" in data:
         lesson.location_description = data.get("location_description")
@@ -184,8 +413,35 @@ def update_lesson(lesson_id):
     if errors:
         return jsonify({"message": "Invalid data", "errors": errors}), 400
 
-    db.session.commit()
-    return jsonify(_serialize_lesson(lesson))
+    # A new time is checked like a new booking. A lesson that keeps its time only
+    # needs the overlap check when it starts blocking again; confirming or
+    # completing it must not fail because the tutor changed their availability since.
+    moved = (lesson.start_datetime, lesson.end_datetime) != booked_range
+    blocking = lesson.status in BLOCKING_LESSON_STATUSES
+    with booking_guard(lesson.tutor_id, lesson.student_id):
+        if blocking and (moved or not was_blocking):
+            with db.session.no_autoflush:
+                tutor_user_id = (
+                    db.session.query(TutorProfile.user_id).filter_by(id=lesson.tutor_id).scalar()
+                )
+                conflicts = booking_errors(
+                    lesson.tutor_id,
+                    tutor_user_id,
+                    lesson.student_id,
+                    lesson.start_datetime,
+                    lesson.end_datetime,
+                    exclude_id=lesson.id,
+                    check_availability=moved,
+                )
+            if conflicts:
+                db.session.rollback()
+                return _booking_conflict(conflicts)
+        try:
+            db.session.commit()
+        except IntegrityError:
+            db.session.rollback()
+            return _booking_conflict({"time_range": "This time was just booked."})
+    return jsonify(_serialize_lesson(*row))
 
 
 @lessons_bp.route("/<lesson_id>", methods=["GET"])
@@ -193,20 +449,17 @@ def update_lesson(lesson_id):
 def get_lesson(lesson_id):
     claims = get_jwt()
     role = claims.get("role")
-    user_id = claims.get("sub") or claims.get("user_id")
+    if role not in {"student", "tutor", "admin"}:
+        return jsonify({"message": "Forbidden"}), 403
 
-    lesson = Lesson.query.get(lesson_id)
-    if not lesson:
+    row = _with_names(Lesson.query.filter(Lesson.id == lesson_id)).first()
+    if not row:
         return jsonify({"message": "Not found"}), 404
+    lesson = row[0]
 
-    student = StudentProfile.query.filter_by(user_id=user_id).first()
-    tutor = TutorProfile.query.filter_by(user_id=user_id).first()
-
-    if role == "student" and student and lesson.student_id != student.id:
+    if role == "student" and lesson.student_id != current_profile_id():
         return jsonify({"message": "Forbidden"}), 403
-    if role == "tutor" and tutor and lesson.tutor_id != tutor.id:
-        return jsonify({"message": "Forbidden"}), 403
-    if role not in {"student", "tutor", "admin"}:
+    if role == "tutor" and lesson.tutor_id != current_profile_id():
         return jsonify({"message": "Forbidden"}), 403
 
-    return jsonify(_serialize_lesson(lesson))
+    return jsonify(_serialize_lesson(*row))
@@ -1,67 +1,28 @@
-from typing import List, Tuple
-
-from flask import Blueprint, jsonify
+from flask import Blueprint, jsonify, request, url_for
 from flask_jwt_extended import get_jwt, jwt_required
 
-from app.extensions import db
-from app.models import AvailabilitySlot, LessonRequest, StudentProfile, TutorProfile
-from app.models.relationships import TutorDistrict, TutorSubject
-from app.models.subject import Subject
-
-matching_bp = Blueprint("matching", __name__, url_prefix="/matching")
-
-
-def parse_csv_to_list_int(value: str) -> List[int]:
-    items: List[int] = []
-    if not value:
-        return items
-    for raw_item in value.split(","):
-        item = raw_item.strip()
-        if not item:
-            continue
-        try:
-            items.append(int(item))
-        except ValueError:
-            continue
-    return items
-
-
-def parse_csv_to_list_str(value: str) -> List[str]:
-    if not value:
-        return []
-    return [item.strip() for item in value.split(",") if item.strip()]
-
-
-def csv_contains(value: str, item: str) -> bool:
-    if not value or not item:
-        return False
-    return item in [entry.strip() for entry in value.split(",") if entry.strip()]
-
-
-def find_overlapping_slots(
-    student_slots: List[AvailabilitySlot],
-    tutor_slots: List[AvailabilitySlot],
-) -> Tuple[bool, List[dict]]:
-    overlaps = []
-    for student_slot in student_slots:
-        for tutor_slot in tutor_slots:
-            if student_slot.day_of_week != tutor_slot.day_of_week:
-                continue
-            if student_slot.start_time < tutor_slot.end_time and tutor_slot.start_time < student_slot.end_time:
-                overlaps.append(
-                    {
-                        "day_of_week": student_slot.day_of_week,
-                        "student_start_time": student_slot.start_time.isoformat(),
-                        "student_end_time": student_slot.end_time.isoformat(),
-                        "tutor_start_time": tutor_slot.start_time.isoformat(),
-                        "tutor_end_time": tutor_slot.end_time.isoformat(),
-                    }
-                )
-            if len(overlaps) >= 3:
-                break
-        if len(overlaps) >= 3:
-            break
-    return bool(overlaps), overlaps
+from app.api import matching_bp
+from app.models import LessonRequest, StudentProfile
+from app.services.bulk_matching import bulk_matching_jobs
+from app.services.match_cache import get_match_snapshot, match_cache
+from app.services.matcher import serialize_matches
+from app.utils.availability import MINUTES_PER_DAY
+from app.utils.pagination import decode_cursor, encode_cursor
+from app.utils.security import role_required
+
+# Blueprint imported from app.api to ensure shared registration
+assert isinstance(matching_bp, Blueprint)
+
+DEFAULT_MATCH_LIMIT = 10
+MAX_MATCH_LIMIT = 50
+
+
+def _decode_cursor(value: str):
+    try:
+        score, overlap_minutes, tutor_id = decode_cursor(value)
+        return (float(score), int(overlap_minutes), str(tutor_id))
+    except (TypeError, ValueError):
+        return None
 
 
 @matching_bp.route("/lesson-requests/<request_id>/match", methods=["POST"])
@@ -82,103 +43,73 @@ def match_tutors(request_id):
     if role == "student" and student_profile.user_id != user_id:
         return jsonify({"message": "Forbidden"}), 403
 
-    student_slots = AvailabilitySlot.query.filter_by(user_id=student_profile.user_id).all()
-    subject_ids = parse_csv_to_list_int(lesson_request.subject_ids)
-    preferred_modes = parse_csv_to_list_str(lesson_request.preferred_modes)
-
-    if not subject_ids:
+    errors = {}
+    limit = request.args.get("limit", DEFAULT_MATCH_LIMIT, type=int)
+    if limit is None or not 1 <= limit <= MAX_MATCH_LIMIT:
+        errors["limit"] = f"Must be an integer between 1 and {MAX_MATCH_LIMIT}."
+    after = None
+    if request.args.get("cursor"):
+        after = _decode_cursor(request.args["cursor"])
+        if after is None:
+            errors["cursor"] = "Invalid cursor."
+    # Shortest shared window that counts as an availability overlap; 0 accepts any.
+    min_minutes = request.args.get("min_minutes", 0, type=int)
+    if min_minutes is None or not 0 <= min_minutes <= MINUTES_PER_DAY:
+        errors["min_minutes"] = f"Must be an integer between 0 and {MINUTES_PER_DAY}."
+    if errors:
+        return jsonify({"message": "Invalid data", "errors": errors}), 400
+
+    snapshot = get_match_snapshot(lesson_request, min_minutes)
+    if snapshot is None:
         return jsonify({"message": "No subjects specified for matching"}), 400
 
-    tutor_query = (
-        TutorProfile.query.join(TutorSubject, TutorProfile.id == TutorSubject.tutor_id)
-        .filter(TutorProfile.status == "approved")
-        .filter(TutorSubject.subject_id.in_(subject_ids))
-        .distinct()
-    )
-
-    candidate_tutors: List[TutorProfile] = tutor_query.all()
-
-    in_person_modes = {"student_home", "tutor_home", "common_place"}
-    requested_in_person = set(preferred_modes) & in_person_modes
-
-    filtered_tutors = []
-    for tutor in candidate_tutors:
-        tutor_modes = parse_csv_to_list_str(tutor.lesson_modes)
-        if preferred_modes and not set(tutor_modes) & set(preferred_modes):
-            continue
-
-        if requested_in_person:
-            district_match = tutor.base_district == student_profile.district
-            if not district_match:
-                district_match = TutorDistrict.query.filter_by(
-                    tutor_id=tutor.id, district=student_profile.district
-                ).first()
-            if not district_match:
-                continue
-
-        filtered_tutors.append(tutor)
-
-    results = []
-    for tutor in filtered_tutors:
-        tutor_slots = AvailabilitySlot.query.filter_by(user_id=tutor.user_id).all()
-        has_overlap, suggested_slots = find_overlapping_slots(student_slots, tutor_slots)
-
-        score = 50.0
-        if tutor.base_district == student_profile.district:
-            score += 30
-        else:
-            district_entry = TutorDistrict.query.filter_by(
-                tutor_id=tutor.id, district=student_profile.district
-            ).first()
-            if district_entry:
-                score += 20
-
-        budget_min = float(lesson_request.budget_min) if lesson_request.budget_min is not None else None
-        budget_max = float(lesson_request.budget_max) if lesson_request.budget_max is not None else None
-        if budget_min is not None and budget_max is not None and tutor.hourly_rate is not None:
-            hourly_rate = float(tutor.hourly_rate)
-            if budget_min <= hourly_rate <= budget_max:
-                score += 20
-            else:
-                lower_bound = budget_min * 0.8
-                upper_bound = budget_max * 1.2
-                if lower_bound <= hourly_rate <= upper_bound:
-                    score += 5
-
-        if has_overlap:
-            score += 20
-
-        if tutor.avg_rating is not None and tutor.rating_count is not None:
-            if tutor.avg_rating >= 4.5 and tutor.rating_count >= 5:
-                score += 10
-            elif tutor.avg_rating >= 4.0 and tutor.rating_count >= 3:
-                score += 5
-
-        tutor_subjects = (
-            db.session.query(Subject)
-            .join(TutorSubject, Subject.id == TutorSubject.subject_id)
-            .filter(TutorSubject.tutor_id == tutor.id, TutorSubject.subject_id.in_(subject_ids))
-            .all()
-        )
-
-        results.append(
-            {
-                "tutor_id": tutor.id,
-                "full_name": tutor.full_name,
-                "title": tutor.title,
-                "hourly_rate": float(tutor.hourly_rate) if tutor.hourly_rate is not None else None,
-                "base_district": tutor.base_district,
-                "avg_rating": tutor.avg_rating,
-                "rating_count": tutor.rating_count,
-                "score": score,
-                "subjects": [
-                    {"id": subject.id, "name": subject.name, "category": subject.category}
-                    for subject in tutor_subjects
-                ],
-                "has_availability_overlap": has_overlap,
-                "suggested_slots": suggested_slots,
-            }
-        )
-
-    sorted_results = sorted(results, key=lambda x: x["score"], reverse=True)
-    return jsonify(sorted_results[:10])
+    entries, has_more = snapshot.page(after, limit)
+    response = jsonify(serialize_matches(snapshot, entries))
+    if has_more:
+        response.headers["X-Next-Cursor"] = encode_cursor(entries[-1].sort_key)
+    return response
+
+
+@matching_bp.route("/cache/stats", methods=["GET"])
+@role_required("admin")
+def match_cache_stats():
+    return jsonify(match_cache.stats())
+
+
+@matching_bp.route("/bulk", methods=["POST"])
+@role_required("admin")
+def run_bulk_matching():
+    """Start matching every open lesson request in the background.
+
+    Answers 202 with the job and a ``Location`` to poll, or 409 with the active job
+    while another run is still going. ``workers`` is capped by
+    ``BULK_MATCHING_HTTP_WORKERS``; use ``flask match-open-requests`` for a full run.
+    """
+    data = request.get_json(silent=True) or {}
+    workers = data.get("workers")
+    limit = data.get("limit", DEFAULT_MATCH_LIMIT)
+
+    errors = {}
+    if workers is not None and (not isinstance(workers, int) or workers < 0):
+        errors["workers"] = "Must be a non-negative integer."
+    if not isinstance(limit, int) or not 1 <= limit <= MAX_MATCH_LIMIT:
+        errors["limit"] = f"Must be an integer between 1 and {MAX_MATCH_LIMIT}."
+    if errors:
+        return jsonify({"message": "Invalid data", "errors": errors}), 400
+
+    job, created = bulk_matching_jobs.submit(workers=workers, limit=limit)
+    if not created:
+        return jsonify({"message": "Bulk matching is already running", "job": job}), 409
+    response = jsonify(job)
+    response.status_code = 202
+    response.headers["Location"] = url_for("matching.get_bulk_matching_job", job_id=job["id"])
+    return response
+
+
+@matching_bp.route("/bulk/<job_id>", methods=["GET"])
+@role_required("admin")
+def get_bulk_matching_job(job_id):
+    job = bulk_matching_jobs.get(job_id)
+    if job is None:
+        return jsonify({"message": "Job not found"}), 404
+    return jsonify(job)
@@ -0,0 +1,23 @@
+import hmac
+
+from flask import Blueprint, current_app, jsonify, request
+
+from app.api import metrics_bp
+from app.services.metrics import request_metrics
+
+# Blueprint imported from app.api to ensure shared registration
+assert isinstance(metrics_bp, Blueprint)
+
+
+@metrics_bp.route("/metrics", methods=["GET"])
+def metrics():
+    """Prometheus exposition, for scrapers sending ``Authorization: Bearer <METRICS_TOKEN>``.
+
+    Without a configured token the endpoint does not exist.
+    """
+    token = current_app.config.get("METRICS_TOKEN")
+    if not token:
+        return jsonify({"message": "Not found"}), 404
+    if not hmac.compare_digest(request.headers.get("Authorization", ""), f"Bearer {token}"):
+        return jsonify({"message": "Forbidden"}), 403
+    return request_metrics.render(), 200, {"Content-Type": "text/plain; version=0.0.4; charset=utf-8"}
@@ -0,0 +1,23 @@
+from flask import Blueprint, jsonify
+
+from app.api import profiles_bp
+from app.services.profiler import request_profiler
+from app.utils.security import role_required
+
+# Blueprint imported from app.api to ensure shared registration
+assert isinstance(profiles_bp, Blueprint)
+
+
+@profiles_bp.route("", methods=["GET"])
+@role_required("admin")
+def list_profiles():
+    return jsonify(request_profiler.reports())
+
+
+@profiles_bp.route("/<report_id>", methods=["GET"])
+@role_required("admin")
+def get_profile(report_id):
+    report = request_profiler.get(report_id)
+    if report is None:
+        return jsonify({"message": "Profile not found"}), 404
+    return jsonify(report)
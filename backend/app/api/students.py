@@ -4,6 +4,9 @@ from flask_jwt_extended import get_jwt, jwt_required
 from app.api import students_bp
 from app.extensions import db
 from app.models import StudentProfile
+from app.services.response_cache import conditional_get
+from app.utils.flags import STUDENT_MODE_BITS, split_flag_values
+from app.utils.identity import current_profile, refreshed_access_token
 
 
 # Blueprint imported from app.api to ensure shared registration
@@ -11,9 +14,6 @@ assert isinstance(students_bp, Blueprint)
 
 
 def _serialize_student(profile: StudentProfile) -> dict:
-    preferred_modes = (
-        profile.preferred_modes.split(",") if profile.preferred_modes else []
-    )
     return {
         "id": profile.id,
         "user_id": profile.user_id,
@@ -25,23 +25,35 @@ def _serialize_student(profile: StudentProfile) -> dict:
         "city": profile.city,
         "district": profile.district,
         "neighborhood": profile.neighborhood,
-        "preferred_modes": preferred_modes,
+        "preferred_modes": profile.get_preferred_modes(),
         "notes": profile.notes,
         "created_at": profile.created_at.isoformat() if profile.created_at else None,
         "updated_at": profile.updated_at.isoformat() if profile.updated_at else None,
     }
 
 
+def _profile_version():
+    claims = get_jwt()
+    if claims.get("role") != "student":
+        return None
+    user_id = claims.get("sub") or claims.get("user_id")
+    return (
+        db.session.query(StudentProfile.id, StudentProfile.updated_at)
+        .filter(StudentProfile.user_id == user_id)
+        .first()
+    )
+
+
 @students_bp.route("/me", methods=["GET"])
 @jwt_required()
+@conditional_get(_profile_version)
 def get_me():
     claims = get_jwt()
     role = claims.get("role")
     if role != "student":
         return jsonify({"message": "Forbidden"}), 403
 
-    user_id = claims.get("sub") or claims.get("user_id")
-    profile = StudentProfile.query.filter_by(user_id=user_id).first()
+    profile = current_profile()
     if not profile:
         return jsonify({"message": "Profile not found"}), 404
 
@@ -59,17 +71,21 @@ def upsert_me():
     user_id = claims.get("sub") or claims.get("user_id")
     data = request.get_json() or {}
 
-    profile = StudentProfile.query.filter_by(user_id=user_id).first()
+    preferred_modes = data.get("preferred_modes")
+    if preferred_modes is not None:
+        if not isinstance(preferred_modes, (list, str)):
+            error = "preferred_modes must be a list."
+        else:
+            preferred_modes = split_flag_values(preferred_modes)
+            error = "Invalid preferred_modes." if set(preferred_modes) - set(STUDENT_MODE_BITS) else None
+        if error:
+            return jsonify({"message": "Invalid data", "errors": {"preferred_modes": error}}), 400
+
+    profile = current_profile()
     if not profile:
         profile = StudentProfile(user_id=user_id)
         db.session.add(profile)
 
-    preferred_modes = data.get("preferred_modes")
-    if isinstance(preferred_modes, list):
-        preferred_modes_str = ",".join(preferred_modes)
-    else:
-        preferred_modes_str = preferred_modes
-
     for field in [
         "full_name",
         "grade",
@@ -84,12 +100,17 @@ def upsert_me():
         if field in data:
             setattr(profile, field, data.get(field))
 
-    if preferred_modes_str is not None:
-        profile.preferred_modes = preferred_modes_str
+    if preferred_modes is not None:
+        profile.set_preferred_modes(preferred_modes)
 
     if not profile.full_name or not profile.district:
         return jsonify({"message": "Full name and district are required."}), 400
 
     db.session.commit()
 
-    return jsonify({"profile": _serialize_student(profile)})
+    response = {"profile": _serialize_student(profile)}
+    # Tokens issued before the profile existed lack its id; hand out one that has it.
+    access_token = refreshed_access_token(profile)
+    if access_token:
+        response["access_token"] = access_token
+    return jsonify(response)
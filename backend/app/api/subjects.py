@@ -1,31 +1,30 @@
-from flask import Blueprint, jsonify
+from flask import Blueprint, Response, current_app, jsonify, request
 
 from app.api import subjects_bp
-from app.models import Subject
+from app.services.subject_catalog import subject_catalog
 
 
 # Blueprint imported from app.api to ensure shared registration
 assert isinstance(subjects_bp, Blueprint)
 
 
-def _serialize_subject(subject: Subject) -> dict:
-    return {
-        "id": subject.id,
-        "name": subject.name,
-        "category": subject.category,
-        "order_index": subject.order_index,
-    }
+def _cached_json(body: bytes, etag: str) -> Response:
+    response = Response(body, mimetype="application/json")
+    response.set_etag(etag)
+    response.cache_control.public = True
+    response.cache_control.max_age = current_app.config.get("SUBJECT_CATALOG_CACHE_SECONDS", 3600)
+    return response.make_conditional(request)
 
 
 @subjects_bp.route("/", methods=["GET"])
 def list_subjects():
-    subjects = Subject.query.order_by(
-        Subject.order_index.asc().nulls_last(), Subject.id.asc()
-    ).all()
-    return jsonify([_serialize_subject(subject) for subject in subjects])
+    snapshot = subject_catalog.snapshot()
+    return _cached_json(snapshot.body, snapshot.etag)
 
 
-@subjects_bp.route("/<int:subject_id>", methods=["GET"])
-def get_subject(subject_id: int):
-    subject = Subject.query.get_or_404(subject_id)
-    return jsonify(_serialize_subject(subject))
+@subjects_bp.route("/<subject_id>", methods=["GET"])
+def get_subject(subject_id: str):
+    cached = subject_catalog.get(subject_id)
+    if cached is None:
+        return jsonify({"message": "Subject not found"}), 404
+    return _cached_json(*cached)
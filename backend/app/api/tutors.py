@@ -1,9 +1,15 @@
+from datetime import datetime
+
 from flask import Blueprint, jsonify, request
 from flask_jwt_extended import get_jwt, jwt_required
 
 from app.api import tutors_bp
 from app.extensions import db
 from app.models import Subject, TutorDistrict, TutorProfile
+from app.services.matching_index import matching_index
+from app.services.response_cache import conditional_get
+from app.utils.flags import LESSON_MODE_BITS, TEACHING_LEVEL_BITS, split_flag_values
+from app.utils.identity import current_profile, refreshed_access_token
 
 
 # Blueprint imported from app.api to ensure shared registration
@@ -11,10 +17,6 @@ assert isinstance(tutors_bp, Blueprint)
 
 
 def _serialize_tutor(profile: TutorProfile) -> dict:
-    lesson_modes = profile.lesson_modes.split(",") if profile.lesson_modes else []
-    teaching_levels = (
-        profile.teaching_levels.split(",") if profile.teaching_levels else []
-    )
     subject_ids = [subject.id for subject in profile.subjects]
     districts = [district.district for district in profile.districts]
 
@@ -29,8 +31,8 @@ def _serialize_tutor(profile: TutorProfile) -> dict:
         "hourly_rate": float(profile.hourly_rate) if profile.hourly_rate is not None else None,
         "base_city": profile.base_city,
         "base_district": profile.base_district,
-        "lesson_modes": lesson_modes,
-        "teaching_levels": teaching_levels,
+        "lesson_modes": profile.get_lesson_modes(),
+        "teaching_levels": profile.get_teaching_levels(),
         "status": profile.status,
         "avg_rating": profile.avg_rating,
         "rating_count": profile.rating_count,
@@ -41,16 +43,28 @@ def _serialize_tutor(profile: TutorProfile) -> dict:
     }
 
 
+def _profile_version():
+    claims = get_jwt()
+    if claims.get("role") != "tutor":
+        return None
+    user_id = claims.get("sub") or claims.get("user_id")
+    return (
+        db.session.query(TutorProfile.id, TutorProfile.updated_at)
+        .filter(TutorProfile.user_id == user_id)
+        .first()
+    )
+
+
 @tutors_bp.route("/me", methods=["GET"])
 @jwt_required()
+@conditional_get(_profile_version)
 def get_me():
     claims = get_jwt()
     role = claims.get("role")
     if role != "tutor":
         return jsonify({"message": "Forbidden"}), 403
 
-    user_id = claims.get("sub") or claims.get("user_id")
-    profile = TutorProfile.query.filter_by(user_id=user_id).first()
+    profile = current_profile()
     if not profile:
         return jsonify({"message": "Profile not found"}), 404
 
@@ -68,22 +82,32 @@ def upsert_me():
     user_id = claims.get("sub") or claims.get("user_id")
     data = request.get_json() or {}
 
-    profile = TutorProfile.query.filter_by(user_id=user_id).first()
-    if not profile:
-        profile = TutorProfile(user_id=user_id)
-        db.session.add(profile)
-
+    errors = {}
     lesson_modes = data.get("lesson_modes")
-    if isinstance(lesson_modes, list):
-        lesson_modes_str = ",".join(lesson_modes)
-    else:
-        lesson_modes_str = lesson_modes
+    if lesson_modes is not None:
+        if not isinstance(lesson_modes, (list, str)):
+            errors["lesson_modes"] = "lesson_modes must be a list."
+        else:
+            lesson_modes = split_flag_values(lesson_modes)
+            if set(lesson_modes) - set(LESSON_MODE_BITS):
+                errors["lesson_modes"] = "Invalid lesson_modes."
 
     teaching_levels = data.get("teaching_levels")
-    if isinstance(teaching_levels, list):
-        teaching_levels_str = ",".join(teaching_levels)
-    else:
-        teaching_levels_str = teaching_levels
+    if teaching_levels is not None:
+        if not isinstance(teaching_levels, (list, str)):
+            errors["teaching_levels"] = "teaching_levels must be a list."
+        else:
+            teaching_levels = split_flag_values(teaching_levels)
+            if set(teaching_levels) - set(TEACHING_LEVEL_BITS):
+                errors["teaching_levels"] = "Invalid teaching_levels."
+
+    if errors:
+        return jsonify({"message": "Invalid data", "errors": errors}), 400
+
+    profile = current_profile()
+    if not profile:
+        profile = TutorProfile(user_id=user_id)
+        db.session.add(profile)
 
     for field in [
         "full_name",
@@ -99,10 +123,10 @@ def upsert_me():
         if field in data:
             setattr(profile, field, data.get(field))
 
-    if lesson_modes_str is not None:
-        profile.lesson_modes = lesson_modes_str
-    if teaching_levels_str is not None:
-        profile.teaching_levels = teaching_levels_str
+    if lesson_modes is not None:
+        profile.set_lesson_modes(lesson_modes)
+    if teaching_levels is not None:
+        profile.set_teaching_levels(teaching_levels)
 
     subject_ids = data.get("subject_ids") or []
     if subject_ids:
@@ -115,6 +139,9 @@ def upsert_me():
     profile.districts.clear()
     for district_name in districts:
         profile.districts.append(TutorDistrict(district=district_name))
+    # Subject and district rows do not touch the profile row; bump it so ETags change.
+    if profile.created_at is not None:
+        profile.updated_at = datetime.utcnow()
 
     if not profile.full_name or profile.hourly_rate is None or not profile.base_district:
         return (
@@ -123,5 +150,11 @@ def upsert_me():
         )
 
     db.session.commit()
-
-    return jsonify({"profile": _serialize_tutor(profile)})
+    matching_index.refresh_tutor(profile)
+
+    response = {"profile": _serialize_tutor(profile)}
+    # Tokens issued before the profile existed lack its id; hand out one that has it.
+    access_token = refreshed_access_token(profile)
+    if access_token:
+        response["access_token"] = access_token
+    return jsonify(response)
@@ -0,0 +1,18 @@
+import click
+from flask import Flask
+
+from app.services.bulk_matching import match_open_requests
+
+
+def register_commands(app: Flask) -> None:
+    @app.cli.command("match-open-requests")
+    @click.option("--workers", type=int, default=None, help="Worker processes (default: CPU count).")
+    @click.option("--limit", type=int, default=10, show_default=True, help="Suggestions per request.")
+    def match_open_requests_command(workers, limit):
+        """Re-run matching for every open lesson request and store the suggestions."""
+        stats = match_open_requests(workers=workers, limit=limit)
+        click.echo(
+            f"Matched {stats['requests']} requests ({stats['suggestions']} suggestions) "
+            f"in {stats['seconds']}s with {stats['workers']} workers: "
+            f"{stats['requests_per_second']} requests/sec"
+        )
@@ -8,6 +8,30 @@ class Config:
     )
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     JWT_SECRET_KEY = os.environ.get("JWT_SECRET_KEY", "change-this-secret")
+    MATCHING_INDEX_MAX_AGE = int(os.environ.get("MATCHING_INDEX_MAX_AGE", "300"))
+    MATCH_CACHE_SIZE = int(os.environ.get("MATCH_CACHE_SIZE", "1024"))
+    MATCH_CACHE_TTL = int(os.environ.get("MATCH_CACHE_TTL", "300"))
+    MATCH_SNAPSHOT_DEPTH = int(os.environ.get("MATCH_SNAPSHOT_DEPTH", "200"))
+    MATCH_PRECOMPUTE = os.environ.get("MATCH_PRECOMPUTE", "false").lower() == "true"
+    BULK_MATCHING_HTTP_WORKERS = int(os.environ.get("BULK_MATCHING_HTTP_WORKERS", "2"))
+    SUBJECT_CATALOG_PRELOAD = os.environ.get("SUBJECT_CATALOG_PRELOAD", "true").lower() == "true"
+    SUBJECT_CATALOG_MAX_AGE = int(os.environ.get("SUBJECT_CATALOG_MAX_AGE", "300"))
+    SUBJECT_CATALOG_CACHE_SECONDS = int(os.environ.get("SUBJECT_CATALOG_CACHE_SECONDS", "3600"))
+    PASSWORD_HASH_METHOD = os.environ.get("PASSWORD_HASH_METHOD", "scrypt:32768:8:1")
+    PASSWORD_SALT_LENGTH = int(os.environ.get("PASSWORD_SALT_LENGTH", "16"))
+    PASSWORD_HASH_WORKERS = int(os.environ.get("PASSWORD_HASH_WORKERS", "0"))
+    PASSWORD_HASH_QUEUE_TIMEOUT = float(os.environ.get("PASSWORD_HASH_QUEUE_TIMEOUT", "5"))
+    TOKEN_REVOCATION_PERSIST = os.environ.get("TOKEN_REVOCATION_PERSIST", "true").lower() == "true"
+    TOKEN_REVOCATION_SYNC_SECONDS = int(os.environ.get("TOKEN_REVOCATION_SYNC_SECONDS", "30"))
+    RESPONSE_CACHE_MAX_BYTES = int(os.environ.get("RESPONSE_CACHE_MAX_BYTES", str(8 * 1024 * 1024)))
+    AVAILABILITY_TIMEZONE = os.environ.get("AVAILABILITY_TIMEZONE", "Europe/Istanbul")
+    METRICS_ENABLED = os.environ.get("METRICS_ENABLED", "true").lower() == "true"
+    METRICS_TOKEN = os.environ.get("METRICS_TOKEN", "")
+    N_PLUS_ONE_THRESHOLD = int(os.environ.get("N_PLUS_ONE_THRESHOLD", "5"))
+    PROFILING_ENABLED = os.environ.get("PROFILING_ENABLED", "false").lower() == "true"
+    PROFILE_HEADER = os.environ.get("PROFILE_HEADER", "X-Profile")
+    PROFILE_TOP_FUNCTIONS = int(os.environ.get("PROFILE_TOP_FUNCTIONS", "25"))
+    PROFILE_HISTORY = int(os.environ.get("PROFILE_HISTORY", "50"))
 
 
 class DevelopmentConfig(Config):
@@ -2,7 +2,14 @@ from app.extensions import db
 from app.models.availability import AvailabilitySlot
 from app.models.lesson import Lesson
 from app.models.lesson_request import LessonRequest
-from app.models.relationships import TutorDistrict, TutorSubject
+from app.models.match_suggestion import MatchSuggestion
+from app.models.relationships import (
+    LessonRequestMode,
+    LessonRequestSubject,
+    TutorDistrict,
+    TutorSubject,
+)
+from app.models.revoked_token import RevokedToken
 from app.models.student_profile import StudentProfile
 from app.models.subject import Subject
 from app.models.tutor_profile import TutorProfile
@@ -18,5 +25,9 @@ __all__ = [
     "TutorDistrict",
     "AvailabilitySlot",
     "LessonRequest",
+    "LessonRequestSubject",
+    "LessonRequestMode",
     "Lesson",
+    "MatchSuggestion",
+    "RevokedToken",
 ]
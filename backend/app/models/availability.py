@@ -7,6 +7,9 @@ from app.extensions import db
 
 class AvailabilitySlot(db.Model):
     __tablename__ = "availability_slots"
+    __table_args__ = (
+        db.Index("ix_availability_slots_user_day", "user_id", "day_of_week", "start_time"),
+    )
 
     id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     user_id = db.Column(db.String(36), db.ForeignKey("users.id"), nullable=False)
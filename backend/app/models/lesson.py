@@ -2,13 +2,21 @@ import uuid
 from datetime import datetime
 
 from app.extensions import db
+from app.utils.flags import LESSON_MODE_BITS
 
 ALLOWED_LESSON_STATUSES = {"pending", "confirmed", "completed", "cancelled"}
-ALLOWED_LESSON_MODES = {"online", "student_home", "tutor_home", "common_place"}
+ALLOWED_LESSON_MODES = set(LESSON_MODE_BITS)
 
 
 class Lesson(db.Model):
     __tablename__ = "lessons"
+    __table_args__ = (
+        db.Index("ix_lessons_tutor_start", "tutor_id", "start_datetime"),
+        db.Index("ix_lessons_student_start", "student_id", "start_datetime"),
+        db.Index("ix_lessons_start_datetime", "start_datetime"),
+        # PostgreSQL also carries the ex_lessons_*_no_overlap exclusion constraints
+        # (see migrations); they have no portable declaration.
+    )
 
     id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     tutor_id = db.Column(db.String(36), db.ForeignKey("tutor_profiles.id"), nullable=False)
@@ -3,19 +3,22 @@ from datetime import datetime
 from typing import List
 
 from app.extensions import db
+from app.models.relationships import LessonRequestMode, LessonRequestSubject
 
 ALLOWED_REQUEST_STATUSES = {"open", "matched", "closed", "cancelled"}
 
 
 class LessonRequest(db.Model):
     __tablename__ = "lesson_requests"
+    __table_args__ = (
+        db.Index("ix_lesson_requests_student_created", "student_id", "created_at"),
+        db.Index("ix_lesson_requests_status_created", "status", "created_at"),
+    )
 
     id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     student_id = db.Column(
         db.String(36), db.ForeignKey("student_profiles.id"), nullable=False
     )
-    subject_ids = db.Column(db.Text, nullable=True)
-    preferred_modes = db.Column(db.Text, nullable=True)
     budget_min = db.Column(db.Numeric, nullable=True)
     budget_max = db.Column(db.Numeric, nullable=True)
     weekly_hours = db.Column(db.Float, nullable=True)
@@ -29,22 +32,40 @@ class LessonRequest(db.Model):
     student = db.relationship(
         "StudentProfile", backref=db.backref("lesson_requests", lazy="dynamic")
     )
+    subject_links = db.relationship(
+        "LessonRequestSubject", cascade="all, delete-orphan", back_populates="lesson_request"
+    )
+    mode_links = db.relationship(
+        "LessonRequestMode", cascade="all, delete-orphan", back_populates="lesson_request"
+    )
+
+    def _touch(self) -> None:
+        # Link rows alone do not touch the request row; bump it so cached matches go stale.
+        if self.created_at is not None:
+            self.updated_at = datetime.utcnow()
 
-    def get_subject_id_list(self) -> List[int]:
-        if not self.subject_ids:
-            return []
-        return [int(x) for x in self.subject_ids.split(",") if x]
+    def get_subject_id_list(self) -> List[str]:
+        return [link.subject_id for link in self.subject_links]
 
-    def set_subject_id_list(self, ids: List[int]) -> None:
-        self.subject_ids = ",".join(str(i) for i in ids)
+    def set_subject_id_list(self, ids: List[str]) -> None:
+        wanted = list(dict.fromkeys(str(subject_id) for subject_id in ids))
+        existing = {link.subject_id: link for link in self.subject_links}
+        # Reuse surviving rows so the (lesson_request_id, subject_id) unique key never collides.
+        self.subject_links = [
+            existing.get(subject_id) or LessonRequestSubject(subject_id=subject_id)
+            for subject_id in wanted
+        ]
+        self._touch()
 
     def get_preferred_modes(self) -> List[str]:
-        if not self.preferred_modes:
-            return []
-        return [mode for mode in self.preferred_modes.split(",") if mode]
+        return [link.mode for link in self.mode_links]
 
     def set_preferred_modes(self, modes: List[str]) -> None:
-        self.preferred_modes = ",".join(modes)
+        existing = {link.mode: link for link in self.mode_links}
+        self.mode_links = [
+            existing.get(mode) or LessonRequestMode(mode=mode) for mode in dict.fromkeys(modes)
+        ]
+        self._touch()
 
     def to_dict(self) -> dict:
         return {
@@ -0,0 +1,39 @@
+import uuid
+from datetime import datetime
+
+from app.extensions import db
+
+
+class MatchSuggestion(db.Model):
+    __tablename__ = "match_suggestions"
+
+    id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    lesson_request_id = db.Column(
+        db.String(36), db.ForeignKey("lesson_requests.id"), nullable=False, index=True
+    )
+    tutor_id = db.Column(db.String(36), db.ForeignKey("tutor_profiles.id"), nullable=False)
+    rank = db.Column(db.Integer, nullable=False)
+    score = db.Column(db.Float, nullable=False)
+    has_availability_overlap = db.Column(db.Boolean, default=False, nullable=False)
+    overlap_minutes = db.Column(db.Integer, default=0, nullable=False)
+    suggested_slots = db.Column(db.JSON, nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+
+    lesson_request = db.relationship(
+        "LessonRequest",
+        backref=db.backref("match_suggestions", lazy="dynamic", cascade="all, delete-orphan"),
+    )
+    tutor = db.relationship("TutorProfile")
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "lesson_request_id": self.lesson_request_id,
+            "tutor_id": self.tutor_id,
+            "rank": self.rank,
+            "score": self.score,
+            "has_availability_overlap": self.has_availability_overlap,
+            "overlap_minutes": self.overlap_minutes,
+            "suggested_slots": self.suggested_slots or [],
+            "created_at": self.created_at.isoformat() if self.created_at else None,
+        }
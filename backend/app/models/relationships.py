@@ -5,6 +5,10 @@ from app.extensions import db
 
 class TutorSubject(db.Model):
     __tablename__ = "tutor_subjects"
+    __table_args__ = (
+        db.UniqueConstraint("tutor_id", "subject_id", name="uq_tutor_subjects_tutor_subject"),
+        db.Index("ix_tutor_subjects_subject_tutor", "subject_id", "tutor_id"),
+    )
 
     id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     tutor_id = db.Column(db.String(36), db.ForeignKey("tutor_profiles.id"), nullable=False)
@@ -24,9 +28,45 @@ class TutorSubject(db.Model):
 
 class TutorDistrict(db.Model):
     __tablename__ = "tutor_districts"
+    __table_args__ = (
+        db.Index("ix_tutor_districts_district_tutor", "district", "tutor_id"),
+        db.Index("ix_tutor_districts_tutor_district", "tutor_id", "district"),
+    )
 
     id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     tutor_id = db.Column(db.String(36), db.ForeignKey("tutor_profiles.id"), nullable=False)
     district = db.Column(db.String(100), nullable=False)
 
     tutor = db.relationship("TutorProfile", back_populates="districts")
+
+
+class LessonRequestSubject(db.Model):
+    __tablename__ = "lesson_request_subjects"
+    __table_args__ = (
+        db.UniqueConstraint("lesson_request_id", "subject_id"),
+        db.Index("ix_lesson_request_subjects_subject_request", "subject_id", "lesson_request_id"),
+    )
+
+    id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    lesson_request_id = db.Column(
+        db.String(36), db.ForeignKey("lesson_requests.id"), nullable=False
+    )
+    subject_id = db.Column(db.String(36), db.ForeignKey("subjects.id"), nullable=False)
+
+    lesson_request = db.relationship("LessonRequest", back_populates="subject_links")
+
+
+class LessonRequestMode(db.Model):
+    __tablename__ = "lesson_request_modes"
+    __table_args__ = (
+        db.UniqueConstraint("lesson_request_id", "mode"),
+        db.Index("ix_lesson_request_modes_mode_request", "mode", "lesson_request_id"),
+    )
+
+    id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    lesson_request_id = db.Column(
+        db.String(36), db.ForeignKey("lesson_requests.id"), nullable=False
+    )
+    mode = db.Column(db.String(50), nullable=False)
+
+    lesson_request = db.relationship("LessonRequest", back_populates="mode_links")
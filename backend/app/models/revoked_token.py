@@ -0,0 +1,15 @@
+from datetime import datetime
+
+from app.extensions import db
+
+
+class RevokedToken(db.Model):
+    """A revoked JWT, kept until it would have expired anyway."""
+
+    __tablename__ = "revoked_tokens"
+
+    jti = db.Column(db.String(36), primary_key=True)
+    token_type = db.Column(db.String(10), nullable=False)
+    user_id = db.Column(db.String(36), nullable=True)
+    expires_at = db.Column(db.DateTime, nullable=False, index=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False, index=True)
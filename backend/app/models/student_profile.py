@@ -1,7 +1,9 @@
 import uuid
 from datetime import datetime
+from typing import List
 
 from app.extensions import db
+from app.utils.flags import STUDENT_MODE_BITS, decode_flags, encode_flags
 
 
 class StudentProfile(db.Model):
@@ -17,7 +19,7 @@ class StudentProfile(db.Model):
     city = db.Column(db.String(100), default="Istanbul", nullable=False)
     district = db.Column(db.String(100), nullable=False)
     neighborhood = db.Column(db.String(100))
-    preferred_modes = db.Column(db.String(255))
+    preferred_mode_mask = db.Column(db.Integer, default=0, nullable=False)
     notes = db.Column(db.Text)
     created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
     updated_at = db.Column(
@@ -27,3 +29,9 @@ class StudentProfile(db.Model):
     user = db.relationship(
         "User", backref=db.backref("student_profile", uselist=False), uselist=False
     )
+
+    def get_preferred_modes(self) -> List[str]:
+        return decode_flags(self.preferred_mode_mask, STUDENT_MODE_BITS)
+
+    def set_preferred_modes(self, modes: List[str]) -> None:
+        self.preferred_mode_mask = encode_flags(modes, STUDENT_MODE_BITS)
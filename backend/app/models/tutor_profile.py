@@ -1,11 +1,33 @@
 import uuid
 from datetime import datetime
+from typing import List
 
 from app.extensions import db
+from app.utils.flags import LESSON_MODE_BITS, TEACHING_LEVEL_BITS, decode_flags, encode_flags
+
+
+def _mode_index(mode: str, bit: int) -> db.Index:
+    # Partial index per mode so "approved tutors offering <mode>" never scans the table.
+    condition = db.text(f"status = 'approved' AND (lesson_mode_mask & {bit}) != 0")
+    return db.Index(
+        f"ix_tutor_profiles_approved_{mode}",
+        "id",
+        postgresql_where=condition,
+        sqlite_where=condition,
+    )
 
 
 class TutorProfile(db.Model):
     __tablename__ = "tutor_profiles"
+    __table_args__ = (
+        db.Index(
+            "ix_tutor_profiles_approved",
+            "id",
+            postgresql_where=db.text("status = 'approved'"),
+            sqlite_where=db.text("status = 'approved'"),
+        ),
+        *(_mode_index(mode, bit) for mode, bit in LESSON_MODE_BITS.items()),
+    )
 
     id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     user_id = db.Column(db.String(36), db.ForeignKey("users.id"), unique=True, nullable=False)
@@ -17,8 +39,8 @@ class TutorProfile(db.Model):
     hourly_rate = db.Column(db.Numeric, nullable=False)
     base_city = db.Column(db.String(100), default="Istanbul", nullable=False)
     base_district = db.Column(db.String(100), nullable=False)
-    lesson_modes = db.Column(db.String(255))
-    teaching_levels = db.Column(db.String(255))
+    lesson_mode_mask = db.Column(db.Integer, default=0, nullable=False)
+    teaching_level_mask = db.Column(db.Integer, default=0, nullable=False)
     status = db.Column(db.String(50), default="pending", nullable=False)
     avg_rating = db.Column(db.Float, default=0.0, nullable=False)
     rating_count = db.Column(db.Integer, default=0, nullable=False)
@@ -42,3 +64,30 @@ class TutorProfile(db.Model):
     districts = db.relationship(
         "TutorDistrict", cascade="all, delete-orphan", back_populates="tutor"
     )
+
+    @classmethod
+    def offers_any_mode(cls, mask: int):
+        """SQL filter for tutors offering at least one of the modes in ``mask``.
+
+        Each bit is tested against an inline literal so the planner can match the
+        per-mode partial indexes.
+        """
+        return db.or_(
+            *(
+                cls.lesson_mode_mask.op("&")(db.literal_column(str(bit))) != db.literal_column("0")
+                for bit in LESSON_MODE_BITS.values()
+                if int(mask) & bit
+            )
+        )
+
+    def get_lesson_modes(self) -> List[str]:
+        return decode_flags(self.lesson_mode_mask, LESSON_MODE_BITS)
+
+    def set_lesson_modes(self, modes: List[str]) -> None:
+        self.lesson_mode_mask = encode_flags(modes, LESSON_MODE_BITS)
+
+    def get_teaching_levels(self) -> List[str]:
+        return decode_flags(self.teaching_level_mask, TEACHING_LEVEL_BITS)
+
+    def set_teaching_levels(self, levels: List[str]) -> None:
+        self.teaching_level_mask = encode_flags(levels, TEACHING_LEVEL_BITS)
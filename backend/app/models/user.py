@@ -1,9 +1,8 @@
 import uuid
 from datetime import datetime
 
-from werkzeug.security import check_password_hash, generate_password_hash
-
 from app.extensions import db
+from app.utils.security import hash_password, password_needs_rehash, verify_password
 
 
 class User(db.Model):
@@ -20,7 +19,11 @@ class User(db.Model):
     )
 
     def set_password(self, plain_password: str) -> None:
-        self.password_hash = generate_password_hash(plain_password)
+        self.password_hash = hash_password(plain_password)
 
     def check_password(self, plain_password: str) -> bool:
-        return check_password_hash(self.password_hash, plain_password)
+        return verify_password(plain_password, self.password_hash)
+
+    def password_needs_rehash(self) -> bool:
+        """Whether the stored hash predates the configured hashing policy."""
+        return password_needs_rehash(self.password_hash)
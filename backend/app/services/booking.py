@@ -0,0 +1,240 @@
+import threading
+from bisect import bisect_left
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import datetime, time, timedelta
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from zoneinfo import ZoneInfo
+
+from flask import current_app
+from sqlalchemy import false, or_
+from sqlalchemy.orm import Query
+
+from app.extensions import db
+from app.models import AvailabilitySlot, Lesson, StudentProfile, TutorProfile
+from app.utils.availability import TimeWindow, intersect_windows, merge_windows
+
+# Lessons in these states occupy their time range; cancelled ones free it again.
+BLOCKING_LESSON_STATUSES = ("pending", "confirmed", "completed")
+# Upper bound on the length of any lesson: create and update reject longer ones, and
+# migration 9c3f5e7a1b24 checked the rows booked before. Overlap checks rely on it.
+MAX_LESSON_MINUTES = 240
+SLOT_STEP_MINUTES = 30
+# Slot search schedule for tutors without published availability, who take any time.
+OPEN_WEEK = [TimeWindow(day, time.min, time.max) for day in range(7)]
+
+# Striped locks used where the database cannot reject overlaps itself.
+_booking_locks = [threading.Lock() for _ in range(64)]
+
+
+def availability_zone() -> ZoneInfo:
+    return ZoneInfo(current_app.config.get("AVAILABILITY_TIMEZONE", "Europe/Istanbul"))
+
+
+def to_local(value: datetime) -> datetime:
+    """Naive wall-clock time in ``AVAILABILITY_TIMEZONE``, the convention lessons are stored in.
+
+    Naive values are taken to be local already; aware ones are converted.
+    """
+    if value.tzinfo is None:
+        return value
+    return value.astimezone(availability_zone()).replace(tzinfo=None)
+
+
+def local_now() -> datetime:
+    return datetime.now(availability_zone()).replace(tzinfo=None)
+
+
+def find_conflicts(
+    start: datetime,
+    end: datetime,
+    tutor_id: Optional[str] = None,
+    student_id: Optional[str] = None,
+    exclude_id: Optional[str] = None,
+) -> Query:
+    """Query for blocking lessons of ``tutor_id`` or ``student_id`` overlapping ``[start, end)``.
+
+    No lesson is longer than ``MAX_LESSON_MINUTES``, so the start is bounded on both
+    sides and the per-party ``(…, start_datetime)`` indexes serve a short range.
+    """
+    parties = []
+    if tutor_id:
+        parties.append(Lesson.tutor_id == tutor_id)
+    if student_id:
+        parties.append(Lesson.student_id == student_id)
+    if not parties:
+        return Lesson.query.filter(false())
+
+    query = Lesson.query.filter(
+        or_(*parties),
+        Lesson.start_datetime > start - timedelta(minutes=MAX_LESSON_MINUTES),
+        Lesson.start_datetime < end,
+        Lesson.end_datetime > start,
+        Lesson.status.in_(BLOCKING_LESSON_STATUSES),
+    )
+    if exclude_id:
+        query = query.filter(Lesson.id != exclude_id)
+    return query
+
+
+def tutor_windows(tutor_user_id: str) -> Optional[List[TimeWindow]]:
+    """The tutor's merged weekly windows, or ``None`` if they have not published any.
+
+    ``None`` means the tutor can be booked at any time. ``fits_availability`` and
+    ``bookable_slots`` both apply that rule, so every offered slot can be booked.
+    """
+    return merge_windows(AvailabilitySlot.query.filter_by(user_id=tutor_user_id)) or None
+
+
+def fits_availability(tutor_user_id: str, start: datetime, end: datetime) -> bool:
+    """Whether ``[start, end)`` lies inside one of the tutor's weekly windows."""
+    windows = tutor_windows(tutor_user_id)
+    if windows is None:
+        return True
+    if end.date() != start.date():
+        return False
+    return any(
+        window.day_of_week == start.weekday()
+        and window.start_time <= start.time()
+        and end.time() <= window.end_time
+        for window in windows
+    )
+
+
+def booking_errors(
+    tutor_id: str,
+    tutor_user_id: str,
+    student_id: str,
+    start: datetime,
+    end: datetime,
+    exclude_id: Optional[str] = None,
+    check_availability: bool = True,
+) -> Dict[str, str]:
+    """Reasons a lesson in ``[start, end)`` cannot be booked; empty when it can.
+
+    ``check_availability=False`` checks overlaps only, for a lesson that keeps its
+    time but blocks it again, e.g. one taken back from ``cancelled``.
+    """
+    errors = {}
+    if check_availability and not fits_availability(tutor_user_id, start, end):
+        errors["availability"] = "Outside the tutor's availability."
+    for lesson in find_conflicts(start, end, tutor_id, student_id, exclude_id):
+        if lesson.tutor_id == tutor_id:
+            errors["tutor_id"] = "The tutor already has a lesson at this time."
+        if lesson.student_id == student_id:
+            errors["student_id"] = "The student already has a lesson at this time."
+    return errors
+
+
+def iter_bookable_slots(
+    windows: Iterable[TimeWindow],
+    busy: List[Tuple[datetime, datetime]],
+    duration_minutes: int,
+    weeks: int,
+    not_before: datetime,
+    step_minutes: int = SLOT_STEP_MINUTES,
+) -> Iterator[Tuple[datetime, datetime]]:
+    """Yield free ``(start, end)`` slots as naive local times, earliest first.
+
+    ``windows`` is a weekly schedule, expanded day by day over the
+    next ``weeks`` weeks from ``not_before``. Slot starts are ``step_minutes`` apart,
+    counted from the start of the window. ``busy`` must be sorted by start. A slot
+    that overlaps an entry is skipped, and the search resumes at the first step after
+    that entry ends. Nothing is computed past the slots the caller consumes.
+    """
+    length = timedelta(minutes=duration_minutes)
+    step = timedelta(minutes=step_minutes)
+    longest_busy = max((end - start for start, end in busy), default=timedelta(0))
+    busy_starts = [start for start, _ in busy]
+
+    by_day: Dict[int, List[TimeWindow]] = defaultdict(list)
+    for window in sorted(windows, key=lambda window: (window.day_of_week, window.start_time)):
+        if window.minutes >= duration_minutes:
+            by_day[window.day_of_week].append(window)
+
+    def aligned(origin: datetime, at_least: datetime) -> datetime:
+        if at_least <= origin:
+            return origin
+        return origin + step * -((origin - at_least) // step)
+
+    first_day = not_before.date()
+    for offset in range(weeks * 7):
+        day = first_day + timedelta(days=offset)
+        for window in by_day.get(day.weekday(), ()):
+            window_start = datetime.combine(day, window.start_time)
+            window_end = datetime.combine(day, window.end_time)
+            cursor = aligned(window_start, not_before)
+            while cursor + length <= window_end:
+                slot_end = cursor + length
+                blocked_until = None
+                index = bisect_left(busy_starts, slot_end) - 1
+                # Entries starting more than the longest busy span earlier cannot overlap.
+                while index >= 0 and busy[index][0] > cursor - longest_busy:
+                    busy_end = busy[index][1]
+                    if busy_end > cursor and (blocked_until is None or busy_end > blocked_until):
+                        blocked_until = busy_end
+                    index -= 1
+                if blocked_until is None:
+                    yield cursor, slot_end
+                    cursor += step
+                else:
+                    cursor = aligned(window_start, blocked_until)
+
+
+def bookable_slots(
+    tutor: TutorProfile,
+    student: StudentProfile,
+    duration_minutes: int,
+    weeks: int = 4,
+    now: Optional[datetime] = None,
+) -> Iterator[Tuple[datetime, datetime]]:
+    """Concrete slots both ``tutor`` and ``student`` can take over the next ``weeks`` weeks.
+
+    Uses the intersection of their weekly availability, or the tutor's alone when
+    the student has not set any, minus both parties' blocking lessons. A tutor
+    without published availability counts as free all day (see ``tutor_windows``).
+    Slot starts follow ``iter_bookable_slots``; take as many as needed with
+    ``itertools.islice``.
+    """
+    now = now or local_now()
+    schedule = tutor_windows(tutor.user_id) or OPEN_WEEK
+    student_windows = merge_windows(AvailabilitySlot.query.filter_by(user_id=student.user_id))
+    windows = (
+        intersect_windows(student_windows, schedule, min_minutes=duration_minutes)
+        if student_windows
+        else schedule
+    )
+
+    horizon_end = now + timedelta(weeks=weeks, days=1)
+    busy = sorted(
+        (lesson.start_datetime, lesson.end_datetime)
+        for lesson in Lesson.query.filter(
+            or_(Lesson.tutor_id == tutor.id, Lesson.student_id == student.id),
+            Lesson.end_datetime > now,
+            Lesson.start_datetime < horizon_end,
+            Lesson.status.in_(BLOCKING_LESSON_STATUSES),
+        )
+    )
+    return iter_bookable_slots(windows, busy, duration_minutes, weeks, now)
+
+
+@contextmanager
+def booking_guard(*party_ids: str) -> Iterator[None]:
+    """Serialize check-then-write for the given tutor/student ids.
+
+    On PostgreSQL the exclusion constraints on ``lessons`` reject overlapping
+    writes, so no lock is taken. Other databases such as SQLite have no such
+    constraint, so bookings are serialized in this process instead.
+    """
+    if db.engine.dialect.name == "postgresql":
+        yield
+        return
+    stripes = sorted({hash(party_id) % len(_booking_locks) for party_id in party_ids})
+    locks = [_booking_locks[stripe] for stripe in stripes]
+    for lock in locks:
+        lock.acquire()
+    try:
+        yield
+    finally:
+        for lock in reversed(locks):
+            lock.release()
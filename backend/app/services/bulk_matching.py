@@ -0,0 +1,199 @@
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict, defaultdict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from flask import Flask
+from sqlalchemy import insert
+from sqlalchemy.orm import joinedload, selectinload
+
+from app.extensions import db
+from app.models import AvailabilitySlot, LessonRequest, MatchSuggestion
+from app.services.matcher import MatchJob, RankedTutor, build_match_job, find_overlapping_slots, rank_job
+from app.services.matching_index import MatchingIndex, TutorRecord, matching_index
+
+# Finished jobs kept for status lookups; older ones are forgotten first.
+JOB_HISTORY = 20
+
+_worker_index: Optional[MatchingIndex] = None
+
+
+def _init_worker(records: List[TutorRecord]) -> None:
+    global _worker_index
+    _worker_index = MatchingIndex.from_records(records)
+
+
+def _rank_in_worker(job: MatchJob, limit: int) -> Tuple[str, List[Tuple[RankedTutor, List[dict]]]]:
+    ranked = rank_job(_worker_index, job, limit)
+    return job.request_id, [
+        (
+            entry,
+            find_overlapping_slots(job.student_windows, list(entry.slots), job.min_minutes)[1],
+        )
+        for entry in ranked
+    ]
+
+
+def _load_open_jobs() -> List[MatchJob]:
+    lesson_requests = (
+        LessonRequest.query.options(
+            joinedload(LessonRequest.student),
+            selectinload(LessonRequest.subject_links),
+            selectinload(LessonRequest.mode_links),
+        )
+        .filter(LessonRequest.status == "open")
+        .all()
+    )
+    user_ids = list({lesson_request.student.user_id for lesson_request in lesson_requests})
+    slots_by_user: Dict[str, List[AvailabilitySlot]] = defaultdict(list)
+    if user_ids:
+        for slot in AvailabilitySlot.query.filter(AvailabilitySlot.user_id.in_(user_ids)):
+            slots_by_user[slot.user_id].append(slot)
+
+    jobs = []
+    for lesson_request in lesson_requests:
+        job = build_match_job(lesson_request, slots_by_user[lesson_request.student.user_id])
+        if job is not None:
+            jobs.append(job)
+    return jobs
+
+
+def match_open_requests(workers: Optional[int] = None, limit: int = 10) -> dict:
+    """Rank tutors for every open lesson request and store the results as MatchSuggestions.
+
+    The tutor catalog is loaded once and handed to each worker process when the pool
+    starts; ``workers`` of 0 or 1 ranks in this process instead. Previous suggestions
+    for the matched requests are replaced in a single transaction.
+    """
+    started = time.perf_counter()
+    jobs = _load_open_jobs()
+    records = matching_index.export_records()
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    if workers > 1 and len(jobs) > 1:
+        chunksize = max(1, len(jobs) // (workers * 4))
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_worker, initargs=(records,)
+        ) as executor:
+            results = list(
+                executor.map(_rank_in_worker, jobs, [limit] * len(jobs), chunksize=chunksize)
+            )
+    else:
+        _init_worker(records)
+        results = [_rank_in_worker(job, limit) for job in jobs]
+
+    rows = [
+        {
+            "lesson_request_id": request_id,
+            "tutor_id": entry.tutor_id,
+            "rank": rank,
+            "score": entry.score,
+            "has_availability_overlap": entry.has_overlap,
+            "overlap_minutes": entry.overlap_minutes,
+            "suggested_slots": suggested_slots,
+        }
+        for request_id, ranked in results
+        for rank, (entry, suggested_slots) in enumerate(ranked, start=1)
+    ]
+
+    request_ids = [job.request_id for job in jobs]
+    if request_ids:
+        MatchSuggestion.query.filter(
+            MatchSuggestion.lesson_request_id.in_(request_ids)
+        ).delete(synchronize_session=False)
+    if rows:
+        db.session.execute(insert(MatchSuggestion), rows)
+    db.session.commit()
+
+    elapsed = time.perf_counter() - started
+    return {
+        "requests": len(jobs),
+        "suggestions": len(rows),
+        "workers": max(workers, 1),
+        "seconds": round(elapsed, 3),
+        "requests_per_second": round(len(jobs) / elapsed, 2) if elapsed > 0 else None,
+    }
+
+
+class BulkMatchingJobs:
+    """Runs ``match_open_requests`` for API callers on a background thread.
+
+    ``submit`` returns at once with a job id that ``get`` reports on. One run is
+    active at a time, and its pool is capped at ``BULK_MATCHING_HTTP_WORKERS``
+    processes so a run started over HTTP leaves cores for serving requests. Jobs
+    are held in the process that started them; the CLI command stays synchronous.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._jobs: "OrderedDict[str, dict]" = OrderedDict()
+        self._app: Optional[Flask] = None
+        self.max_workers = 2
+
+    def init_app(self, app: Flask) -> None:
+        app.extensions["bulk_matching_jobs"] = self
+        self._app = app
+        self.max_workers = app.config.get("BULK_MATCHING_HTTP_WORKERS", self.max_workers)
+        with self._lock:
+            self._jobs.clear()
+
+    def submit(self, workers: Optional[int], limit: int) -> Tuple[dict, bool]:
+        """Queue a run; returns ``(job, True)``, or ``(active job, False)`` if one is running."""
+        workers = self.max_workers if workers is None else min(workers, self.max_workers)
+        with self._lock:
+            for job in self._jobs.values():
+                if job["status"] in {"queued", "running"}:
+                    return dict(job), False
+            job = {
+                "id": str(uuid.uuid4()),
+                "status": "queued",
+                "workers": workers,
+                "limit": limit,
+                "created_at": datetime.utcnow().isoformat(),
+                "started_at": None,
+                "finished_at": None,
+                "result": None,
+                "error": None,
+            }
+            self._jobs[job["id"]] = job
+            while len(self._jobs) > JOB_HISTORY:
+                self._jobs.popitem(last=False)
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="bulk-matching")
+            executor = self._executor
+        executor.submit(self._run, job["id"], workers, limit)
+        return dict(job), True
+
+    def get(self, job_id: str) -> Optional[dict]:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job) if job is not None else None
+
+    def _update(self, job_id: str, **fields) -> None:
+        with self._lock:
+            if job_id in self._jobs:
+                self._jobs[job_id].update(fields)
+
+    def _run(self, job_id: str, workers: int, limit: int) -> None:
+        self._update(job_id, status="running", started_at=datetime.utcnow().isoformat())
+        try:
+            with self._app.app_context():
+                result = match_open_requests(workers=workers, limit=limit)
+        except Exception as exc:
+            self._app.logger.exception("Bulk matching job %s failed", job_id)
+            self._update(
+                job_id, status="failed", error=str(exc), finished_at=datetime.utcnow().isoformat()
+            )
+        else:
+            self._update(
+                job_id, status="succeeded", result=result, finished_at=datetime.utcnow().isoformat()
+            )
+
+
+bulk_matching_jobs = BulkMatchingJobs()
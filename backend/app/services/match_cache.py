@@ -0,0 +1,137 @@
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+from flask import Flask, current_app
+from sqlalchemy import func
+
+from app.extensions import db
+from app.models import AvailabilitySlot, LessonRequest
+from app.services.matcher import MatchSnapshot, rank_matches
+from app.services.matching_index import matching_index
+
+
+class MatchCache:
+    """LRU cache of ranked match snapshots keyed by lesson request id and options.
+
+    Each entry carries the version stamp it was computed for; a lookup with a
+    different stamp counts as a miss. Entries also expire after ``MATCH_CACHE_TTL``.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Hashable, Tuple[Hashable, float, Any]]" = OrderedDict()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self.max_entries = 1024
+        self.ttl = 300
+        self.hits = 0
+        self.misses = 0
+
+    def init_app(self, app: Flask) -> None:
+        app.extensions["match_cache"] = self
+        self.max_entries = app.config.get("MATCH_CACHE_SIZE", self.max_entries)
+        self.ttl = app.config.get("MATCH_CACHE_TTL", self.ttl)
+        self.clear()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def get(self, key: Hashable, version: Hashable) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != version or entry[1] < time.monotonic():
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[2]
+
+    def put(self, key: Hashable, version: Hashable, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = (version, time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+            }
+
+    def submit(self, fn, *args) -> None:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="match-precompute")
+            executor = self._executor
+        executor.submit(fn, *args)
+
+
+match_cache = MatchCache()
+
+
+def match_version(lesson_request: LessonRequest) -> Hashable:
+    """Stamp covering everything a match result depends on.
+
+    Combines the request and student profile ``updated_at``, the student's slot count
+    and latest slot change, and the tutor index generation.
+    """
+    student = lesson_request.student
+    slot_count, slots_updated_at = (
+        db.session.query(func.count(AvailabilitySlot.id), func.max(AvailabilitySlot.updated_at))
+        .filter(AvailabilitySlot.user_id == student.user_id)
+        .one()
+    )
+    return (
+        lesson_request.updated_at,
+        student.updated_at,
+        slot_count,
+        slots_updated_at,
+        matching_index.current_generation(),
+    )
+
+
+def get_match_snapshot(lesson_request: LessonRequest, min_minutes: int = 0) -> Optional[MatchSnapshot]:
+    """Return the cached ranking for ``lesson_request``, computing it on a miss.
+
+    The ranking holds the best ``MATCH_SNAPSHOT_DEPTH`` tutors so later pages are
+    served from the same snapshot without rerunning the pipeline.
+    """
+    key = (lesson_request.id, min_minutes)
+    version = match_version(lesson_request)
+    snapshot = match_cache.get(key, version)
+    if snapshot is None:
+        snapshot = rank_matches(
+            lesson_request,
+            depth=current_app.config.get("MATCH_SNAPSHOT_DEPTH", 200),
+            min_minutes=min_minutes,
+        )
+        match_cache.put(key, version, snapshot)
+    return snapshot
+
+
+def _precompute(app: Flask, request_id: str) -> None:
+    with app.app_context():
+        try:
+            lesson_request = LessonRequest.query.get(request_id)
+            if lesson_request is not None:
+                get_match_snapshot(lesson_request)
+        except Exception:
+            app.logger.exception("Match precompute failed for lesson request %s", request_id)
+        finally:
+            db.session.remove()
+
+
+def schedule_precompute(request_id: str) -> None:
+    """Warm the cache for ``request_id`` in the background when ``MATCH_PRECOMPUTE`` is on."""
+    if not current_app.config.get("MATCH_PRECOMPUTE"):
+        return
+    match_cache.submit(_precompute, current_app._get_current_object(), request_id)
@@ -0,0 +1,106 @@
+import heapq
+from typing import Callable, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.services.matching_index import TutorRecord
+
+OVERLAP_POINTS = 20.0
+
+
+class RankedCandidate(NamedTuple):
+    position: int
+    score: float
+    has_overlap: bool
+    overlap_minutes: int
+
+
+def score_candidates(
+    records: Sequence[TutorRecord],
+    student_district: Optional[str],
+    budget_min: Optional[float],
+    budget_max: Optional[float],
+    has_overlap: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """Compute match scores for all ``records`` at once.
+
+    Mirrors the matching rules: +50 base, +30 same base district or +20 served
+    district, +20 in budget or +5 within 20% of it, +20 availability overlap, and
+    +10/+5 for strong ratings. Without ``has_overlap`` the overlap bonus is left out.
+    """
+    count = len(records)
+    scores = np.full(count, 50.0)
+    if not count:
+        return scores
+
+    same_district = np.fromiter(
+        (record.base_district == student_district for record in records), dtype=bool, count=count
+    )
+    served_district = np.fromiter(
+        (student_district in record.districts for record in records), dtype=bool, count=count
+    )
+    scores += np.where(same_district, 30.0, np.where(served_district, 20.0, 0.0))
+
+    if budget_min is not None and budget_max is not None:
+        rates = np.fromiter(
+            (np.nan if record.hourly_rate is None else record.hourly_rate for record in records),
+            dtype=float,
+            count=count,
+        )
+        in_budget = (rates >= budget_min) & (rates <= budget_max)
+        near_budget = (rates >= budget_min * 0.8) & (rates <= budget_max * 1.2)
+        scores += np.where(in_budget, 20.0, np.where(near_budget, 5.0, 0.0))
+
+    if has_overlap is not None:
+        scores += np.where(has_overlap, OVERLAP_POINTS, 0.0)
+
+    ratings = np.fromiter(
+        (np.nan if record.avg_rating is None else record.avg_rating for record in records),
+        dtype=float,
+        count=count,
+    )
+    rating_counts = np.fromiter(
+        (-1 if record.rating_count is None else record.rating_count for record in records),
+        dtype=np.int64,
+        count=count,
+    )
+    top_rated = (ratings >= 4.5) & (rating_counts >= 5)
+    well_rated = (ratings >= 4.0) & (rating_counts >= 3)
+    scores += np.where(top_rated, 10.0, np.where(well_rated, 5.0, 0.0))
+
+    return scores
+
+
+def select_top_k(
+    base_scores: np.ndarray,
+    overlap_of: Callable[[int], Tuple[bool, int]],
+    k: int,
+) -> List[RankedCandidate]:
+    """Pick the ``k`` best candidates while evaluating availability for as few as possible.
+
+    ``base_scores`` exclude the overlap bonus, so ``base + OVERLAP_POINTS`` bounds each
+    final score. Candidates are visited best bound first and kept in a bounded heap;
+    the scan stops once no remaining bound can reach the heap's worst score.
+    ``overlap_of(position)`` returns ``(has_overlap, overlap_minutes)``. Ties rank by
+    overlap minutes, then input position.
+    """
+    if k <= 0:
+        return []
+    heap: List[Tuple[float, int, int, bool]] = []
+    for position in np.argsort(-base_scores, kind="stable").tolist():
+        base_score = float(base_scores[position])
+        if len(heap) == k and base_score + OVERLAP_POINTS < heap[0][0]:
+            break
+        has_overlap, overlap_minutes = overlap_of(position)
+        score = base_score + OVERLAP_POINTS if has_overlap else base_score
+        item = (score, overlap_minutes, -position, has_overlap)
+        if len(heap) < k:
+            heapq.heappush(heap, item)
+        elif item[:3] > heap[0][:3]:
+            heapq.heapreplace(heap, item)
+
+    ranked = sorted(heap, key=lambda item: item[:3], reverse=True)
+    return [
+        RankedCandidate(-neg_position, score, has_overlap, overlap_minutes)
+        for score, overlap_minutes, neg_position, has_overlap in ranked
+    ]
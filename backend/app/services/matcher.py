@@ -0,0 +1,190 @@
+import bisect
+from typing import Iterable, List, NamedTuple, Optional, Tuple
+
+from app.models import AvailabilitySlot, LessonRequest, StudentProfile
+from app.services.match_scoring import score_candidates, select_top_k
+from app.services.matching_index import MatchingIndex, matching_index
+from app.services.matching_loader import load_matching_candidates
+from app.utils.availability import (
+    TimeWindow,
+    has_run,
+    intersect_windows,
+    merge_windows,
+    week_mask,
+)
+from app.utils.flags import IN_PERSON_MODE_MASK, LESSON_MODE_BITS, encode_flags
+
+
+def find_overlapping_slots(
+    student_windows: List[TimeWindow],
+    tutor_windows: List[TimeWindow],
+    min_minutes: int = 0,
+    limit: int = 3,
+) -> Tuple[bool, List[dict]]:
+    overlaps = intersect_windows(student_windows, tutor_windows, min_minutes=min_minutes)
+    return bool(overlaps), [window.to_dict() for window in overlaps[:limit]]
+
+
+class RankedTutor(NamedTuple):
+    tutor_id: str
+    score: float
+    has_overlap: bool
+    overlap_minutes: int
+    slots: Tuple[TimeWindow, ...]
+
+    @property
+    def sort_key(self) -> Tuple[float, int, str]:
+        return (-self.score, -self.overlap_minutes, self.tutor_id)
+
+
+class MatchSnapshot(NamedTuple):
+    """Ranked candidates for one lesson request, best first by ``RankedTutor.sort_key``."""
+
+    subject_ids: List[str]
+    mode_mask: int
+    student_windows: List[TimeWindow]
+    min_minutes: int
+    ranked: List[RankedTutor]
+
+    def page(
+        self, after: Optional[Tuple[float, int, str]] = None, limit: int = 10
+    ) -> Tuple[List[RankedTutor], bool]:
+        """Return up to ``limit`` entries ranked after ``after`` and whether more remain."""
+        start = 0
+        if after is not None:
+            start = bisect.bisect_right(self.ranked, tuple(after), key=lambda entry: entry.sort_key)
+        entries = self.ranked[start : start + limit]
+        return entries, start + limit < len(self.ranked)
+
+
+class MatchJob(NamedTuple):
+    """Everything needed to rank tutors for one lesson request, detached from the session."""
+
+    request_id: str
+    subject_ids: List[str]
+    mode_mask: int
+    district: Optional[str]
+    budget_min: Optional[float]
+    budget_max: Optional[float]
+    min_minutes: int
+    student_windows: List[TimeWindow]
+
+
+def build_match_job(
+    lesson_request: LessonRequest, student_slots: Iterable, min_minutes: int = 0
+) -> Optional[MatchJob]:
+    """Describe ``lesson_request`` as a MatchJob; None when it names no subjects.
+
+    ``min_minutes`` is the shortest shared window that counts as an availability
+    overlap; 0 accepts any overlap.
+    """
+    subject_ids = lesson_request.get_subject_id_list()
+    if not subject_ids:
+        return None
+    student_profile: StudentProfile = lesson_request.student
+    return MatchJob(
+        request_id=lesson_request.id,
+        subject_ids=subject_ids,
+        mode_mask=encode_flags(lesson_request.get_preferred_modes(), LESSON_MODE_BITS),
+        district=student_profile.district,
+        budget_min=float(lesson_request.budget_min) if lesson_request.budget_min is not None else None,
+        budget_max=float(lesson_request.budget_max) if lesson_request.budget_max is not None else None,
+        min_minutes=min_minutes,
+        student_windows=merge_windows(student_slots),
+    )
+
+
+def rank_job(index: MatchingIndex, job: MatchJob, depth: int = 10) -> List[RankedTutor]:
+    """Rank up to ``depth`` tutors from ``index`` for ``job``."""
+    candidates = index.select(
+        job.subject_ids,
+        mode_mask=job.mode_mask,
+        district=job.district if job.mode_mask & IN_PERSON_MODE_MASK else None,
+    )
+
+    student_mask = week_mask(job.student_windows)
+    min_run = max(job.min_minutes, 1)
+
+    def overlap_of(position: int) -> Tuple[bool, int]:
+        shared_mask = candidates[position].availability_mask & student_mask
+        return has_run(shared_mask, min_run), shared_mask.bit_count()
+
+    base_scores = score_candidates(candidates, job.district, job.budget_min, job.budget_max)
+    return [
+        RankedTutor(
+            tutor_id=candidates[entry.position].tutor_id,
+            score=entry.score,
+            has_overlap=entry.has_overlap,
+            overlap_minutes=entry.overlap_minutes,
+            slots=candidates[entry.position].slots,
+        )
+        for entry in select_top_k(base_scores, overlap_of, depth)
+    ]
+
+
+def rank_matches(
+    lesson_request: LessonRequest, depth: int = 10, min_minutes: int = 0
+) -> Optional[MatchSnapshot]:
+    """Rank up to ``depth`` tutors for ``lesson_request``; None when it names no subjects."""
+    student_slots = AvailabilitySlot.query.filter_by(
+        user_id=lesson_request.student.user_id
+    ).all()
+    job = build_match_job(lesson_request, student_slots, min_minutes)
+    if job is None:
+        return None
+
+    matching_index.ensure_built()
+    ranked = rank_job(matching_index, job, depth)
+    return MatchSnapshot(job.subject_ids, job.mode_mask, job.student_windows, job.min_minutes, ranked)
+
+
+def serialize_matches(snapshot: MatchSnapshot, entries: List[RankedTutor]) -> List[dict]:
+    """Load profile details for ``entries`` and build the match response items.
+
+    Tutors that no longer pass the subject, status or lesson mode filters in the
+    database are left out, even if a stale index ranked them.
+    """
+    details = load_matching_candidates(
+        snapshot.subject_ids,
+        tutor_ids=[entry.tutor_id for entry in entries],
+        mode_mask=snapshot.mode_mask,
+    )
+
+    results = []
+    for entry in entries:
+        candidate = details.get(entry.tutor_id)
+        if candidate is None:
+            continue
+        tutor = candidate.tutor
+        _, suggested_slots = find_overlapping_slots(
+            snapshot.student_windows, list(entry.slots), min_minutes=snapshot.min_minutes
+        )
+        results.append(
+            {
+                "tutor_id": tutor.id,
+                "full_name": tutor.full_name,
+                "title": tutor.title,
+                "hourly_rate": float(tutor.hourly_rate) if tutor.hourly_rate is not None else None,
+                "base_district": tutor.base_district,
+                "avg_rating": tutor.avg_rating,
+                "rating_count": tutor.rating_count,
+                "score": entry.score,
+                "subjects": [
+                    {"id": subject.id, "name": subject.name, "category": subject.category}
+                    for subject in candidate.subjects
+                ],
+                "has_availability_overlap": entry.has_overlap,
+                "overlap_minutes": entry.overlap_minutes,
+                "suggested_slots": suggested_slots,
+            }
+        )
+
+    return results
+
+
+def compute_matches(lesson_request: LessonRequest, limit: int = 10) -> Optional[List[dict]]:
+    """Rank tutors for ``lesson_request``; returns None when it names no subjects."""
+    snapshot = rank_matches(lesson_request, depth=limit)
+    if snapshot is None:
+        return None
+    return serialize_matches(snapshot, snapshot.ranked)
@@ -0,0 +1,233 @@
+import threading
+import time
+from collections import defaultdict
+from typing import Dict, FrozenSet, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from flask import Flask, current_app
+
+from app.extensions import db
+from app.models import AvailabilitySlot, TutorProfile
+from app.models.relationships import TutorDistrict, TutorSubject
+from app.utils.availability import TimeWindow, merge_windows, week_mask
+
+
+class TutorRecord(NamedTuple):
+    tutor_id: str
+    user_id: str
+    base_district: str
+    districts: FrozenSet[str]
+    lesson_mode_mask: int
+    subject_ids: FrozenSet[str]
+    hourly_rate: Optional[float]
+    avg_rating: Optional[float]
+    rating_count: Optional[int]
+    slots: Tuple[TimeWindow, ...]
+    availability_mask: int
+
+    def serves_district(self, district: str) -> bool:
+        return self.base_district == district or district in self.districts
+
+
+class MatchingIndex:
+    """Process-local view of approved tutors used to filter match candidates in memory.
+
+    The index is built lazily on first use and then kept current by the tutor and
+    availability endpoints. Writes made by other worker processes are picked up by a
+    full rebuild once the index is older than ``MATCHING_INDEX_MAX_AGE`` seconds.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.RLock()
+        self._built_at: Optional[float] = None
+        self.generation = 0
+        self.records: Dict[str, TutorRecord] = {}
+        self.tutor_by_user: Dict[str, str] = {}
+        self.by_subject: Dict[str, Set[str]] = defaultdict(set)
+        self.by_district: Dict[str, Set[str]] = defaultdict(set)
+
+    def init_app(self, app: Flask) -> None:
+        app.extensions["matching_index"] = self
+        self.invalidate()
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._built_at = None
+
+    def ensure_built(self) -> None:
+        max_age = current_app.config.get("MATCHING_INDEX_MAX_AGE")
+        with self._lock:
+            if self._built_at is not None and (
+                not max_age or time.monotonic() - self._built_at < max_age
+            ):
+                return
+            self._rebuild()
+
+    def _rebuild(self) -> None:
+        tutors = TutorProfile.query.filter(TutorProfile.status == "approved").all()
+        tutor_ids = [tutor.id for tutor in tutors]
+        user_ids = [tutor.user_id for tutor in tutors]
+
+        subjects: Dict[str, Set[str]] = defaultdict(set)
+        districts: Dict[str, Set[str]] = defaultdict(set)
+        slots: Dict[str, List[TimeWindow]] = defaultdict(list)
+        if tutor_ids:
+            for tutor_id, subject_id in db.session.query(
+                TutorSubject.tutor_id, TutorSubject.subject_id
+            ).filter(TutorSubject.tutor_id.in_(tutor_ids)):
+                subjects[tutor_id].add(subject_id)
+            for tutor_id, district in db.session.query(
+                TutorDistrict.tutor_id, TutorDistrict.district
+            ).filter(TutorDistrict.tutor_id.in_(tutor_ids)):
+                districts[tutor_id].add(district)
+            for user_id, day, start, end in db.session.query(
+                AvailabilitySlot.user_id,
+                AvailabilitySlot.day_of_week,
+                AvailabilitySlot.start_time,
+                AvailabilitySlot.end_time,
+            ).filter(AvailabilitySlot.user_id.in_(user_ids)):
+                slots[user_id].append(TimeWindow(day, start, end))
+
+        self.records = {}
+        self.tutor_by_user = {}
+        self.by_subject = defaultdict(set)
+        self.by_district = defaultdict(set)
+        for tutor in tutors:
+            self._add(
+                self._make_record(
+                    tutor, subjects[tutor.id], districts[tutor.id], slots[tutor.user_id]
+                )
+            )
+        self._built_at = time.monotonic()
+        self.generation += 1
+
+    @staticmethod
+    def _make_record(
+        tutor: TutorProfile,
+        subject_ids: Iterable[str],
+        districts: Iterable[str],
+        slots: Iterable[TimeWindow],
+    ) -> TutorRecord:
+        merged = tuple(merge_windows(slots))
+        return TutorRecord(
+            tutor_id=tutor.id,
+            user_id=tutor.user_id,
+            base_district=tutor.base_district,
+            districts=frozenset(districts),
+            lesson_mode_mask=tutor.lesson_mode_mask or 0,
+            subject_ids=frozenset(str(subject_id) for subject_id in subject_ids),
+            hourly_rate=float(tutor.hourly_rate) if tutor.hourly_rate is not None else None,
+            avg_rating=tutor.avg_rating,
+            rating_count=tutor.rating_count,
+            slots=merged,
+            availability_mask=week_mask(merged),
+        )
+
+    def _add(self, record: TutorRecord) -> None:
+        self.records[record.tutor_id] = record
+        self.tutor_by_user[record.user_id] = record.tutor_id
+        for subject_id in record.subject_ids:
+            self.by_subject[subject_id].add(record.tutor_id)
+        for district in record.districts | {record.base_district}:
+            self.by_district[district].add(record.tutor_id)
+
+    def _discard(self, tutor_id: str) -> None:
+        record = self.records.pop(tutor_id, None)
+        if record is None:
+            return
+        self.tutor_by_user.pop(record.user_id, None)
+        for subject_id in record.subject_ids:
+            self.by_subject[subject_id].discard(tutor_id)
+        for district in record.districts | {record.base_district}:
+            self.by_district[district].discard(tutor_id)
+
+    def refresh_tutor(self, tutor: TutorProfile) -> None:
+        """Re-index ``tutor`` after its profile, subjects or districts were written."""
+        with self._lock:
+            if self._built_at is None:
+                return
+            self.generation += 1
+            self._discard(tutor.id)
+            if tutor.status != "approved":
+                return
+            slots = [
+                TimeWindow(slot.day_of_week, slot.start_time, slot.end_time)
+                for slot in AvailabilitySlot.query.filter_by(user_id=tutor.user_id)
+            ]
+            self._add(
+                self._make_record(
+                    tutor,
+                    [subject.id for subject in tutor.subjects],
+                    [district.district for district in tutor.districts],
+                    slots,
+                )
+            )
+
+    def refresh_slots(self, user_id: str) -> None:
+        """Reload availability for ``user_id`` if it belongs to an indexed tutor."""
+        with self._lock:
+            tutor_id = self.tutor_by_user.get(user_id)
+            if self._built_at is None or tutor_id is None:
+                return
+            rows = db.session.query(
+                AvailabilitySlot.day_of_week,
+                AvailabilitySlot.start_time,
+                AvailabilitySlot.end_time,
+            ).filter(AvailabilitySlot.user_id == user_id)
+            slots = tuple(merge_windows(TimeWindow(day, start, end) for day, start, end in rows))
+            self.generation += 1
+            self.records[tutor_id] = self.records[tutor_id]._replace(
+                slots=slots, availability_mask=week_mask(slots)
+            )
+
+    def export_records(self) -> List[TutorRecord]:
+        self.ensure_built()
+        with self._lock:
+            return list(self.records.values())
+
+    @classmethod
+    def from_records(cls, records: Iterable[TutorRecord]) -> "MatchingIndex":
+        """Build a detached index, e.g. inside a worker process without app context."""
+        index = cls()
+        for record in records:
+            index._add(record)
+        index._built_at = time.monotonic()
+        return index
+
+    def current_generation(self) -> int:
+        """Counter bumped on every change to the index, for keying derived caches."""
+        self.ensure_built()
+        return self.generation
+
+    def candidates(
+        self,
+        subject_ids: Iterable[str],
+        mode_mask: int = 0,
+        district: Optional[str] = None,
+    ) -> List[TutorRecord]:
+        """Return approved tutors teaching any subject, offering any mode in ``mode_mask``
+        (see ``app.utils.flags``) and serving ``district``."""
+        self.ensure_built()
+        return self.select(subject_ids, mode_mask, district)
+
+    def select(
+        self,
+        subject_ids: Iterable[str],
+        mode_mask: int = 0,
+        district: Optional[str] = None,
+    ) -> List[TutorRecord]:
+        """Like ``candidates`` but queries the index as is, without building or refreshing it."""
+        with self._lock:
+            tutor_ids: Set[str] = set()
+            for subject_id in subject_ids:
+                tutor_ids |= self.by_subject.get(str(subject_id), set())
+
+            if district is not None:
+                tutor_ids &= self.by_district.get(district, set())
+
+            records = [self.records[tutor_id] for tutor_id in sorted(tutor_ids)]
+            if mode_mask:
+                records = [record for record in records if record.lesson_mode_mask & mode_mask]
+            return records
+
+
+matching_index = MatchingIndex()
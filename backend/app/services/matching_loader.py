@@ -0,0 +1,71 @@
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Set
+
+from app.extensions import db
+from app.models import AvailabilitySlot, Subject, TutorProfile
+from app.models.relationships import TutorDistrict, TutorSubject
+
+
+@dataclass
+class TutorCandidate:
+    tutor: TutorProfile
+    districts: Set[str] = field(default_factory=set)
+    slots: List[AvailabilitySlot] = field(default_factory=list)
+    subjects: List[Subject] = field(default_factory=list)
+
+    def serves_district(self, district: str) -> bool:
+        return self.tutor.base_district == district or district in self.districts
+
+
+def load_matching_candidates(
+    subject_ids: Iterable, tutor_ids: Optional[Iterable[str]] = None, mode_mask: int = 0
+) -> Dict[str, TutorCandidate]:
+    """Load approved tutors teaching any of ``subject_ids`` with everything matching needs.
+
+    Issues a fixed number of queries (tutors, districts, slots, subjects) no matter
+    how many candidates there are. Pass ``tutor_ids`` to restrict loading to tutors
+    already selected elsewhere, and ``mode_mask`` to keep only tutors offering one of
+    those lesson modes (filtered in SQL). Results are keyed by tutor id.
+    """
+    subject_ids = list(subject_ids)
+    if not subject_ids:
+        return {}
+
+    tutor_query = (
+        TutorProfile.query.join(TutorSubject, TutorProfile.id == TutorSubject.tutor_id)
+        .filter(TutorProfile.status == "approved")
+        .filter(TutorSubject.subject_id.in_(subject_ids))
+    )
+    if mode_mask:
+        tutor_query = tutor_query.filter(TutorProfile.offers_any_mode(mode_mask))
+    if tutor_ids is not None:
+        tutor_query = tutor_query.filter(TutorProfile.id.in_(list(tutor_ids)))
+    tutors: List[TutorProfile] = tutor_query.distinct().all()
+    candidates = {tutor.id: TutorCandidate(tutor=tutor) for tutor in tutors}
+    if not candidates:
+        return candidates
+
+    tutor_ids = list(candidates)
+    district_rows = (
+        db.session.query(TutorDistrict.tutor_id, TutorDistrict.district)
+        .filter(TutorDistrict.tutor_id.in_(tutor_ids))
+        .all()
+    )
+    for tutor_id, district in district_rows:
+        candidates[tutor_id].districts.add(district)
+
+    by_user_id = {candidate.tutor.user_id: candidate for candidate in candidates.values()}
+    slots = AvailabilitySlot.query.filter(AvailabilitySlot.user_id.in_(list(by_user_id))).all()
+    for slot in slots:
+        by_user_id[slot.user_id].slots.append(slot)
+
+    subject_rows = (
+        db.session.query(TutorSubject.tutor_id, Subject)
+        .join(Subject, Subject.id == TutorSubject.subject_id)
+        .filter(TutorSubject.tutor_id.in_(tutor_ids), TutorSubject.subject_id.in_(subject_ids))
+        .all()
+    )
+    for tutor_id, subject in subject_rows:
+        candidates[tutor_id].subjects.append(subject)
+
+    return candidates
@@ -0,0 +1,201 @@
+import re
+import threading
+import time
+from bisect import bisect_left
+from collections import Counter, defaultdict
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from flask import Flask, Response, current_app, g, has_request_context, request
+from flask.json.provider import DefaultJSONProvider
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+STATEMENT_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200)
+MAX_RECORDED_STATEMENTS = 500
+
+_PLACEHOLDER_LIST = re.compile(r"\(\s*(?:\?|%s|%\(\w+\)s|:\w+)(?:\s*,\s*(?:\?|%s|%\(\w+\)s|:\w+))*\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def statement_shape(statement: str) -> str:
+    """Normalise ``statement`` so executions differing only in IN-list length compare equal."""
+    return _PLACEHOLDER_LIST.sub("(?)", _WHITESPACE.sub(" ", statement).strip())
+
+
+class RequestStats:
+    """What one request did, kept on ``flask.g`` while it runs."""
+
+    def __init__(self) -> None:
+        self.started = time.perf_counter()
+        self.sql_count = 0
+        self.sql_seconds = 0.0
+        self.serialization_seconds = 0.0
+        self.shapes: Counter = Counter()
+        self.statements: List[Tuple[str, float]] = []
+
+
+class Histogram:
+    def __init__(self, buckets: Sequence[float]) -> None:
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class RequestMetrics:
+    """Per-endpoint SQL, serialization and wall-time histograms in Prometheus text format.
+
+    SQL statements are counted through engine cursor events and attributed to the
+    request running on the current thread. A request that runs the same statement
+    shape more than ``N_PLUS_ONE_THRESHOLD`` times is logged and counted as a likely
+    N+1 pattern.
+    """
+
+    HISTOGRAMS = {
+        "http_request_duration_seconds": ("Wall time per request.", DURATION_BUCKETS),
+        "http_request_sql_statements": ("SQL statements executed per request.", STATEMENT_BUCKETS),
+        "http_request_sql_duration_seconds": ("Time spent in SQL per request.", DURATION_BUCKETS),
+        "http_request_serialization_seconds": ("Time spent encoding JSON responses.", DURATION_BUCKETS),
+    }
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._histograms: Dict[Tuple[str, str], Histogram] = {}
+        self._n_plus_one: Dict[str, int] = defaultdict(int)
+        self.n_plus_one_threshold = 5
+
+    def init_app(self, app: Flask) -> None:
+        app.extensions["request_metrics"] = self
+        self.n_plus_one_threshold = app.config.get("N_PLUS_ONE_THRESHOLD", self.n_plus_one_threshold)
+        self.reset()
+        if not app.config.get("METRICS_ENABLED", True):
+            return
+        _listen_for_statements()
+        app.json = TimedJSONProvider(app)
+        app.before_request(_start_request)
+        app.after_request(self._finish_request)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._histograms.clear()
+            self._n_plus_one.clear()
+
+    def _finish_request(self, response: Response) -> Response:
+        stats: Optional[RequestStats] = g.pop("request_stats", None)
+        if stats is None:
+            return response
+        endpoint = request.endpoint or "unmatched"
+        wall_seconds = time.perf_counter() - stats.started
+        repeated = {
+            shape: count for shape, count in stats.shapes.items() if count > self.n_plus_one_threshold
+        }
+        with self._lock:
+            for name, value in (
+                ("http_request_duration_seconds", wall_seconds),
+                ("http_request_sql_statements", stats.sql_count),
+                ("http_request_sql_duration_seconds", stats.sql_seconds),
+                ("http_request_serialization_seconds", stats.serialization_seconds),
+            ):
+                key = (name, endpoint)
+                if key not in self._histograms:
+                    self._histograms[key] = Histogram(self.HISTOGRAMS[name][1])
+                self._histograms[key].observe(value)
+            if repeated:
+                self._n_plus_one[endpoint] += 1
+        for shape, count in repeated.items():
+            current_app.logger.warning(
+                "Possible N+1 in %s: statement ran %d times: %s", endpoint, count, shape[:200]
+            )
+        return response
+
+    def render(self) -> str:
+        """Return every metric in the Prometheus text exposition format."""
+        with self._lock:
+            lines = []
+            for name, (help_text, _) in self.HISTOGRAMS.items():
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} histogram")
+                for (metric, endpoint), histogram in sorted(self._histograms.items()):
+                    if metric != name:
+                        continue
+                    label = f'endpoint="{endpoint}"'
+                    cumulative = 0
+                    for bound, count in zip(histogram.buckets, histogram.counts):
+                        cumulative += count
+                        lines.append(f'{name}_bucket{{{label},le="{bound:g}"}} {cumulative}')
+                    lines.append(f'{name}_bucket{{{label},le="+Inf"}} {histogram.count}')
+                    lines.append(f"{name}_sum{{{label}}} {histogram.sum:.6f}")
+                    lines.append(f"{name}_count{{{label}}} {histogram.count}")
+            lines.append("# HELP http_request_n_plus_one_total Requests that repeated one statement shape past the threshold.")
+            lines.append("# TYPE http_request_n_plus_one_total counter")
+            for endpoint, count in sorted(self._n_plus_one.items()):
+                lines.append(f'http_request_n_plus_one_total{{endpoint="{endpoint}"}} {count}')
+        return "\n".join(lines) + "\n"
+
+
+request_metrics = RequestMetrics()
+
+
+def current_request_stats() -> Optional[RequestStats]:
+    if not has_request_context():
+        return None
+    return g.get("request_stats")
+
+
+def _start_request() -> None:
+    g.request_stats = RequestStats()
+
+
+class TimedJSONProvider(DefaultJSONProvider):
+    def response(self, *args, **kwargs) -> Response:
+        started = time.perf_counter()
+        try:
+            return super().response(*args, **kwargs)
+        finally:
+            stats = current_request_stats()
+            if stats is not None:
+                stats.serialization_seconds += time.perf_counter() - started
+
+
+_listening = False
+
+
+def _listen_for_statements() -> None:
+    # Listeners are attached to the Engine class once per process and are no-ops
+    # outside a request, so several apps in one process share them safely.
+    global _listening
+    if _listening:
+        return
+    event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(Engine, "handle_error", _discard_timer)
+    _listening = True
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+def _discard_timer(context) -> None:
+    started = context.connection.info.get("query_started") if context.connection else None
+    if started:
+        started.pop()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    started = conn.info["query_started"].pop()
+    stats = current_request_stats()
+    if stats is None:
+        return
+    elapsed = time.perf_counter() - started
+    stats.sql_count += 1
+    stats.sql_seconds += elapsed
+    stats.shapes[statement_shape(statement)] += 1
+    if len(stats.statements) < MAX_RECORDED_STATEMENTS:
+        stats.statements.append((statement, elapsed))
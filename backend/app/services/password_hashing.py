@@ -0,0 +1,94 @@
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache
+from typing import Optional
+
+from flask import Flask
+from werkzeug.security import check_password_hash, generate_password_hash
+
+# Logins allowed to wait for a pool worker, per worker, before new ones are turned away.
+PENDING_PER_WORKER = 4
+
+
+class PasswordHasherBusy(Exception):
+    """Raised when every pool worker is busy and the wait exceeded the queue timeout."""
+
+
+@lru_cache(maxsize=8)
+def canonical_method(method: str) -> str:
+    """The method string Werkzeug stores for ``method``, e.g. ``pbkdf2`` -> ``pbkdf2:sha256:1000000``."""
+    return generate_password_hash("", method, salt_length=1).partition("$")[0]
+
+
+class PasswordHasher:
+    """Hash and verify passwords with the configured policy.
+
+    ``PASSWORD_HASH_METHOD`` and ``PASSWORD_SALT_LENGTH`` take any Werkzeug method
+    string, such as ``scrypt:32768:8:1`` or ``pbkdf2:sha256:600000``. Stored hashes
+    keep their own parameters, so older ones still verify, and ``needs_rehash``
+    reports them for upgrade on the next login.
+
+    With ``PASSWORD_HASH_WORKERS`` above 0 the KDF runs in a process pool of that
+    size instead of the request thread. At most ``PENDING_PER_WORKER`` calls per
+    worker are admitted at once. A caller that cannot get in within
+    ``PASSWORD_HASH_QUEUE_TIMEOUT`` seconds gets ``PasswordHasherBusy``.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._slots: Optional[threading.BoundedSemaphore] = None
+        self.method = "scrypt:32768:8:1"
+        self.salt_length = 16
+        self.workers = 0
+        self.queue_timeout = 5.0
+
+    def init_app(self, app: Flask) -> None:
+        app.extensions["password_hasher"] = self
+        self.method = app.config.get("PASSWORD_HASH_METHOD", self.method)
+        self.salt_length = app.config.get("PASSWORD_SALT_LENGTH", self.salt_length)
+        self.workers = app.config.get("PASSWORD_HASH_WORKERS", self.workers)
+        self.queue_timeout = app.config.get("PASSWORD_HASH_QUEUE_TIMEOUT", self.queue_timeout)
+        self.shutdown()
+        self._slots = threading.BoundedSemaphore(max(self.workers, 1) * PENDING_PER_WORKER)
+
+    def hash(self, password: str) -> str:
+        return self._run(generate_password_hash, password, self.method, self.salt_length)
+
+    def verify(self, password_hash: str, password: str) -> bool:
+        return self._run(check_password_hash, password_hash, password)
+
+    def needs_rehash(self, password_hash: str) -> bool:
+        method, _, rest = password_hash.partition("$")
+        salt = rest.partition("$")[0]
+        return method != canonical_method(self.method) or len(salt) != self.salt_length
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _run(self, fn, *args):
+        if self.workers <= 0:
+            return fn(*args)
+        if not self._slots.acquire(timeout=self.queue_timeout):
+            raise PasswordHasherBusy()
+        try:
+            return self._pool().submit(fn, *args).result()
+        except BrokenProcessPool:
+            # A worker died; start a fresh pool next time and answer this call inline.
+            self.shutdown()
+            return fn(*args)
+        finally:
+            self._slots.release()
+
+    def _pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            return self._executor
+
+
+password_hasher = PasswordHasher()
@@ -0,0 +1,129 @@
+import cProfile
+import pstats
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+from typing import List, Optional
+
+from flask import Flask, Response, g, request
+from flask_jwt_extended import get_jwt, verify_jwt_in_request
+
+from app.services.metrics import current_request_stats
+
+
+class RequestProfiler:
+    """Profile single requests on demand and keep the latest reports in memory.
+
+    Only active when ``PROFILING_ENABLED`` is set. An admin opts a request in by
+    sending the ``PROFILE_HEADER`` header; the response then carries
+    ``X-Profile-Id`` naming the stored report. SQL statements come from the request
+    metrics, so they are only listed while ``METRICS_ENABLED`` is on.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        # cProfile cannot run in two threads of one process at once.
+        self._busy = threading.Lock()
+        self._reports: "OrderedDict[str, dict]" = OrderedDict()
+        self.header = "X-Profile"
+        self.top_functions = 25
+        self.history = 50
+
+    def init_app(self, app: Flask) -> None:
+        app.extensions["request_profiler"] = self
+        self.header = app.config.get("PROFILE_HEADER", self.header)
+        self.top_functions = app.config.get("PROFILE_TOP_FUNCTIONS", self.top_functions)
+        self.history = app.config.get("PROFILE_HISTORY", self.history)
+        with self._lock:
+            self._reports.clear()
+        if not app.config.get("PROFILING_ENABLED"):
+            return
+        app.before_request(self._start)
+        app.after_request(self._finish)
+        app.teardown_request(self._abandon)
+
+    def reports(self) -> List[dict]:
+        with self._lock:
+            return [
+                {key: report[key] for key in ("id", "method", "path", "endpoint", "status", "created_at", "wall_ms")}
+                for report in reversed(self._reports.values())
+            ]
+
+    def get(self, report_id: str) -> Optional[dict]:
+        with self._lock:
+            return self._reports.get(report_id)
+
+    def _requested_by_admin(self) -> bool:
+        if not request.headers.get(self.header):
+            return False
+        try:
+            verify_jwt_in_request(optional=True)
+        except Exception:
+            return False
+        return get_jwt().get("role") == "admin"
+
+    def _start(self) -> None:
+        if not self._requested_by_admin() or not self._busy.acquire(blocking=False):
+            return
+        profile = cProfile.Profile()
+        g.request_profile = (profile, time.perf_counter())
+        profile.enable()
+
+    def _finish(self, response: Response) -> Response:
+        state = g.pop("request_profile", None)
+        if state is None:
+            return response
+        profile, started = state
+        try:
+            profile.disable()
+        finally:
+            self._busy.release()
+
+        report = self._build_report(profile, response, time.perf_counter() - started)
+        with self._lock:
+            self._reports[report["id"]] = report
+            while len(self._reports) > self.history:
+                self._reports.popitem(last=False)
+        response.headers["X-Profile-Id"] = report["id"]
+        return response
+
+    def _abandon(self, exc: Optional[BaseException]) -> None:
+        # after_request is skipped when the view raises; make sure the profiler stops.
+        state = g.pop("request_profile", None)
+        if state is not None:
+            state[0].disable()
+            self._busy.release()
+
+    def _build_report(self, profile: cProfile.Profile, response: Response, wall_seconds: float) -> dict:
+        stats = pstats.Stats(profile)
+        rows = sorted(stats.stats.items(), key=lambda item: item[1][3], reverse=True)
+        functions = [
+            {
+                "function": f"{filename}:{line}({name})",
+                "calls": calls,
+                "total_seconds": round(total, 6),
+                "cumulative_seconds": round(cumulative, 6),
+            }
+            for (filename, line, name), (_, calls, total, cumulative, _) in rows[: self.top_functions]
+        ]
+        request_stats = current_request_stats()
+        statements = [
+            {"statement": statement, "ms": round(seconds * 1000, 3)}
+            for statement, seconds in (request_stats.statements if request_stats else [])
+        ]
+        return {
+            "id": uuid.uuid4().hex,
+            "method": request.method,
+            "path": request.full_path.rstrip("?"),
+            "endpoint": request.endpoint,
+            "status": response.status_code,
+            "created_at": datetime.utcnow().isoformat(),
+            "wall_ms": round(wall_seconds * 1000, 3),
+            "top_functions": functions,
+            "sql": statements,
+        }
+
+
+request_profiler = RequestProfiler()
@@ -0,0 +1,123 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from functools import wraps
+from typing import Callable, Dict, Hashable, List, Optional, Tuple
+
+from flask import Flask, Response, make_response, request
+from flask_jwt_extended import get_jwt
+
+# Headers that describe one particular response and must not be replayed from the cache.
+_UNCACHED_HEADERS = {"content-length", "set-cookie", "x-profile-id"}
+
+
+class ResponseCache:
+    """Per-user LRU of serialized GET bodies, bounded by ``RESPONSE_CACHE_MAX_BYTES``.
+
+    Entries are keyed by endpoint, user and full path, and store the ETag they were
+    rendered for. A lookup with a different ETag counts as a miss, so a version
+    change never serves a stale body. A size of 0 disables body caching; the
+    conditional 304 answers keep working.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Hashable, Tuple[str, bytes, List[Tuple[str, str]]]]" = OrderedDict()
+        self._bytes = 0
+        self.max_bytes = 8 * 1024 * 1024
+        self.hits = 0
+        self.misses = 0
+
+    def init_app(self, app: Flask) -> None:
+        app.extensions["response_cache"] = self
+        self.max_bytes = app.config.get("RESPONSE_CACHE_MAX_BYTES", self.max_bytes)
+        self.clear()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self.hits = 0
+            self.misses = 0
+
+    def get(self, key: Hashable, etag: str) -> Optional[Response]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != etag:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        _, body, headers = entry
+        return Response(body, headers=headers)
+
+    def put(self, key: Hashable, etag: str, response: Response) -> None:
+        body = response.get_data()
+        if len(body) > self.max_bytes:
+            return
+        headers = [
+            (name, value) for name, value in response.headers if name.lower() not in _UNCACHED_HEADERS
+        ]
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= len(previous[1])
+            self._entries[key] = (etag, body, headers)
+            self._bytes += len(body)
+            while self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= len(evicted[1])
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+            }
+
+
+response_cache = ResponseCache()
+
+
+def conditional_get(version_key: Callable[..., Optional[Hashable]]):
+    """Answer ``If-None-Match`` with 304 and reuse cached bodies for a ``/me`` style GET.
+
+    ``version_key`` is called with the view arguments after authentication and
+    returns a cheap value that changes whenever the response would, typically one
+    aggregate query over the caller's rows. Returning ``None`` skips caching, e.g.
+    for a role the view rejects. The ETag covers the user, the full path and that
+    value, so it is the same in every worker process. Apply it below ``jwt_required``.
+    """
+
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            version = version_key(*args, **kwargs)
+            if version is None:
+                return view(*args, **kwargs)
+
+            claims = get_jwt()
+            user_id = claims.get("sub") or claims.get("user_id")
+            key = (request.endpoint, user_id, request.full_path)
+            etag = hashlib.sha256(repr((key, claims.get("role"), version)).encode()).hexdigest()[:32]
+
+            if request.if_none_match.contains(etag):
+                response = Response(status=304)
+            else:
+                response = response_cache.get(key, etag)
+                if response is None:
+                    response = make_response(view(*args, **kwargs))
+                    if response.status_code != 200 or response.is_streamed:
+                        return response
+                    response_cache.put(key, etag, response)
+            response.set_etag(etag)
+            response.cache_control.private = True
+            response.cache_control.no_cache = True
+            return response
+
+        return wrapper
+
+    return decorator
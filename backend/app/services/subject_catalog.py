@@ -0,0 +1,142 @@
+import hashlib
+import threading
+import time
+from typing import Dict, NamedTuple, Optional, Tuple
+
+from flask import Flask, current_app
+from sqlalchemy import event
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app.models import Subject
+
+
+class CatalogSnapshot(NamedTuple):
+    version: int
+    body: bytes
+    etag: str
+    subjects: Dict[str, Tuple[bytes, str]]
+
+
+def serialize_subject(subject: Subject) -> dict:
+    return {
+        "id": subject.id,
+        "name": subject.name,
+        "category": subject.category,
+        "order_index": subject.order_index,
+    }
+
+
+def _etag(body: bytes) -> str:
+    return hashlib.sha256(body).hexdigest()[:32]
+
+
+class SubjectCatalog:
+    """Process-local, pre-serialized copy of the subject catalog.
+
+    The JSON bodies and their ETags are built once and reused until the catalog
+    version is bumped. That happens whenever a session commits a change to a
+    ``Subject`` row. Writes made by other processes are picked up by a reload once the
+    snapshot is older than ``SUBJECT_CATALOG_MAX_AGE`` seconds. The ETags hash the
+    body, so every process hands out the same tag for the same catalog.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._snapshot: Optional[CatalogSnapshot] = None
+        self._loaded_at = 0.0
+        self.version = 0
+        self.max_age = 300
+
+    def init_app(self, app: Flask) -> None:
+        app.extensions["subject_catalog"] = self
+        self.max_age = app.config.get("SUBJECT_CATALOG_MAX_AGE", self.max_age)
+        self.invalidate()
+        _listen_for_subject_writes()
+        if app.config.get("SUBJECT_CATALOG_PRELOAD", True):
+            with app.app_context():
+                try:
+                    self.snapshot()
+                except SQLAlchemyError as exc:
+                    # The schema may not exist yet, e.g. before ``flask db upgrade``.
+                    app.logger.info("Subject catalog not preloaded: %s", exc)
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self.version += 1
+            self._snapshot = None
+
+    def snapshot(self) -> CatalogSnapshot:
+        with self._lock:
+            snapshot = self._snapshot
+            if snapshot is not None and (
+                not self.max_age or time.monotonic() - self._loaded_at < self.max_age
+            ):
+                return snapshot
+            version = self.version
+
+        snapshot = self._load(version)
+        with self._lock:
+            # Keep it only if no write bumped the version while it was loading.
+            if self.version == version:
+                self._snapshot = snapshot
+                self._loaded_at = time.monotonic()
+        return snapshot
+
+    def get(self, subject_id: str) -> Optional[Tuple[bytes, str]]:
+        """Return ``(body, etag)`` for one subject, or ``None`` if it does not exist."""
+        return self.snapshot().subjects.get(subject_id)
+
+    def _load(self, version: int) -> CatalogSnapshot:
+        provider = current_app.json
+        subjects = Subject.query.order_by(
+            Subject.order_index.asc().nulls_last(), Subject.id.asc()
+        ).all()
+        serialized = [serialize_subject(subject) for subject in subjects]
+        body = provider.dumps(serialized).encode()
+        by_id = {}
+        for item in serialized:
+            item_body = provider.dumps(item).encode()
+            by_id[item["id"]] = (item_body, _etag(item_body))
+        return CatalogSnapshot(version, body, _etag(body), by_id)
+
+
+subject_catalog = SubjectCatalog()
+
+
+_listening = False
+
+
+def _listen_for_subject_writes() -> None:
+    global _listening
+    if _listening:
+        return
+    event.listen(Session, "after_flush", _note_subject_writes)
+    event.listen(Session, "do_orm_execute", _note_subject_statements)
+    event.listen(Session, "after_commit", _bump_on_commit)
+    event.listen(Session, "after_rollback", _forget_subject_writes)
+    _listening = True
+
+
+def _note_subject_writes(session, flush_context) -> None:
+    if any(
+        isinstance(instance, Subject)
+        for instance in (*session.new, *session.dirty, *session.deleted)
+    ):
+        session.info["subject_catalog_dirty"] = True
+
+
+def _note_subject_statements(orm_execute_state) -> None:
+    if (
+        orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete
+    ) and any(mapper.class_ is Subject for mapper in orm_execute_state.all_mappers):
+        orm_execute_state.session.info["subject_catalog_dirty"] = True
+
+
+def _bump_on_commit(session) -> None:
+    if session.info.pop("subject_catalog_dirty", False):
+        subject_catalog.invalidate()
+
+
+def _forget_subject_writes(session) -> None:
+    session.info.pop("subject_catalog_dirty", None)
@@ -0,0 +1,122 @@
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+
+from flask import Flask, current_app
+from sqlalchemy import delete, insert
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+
+from app.extensions import db, jwt
+from app.models import RevokedToken
+
+
+class TokenRevocationStore:
+    """Revoked JWT ids held in memory until the tokens would have expired.
+
+    ``is_revoked`` is a dict lookup, so the blocklist check adds no query to a
+    request. With ``TOKEN_REVOCATION_PERSIST`` each revocation is also written to
+    ``revoked_tokens``. Every process then pulls recent rows at most once per
+    ``TOKEN_REVOCATION_SYNC_SECONDS``, so a revocation reaches the other workers
+    within that interval and survives restarts.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._expires: Dict[str, float] = {}
+        self._next_purge = 0.0
+        self._synced_at: Optional[datetime] = None
+        self._next_sync = 0.0
+        self.persist = True
+        self.sync_seconds = 30
+
+    def init_app(self, app: Flask) -> None:
+        app.extensions["token_revocation"] = self
+        self.persist = app.config.get("TOKEN_REVOCATION_PERSIST", self.persist)
+        self.sync_seconds = app.config.get("TOKEN_REVOCATION_SYNC_SECONDS", self.sync_seconds)
+        self.clear()
+        jwt.token_in_blocklist_loader(self._check_token)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._expires.clear()
+            self._next_purge = 0.0
+            self._synced_at = None
+            self._next_sync = 0.0
+
+    def revoke(self, jwt_payload: dict) -> None:
+        """Revoke the token described by ``jwt_payload`` until its ``exp``."""
+        jti = jwt_payload["jti"]
+        expires = jwt_payload.get("exp") or time.time() + 86400
+        with self._lock:
+            self._expires[jti] = expires
+        if not self.persist:
+            return
+        now = datetime.utcnow()
+        db.session.execute(delete(RevokedToken).where(RevokedToken.expires_at < now))
+        try:
+            db.session.execute(
+                insert(RevokedToken),
+                [
+                    {
+                        "jti": jti,
+                        "token_type": jwt_payload.get("type", "access"),
+                        "user_id": jwt_payload.get("sub"),
+                        "expires_at": datetime.utcfromtimestamp(expires),
+                        "created_at": now,
+                    }
+                ],
+            )
+            db.session.commit()
+        except IntegrityError:
+            # Already stored, e.g. by a concurrent logout with the same token.
+            # The expired-row purge is retried on the next revocation.
+            db.session.rollback()
+
+    def is_revoked(self, jti: str) -> bool:
+        if self.persist:
+            self._sync()
+        now = time.time()
+        with self._lock:
+            if now >= self._next_purge:
+                self._purge(now)
+            expires = self._expires.get(jti)
+        return expires is not None and expires > now
+
+    def _check_token(self, jwt_header: dict, jwt_payload: dict) -> bool:
+        return self.is_revoked(jwt_payload["jti"])
+
+    def _purge(self, now: float) -> None:
+        # Called with the lock held; expired tokens fail verification on their own.
+        for jti in [jti for jti, expires in self._expires.items() if expires <= now]:
+            del self._expires[jti]
+        self._next_purge = now + 60
+
+    def _sync(self) -> None:
+        with self._lock:
+            if time.monotonic() < self._next_sync:
+                return
+            self._next_sync = time.monotonic() + self.sync_seconds
+            since = self._synced_at
+
+        started = datetime.utcnow()
+        query = db.session.query(RevokedToken.jti, RevokedToken.expires_at).filter(
+            RevokedToken.expires_at > started
+        )
+        if since is not None:
+            # Overlap one interval so rows committed late by other workers are not missed.
+            query = query.filter(RevokedToken.created_at >= since - timedelta(seconds=self.sync_seconds))
+        try:
+            rows = query.all()
+        except SQLAlchemyError as exc:
+            db.session.rollback()
+            current_app.logger.warning("Could not load revoked tokens: %s", exc)
+            return
+
+        with self._lock:
+            for jti, expires_at in rows:
+                self._expires[jti] = (expires_at - datetime(1970, 1, 1)).total_seconds()
+            self._synced_at = started
+
+
+token_revocation = TokenRevocationStore()
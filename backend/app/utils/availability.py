@@ -0,0 +1,110 @@
+from datetime import time as time_type
+from typing import Iterable, List, NamedTuple
+
+MINUTES_PER_DAY = 24 * 60
+
+
+class TimeWindow(NamedTuple):
+    day_of_week: int
+    start_time: time_type
+    end_time: time_type
+
+    @property
+    def minutes(self) -> int:
+        return time_to_minutes(self.end_time) - time_to_minutes(self.start_time)
+
+    def to_dict(self) -> dict:
+        return {
+            "day_of_week": self.day_of_week,
+            "start_time": self.start_time.isoformat(),
+            "end_time": self.end_time.isoformat(),
+        }
+
+
+def time_to_minutes(value: time_type) -> int:
+    return value.hour * 60 + value.minute
+
+
+def merge_windows(slots: Iterable) -> List[TimeWindow]:
+    """Sort slots by (day_of_week, start_time) and coalesce overlapping or touching ones.
+
+    Accepts anything with ``day_of_week``/``start_time``/``end_time`` attributes, such
+    as ``AvailabilitySlot`` rows.
+    """
+    ordered = sorted(
+        (TimeWindow(slot.day_of_week, slot.start_time, slot.end_time) for slot in slots),
+        key=lambda window: (window.day_of_week, window.start_time),
+    )
+    merged: List[TimeWindow] = []
+    for window in ordered:
+        if merged:
+            last = merged[-1]
+            if last.day_of_week == window.day_of_week and window.start_time <= last.end_time:
+                if window.end_time > last.end_time:
+                    merged[-1] = last._replace(end_time=window.end_time)
+                continue
+        merged.append(window)
+    return merged
+
+
+def intersect_windows(
+    first: List[TimeWindow],
+    second: List[TimeWindow],
+    min_minutes: int = 0,
+) -> List[TimeWindow]:
+    """Return the common windows of two merged schedules in chronological order.
+
+    Both inputs must come from ``merge_windows``; the sweep is linear in their total
+    length. Intersections shorter than ``min_minutes`` are dropped.
+    """
+    overlaps: List[TimeWindow] = []
+    i = j = 0
+    while i < len(first) and j < len(second):
+        a, b = first[i], second[j]
+        if a.day_of_week != b.day_of_week:
+            if a.day_of_week < b.day_of_week:
+                i += 1
+            else:
+                j += 1
+            continue
+
+        start = max(a.start_time, b.start_time)
+        end = min(a.end_time, b.end_time)
+        if start < end:
+            window = TimeWindow(a.day_of_week, start, end)
+            if window.minutes >= min_minutes:
+                overlaps.append(window)
+
+        if a.end_time <= b.end_time:
+            i += 1
+        else:
+            j += 1
+    return overlaps
+
+
+def week_mask(windows: Iterable) -> int:
+    """Pack a weekly schedule into an int with one bit per minute of the week.
+
+    Bit ``day_of_week * MINUTES_PER_DAY + minute`` is set when that minute is covered.
+    ``AND``-ing two masks gives the shared minutes and ``int.bit_count`` their total.
+    """
+    mask = 0
+    for window in windows:
+        start = window.day_of_week * MINUTES_PER_DAY + time_to_minutes(window.start_time)
+        length = time_to_minutes(window.end_time) - time_to_minutes(window.start_time)
+        if length > 0:
+            mask |= ((1 << length) - 1) << start
+    return mask
+
+
+def has_run(mask: int, length: int) -> bool:
+    """Return True if ``mask`` contains at least ``length`` consecutive set bits."""
+    if length <= 1:
+        return mask != 0
+    run = 1
+    while run * 2 <= length and mask:
+        mask &= mask >> run
+        run *= 2
+    if run < length:
+        mask &= mask >> (length - run)
+    return mask != 0
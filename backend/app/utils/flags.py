@@ -0,0 +1,49 @@
+from typing import Dict, Iterable, List, Optional, Union
+
+# Bit values are persisted in the database; append new entries, never reorder.
+LESSON_MODE_BITS: Dict[str, int] = {
+    "online": 1 << 0,
+    "student_home": 1 << 1,
+    "tutor_home": 1 << 2,
+    "common_place": 1 << 3,
+}
+# Students may also state the coarse preferences from the spec (in_person, hybrid).
+STUDENT_MODE_BITS: Dict[str, int] = {
+    **LESSON_MODE_BITS,
+    "in_person": 1 << 4,
+    "hybrid": 1 << 5,
+}
+TEACHING_LEVEL_BITS: Dict[str, int] = {
+    "11": 1 << 0,
+    "12": 1 << 1,
+    "graduate": 1 << 2,
+}
+IN_PERSON_MODE_MASK = (
+    LESSON_MODE_BITS["student_home"]
+    | LESSON_MODE_BITS["tutor_home"]
+    | LESSON_MODE_BITS["common_place"]
+)
+
+
+def encode_flags(values: Optional[Iterable[str]], bits: Dict[str, int]) -> int:
+    """Pack ``values`` into a bitmask. Values missing from ``bits`` are ignored."""
+    mask = 0
+    for value in values or ():
+        mask |= bits.get(value, 0)
+    return mask
+
+
+def decode_flags(mask: Optional[int], bits: Dict[str, int]) -> List[str]:
+    """Unpack ``mask`` into the names of its set bits, in ``bits`` order."""
+    if not mask:
+        return []
+    return [value for value, bit in bits.items() if mask & bit]
+
+
+def split_flag_values(value: Union[None, str, List[str]]) -> Optional[List[str]]:
+    """Accept either a list or a comma separated string, as the profile endpoints always have."""
+    if value is None:
+        return None
+    if isinstance(value, str):
+        return [item.strip() for item in value.split(",") if item.strip()]
+    return list(value)
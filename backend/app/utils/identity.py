@@ -0,0 +1,74 @@
+from typing import Optional, Union
+
+from flask import g
+from flask_jwt_extended import create_access_token, get_jwt
+
+from app.extensions import db
+from app.models import StudentProfile, TutorProfile, User
+
+PROFILE_MODELS = {"student": StudentProfile, "tutor": TutorProfile}
+
+Profile = Union[StudentProfile, TutorProfile]
+
+
+def token_claims(role: str, profile_id: Optional[str] = None) -> dict:
+    """Additional access-token claims for a user with ``role`` and optional profile."""
+    claims = {"role": role}
+    if profile_id:
+        claims["profile_id"] = profile_id
+    return claims
+
+
+def claims_for_user(user: User) -> dict:
+    model = PROFILE_MODELS.get(user.role)
+    profile_id = None
+    if model is not None:
+        profile_id = db.session.query(model.id).filter(model.user_id == user.id).scalar()
+    return token_claims(user.role, profile_id)
+
+
+def current_user_id() -> Optional[str]:
+    claims = get_jwt()
+    return claims.get("sub") or claims.get("user_id")
+
+
+def current_profile_id() -> Optional[str]:
+    """The caller's student or tutor profile id, read from the token when it carries one."""
+    profile_id = get_jwt().get("profile_id")
+    if profile_id:
+        return profile_id
+    profile = current_profile()
+    return profile.id if profile else None
+
+
+def refreshed_access_token(profile: Profile) -> Optional[str]:
+    """A new access token carrying ``profile``'s id, or ``None`` if the current one has it."""
+    claims = get_jwt()
+    if claims.get("profile_id") == profile.id:
+        return None
+    return create_access_token(
+        identity=current_user_id(), additional_claims=token_claims(claims.get("role"), profile.id)
+    )
+
+
+def current_profile() -> Optional[Profile]:
+    """The caller's student or tutor profile, or ``None`` for other roles or no profile.
+
+    Loaded by primary key from the ``profile_id`` claim, or by ``user_id`` for tokens
+    issued before the profile existed, and memoized for the rest of the request.
+    """
+    claims = get_jwt()
+    memo = g.get("current_profile")
+    # get_jwt() returns a fresh dict for every request, so it scopes the memo.
+    if memo is not None and memo[0] is claims:
+        return memo[1]
+
+    model = PROFILE_MODELS.get(claims.get("role"))
+    profile = None
+    if model is not None:
+        if claims.get("profile_id"):
+            profile = db.session.get(model, claims["profile_id"])
+        else:
+            profile = model.query.filter_by(user_id=current_user_id()).first()
+    g.current_profile = (claims, profile)
+    return profile
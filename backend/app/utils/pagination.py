@@ -0,0 +1,18 @@
+import base64
+import binascii
+import json
+from typing import Optional, Sequence
+
+
+def encode_cursor(values: Sequence) -> str:
+    """Opaque, URL-safe cursor for a keyset position."""
+    return base64.urlsafe_b64encode(json.dumps(list(values)).encode()).decode()
+
+
+def decode_cursor(value: str) -> Optional[list]:
+    """Inverse of ``encode_cursor``; None for anything that is not a valid cursor."""
+    try:
+        values = json.loads(base64.urlsafe_b64decode(value.encode()))
+    except (binascii.Error, UnicodeError, ValueError):
+        return None
+    return values if isinstance(values, list) else None
@@ -3,15 +3,20 @@ from typing import Callable
 
 from flask import jsonify
 from flask_jwt_extended import get_jwt, jwt_required
-from werkzeug.security import check_password_hash, generate_password_hash
+
+from app.services.password_hashing import password_hasher
 
 
 def hash_password(password: str) -> str:
-    return generate_password_hash(password)
+    return password_hasher.hash(password)
 
 
 def verify_password(password: str, password_hash: str) -> bool:
-    return check_password_hash(password_hash, password)
+    return password_hasher.verify(password_hash, password)
+
+
+def password_needs_rehash(password_hash: str) -> bool:
+    return password_hasher.needs_rehash(password_hash)
 
 
 def role_required(*roles: str) -> Callable:
@@ -0,0 +1,341 @@
+"""Benchmark the tutor matching hot path against a synthetic Istanbul dataset.
+
+Run from the backend directory::
+
+    python -m benchmarks.matching_benchmark --tutors 5000 --requests 200
+    python -m benchmarks.matching_benchmark --database-url postgresql://... --tutors 20000
+
+By default the data goes into a throwaway SQLite file. Pass ``--database-url`` to use
+another database; its tables are dropped and recreated.
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+import tracemalloc
+import uuid
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import datetime, time as time_type
+from typing import Dict, List
+
+from flask_jwt_extended import create_access_token
+from sqlalchemy import event, insert
+from werkzeug.security import generate_password_hash
+
+from app import create_app
+from app.config import Config
+from app.extensions import db
+from app.models import (
+    AvailabilitySlot,
+    LessonRequest,
+    LessonRequestMode,
+    LessonRequestSubject,
+    StudentProfile,
+    Subject,
+    TutorDistrict,
+    TutorProfile,
+    TutorSubject,
+    User,
+)
+from app.models.lesson import ALLOWED_LESSON_MODES
+from app.services.match_cache import match_cache
+from app.services.match_scoring import score_candidates, select_top_k
+from app.services.matcher import MatchSnapshot, RankedTutor, build_match_job, serialize_matches
+from app.services.matching_index import matching_index
+from app.utils.availability import has_run, week_mask
+from app.utils.flags import IN_PERSON_MODE_MASK, LESSON_MODE_BITS, TEACHING_LEVEL_BITS, encode_flags
+
+ISTANBUL_DISTRICTS = [
+    "Adalar", "Arnavutköy", "Ataşehir", "Avcılar", "Bağcılar", "Bahçelievler",
+    "Bakırköy", "Başakşehir", "Bayrampaşa", "Beşiktaş", "Beykoz", "Beylikdüzü",
+    "Beyoğlu", "Büyükçekmece", "Çatalca", "Çekmeköy", "Esenler", "Esenyurt",
+    "Eyüpsultan", "Fatih", "Gaziosmanpaşa", "Güngören", "Kadıköy", "Kağıthane",
+    "Kartal", "Küçükçekmece", "Maltepe", "Pendik", "Sancaktepe", "Sarıyer",
+    "Silivri", "Sultanbeyli", "Sultangazi", "Şile", "Şişli", "Tuzla",
+    "Ümraniye", "Üsküdar", "Zeytinburnu",
+]
+
+SUBJECTS = [
+    ("TYT Türkçe", "TYT"), ("TYT Matematik", "TYT"), ("TYT Geometri", "TYT"),
+    ("TYT Fizik", "TYT"), ("TYT Kimya", "TYT"), ("TYT Biyoloji", "TYT"),
+    ("TYT Tarih", "TYT"), ("TYT Coğrafya", "TYT"), ("AYT Matematik", "AYT"),
+    ("AYT Fizik", "AYT"), ("AYT Kimya", "AYT"), ("AYT Biyoloji", "AYT"),
+    ("AYT Edebiyat", "AYT"), ("AYT Tarih", "AYT"), ("AYT Coğrafya", "AYT"),
+]
+
+STAGES = ["load", "candidates", "scoring", "overlap_topk", "serialization"]
+
+
+class BenchmarkConfig(Config):
+    TESTING = True
+
+
+def _ids(count: int) -> List[str]:
+    return [str(uuid.uuid4()) for _ in range(count)]
+
+
+def _random_slots(rng: random.Random, user_id: str, count: int) -> List[dict]:
+    slots = []
+    for _ in range(count):
+        start_hour = rng.randint(8, 21)
+        length = rng.choice([1, 2, 3])
+        slots.append(
+            {
+                "id": str(uuid.uuid4()),
+                "user_id": user_id,
+                "day_of_week": rng.randint(0, 6),
+                "start_time": time_type(start_hour, rng.choice([0, 30])),
+                "end_time": time_type(min(start_hour + length, 23), 0),
+            }
+        )
+    return slots
+
+
+def generate_dataset(
+    tutors: int, students: int, requests: int, slots_per_user: int, seed: int
+) -> List[str]:
+    """Insert a synthetic dataset and return the generated lesson request ids."""
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+    password_hash = generate_password_hash("benchmark")
+    modes = sorted(ALLOWED_LESSON_MODES)
+
+    subject_ids = [str(index) for index in range(1, len(SUBJECTS) + 1)]
+    db.session.execute(
+        insert(Subject),
+        [
+            {"id": subject_id, "name": name, "category": category, "order_index": index}
+            for index, (subject_id, (name, category)) in enumerate(zip(subject_ids, SUBJECTS))
+        ],
+    )
+
+    tutor_user_ids, student_user_ids = _ids(tutors), _ids(students)
+    users = [
+        {"id": user_id, "email": f"{role}{index}@bench.test", "password_hash": password_hash,
+         "role": role, "is_active": True, "created_at": now, "updated_at": now}
+        for role, ids in (("tutor", tutor_user_ids), ("student", student_user_ids))
+        for index, user_id in enumerate(ids)
+    ]
+    db.session.execute(insert(User), users)
+
+    tutor_ids = _ids(tutors)
+    tutor_rows, tutor_subjects, tutor_districts, slots = [], [], [], []
+    for index, (tutor_id, user_id) in enumerate(zip(tutor_ids, tutor_user_ids)):
+        tutor_rows.append(
+            {
+                "id": tutor_id,
+                "user_id": user_id,
+                "full_name": f"Tutor {index}",
+                "experience_years": rng.randint(0, 20),
+                "hourly_rate": rng.randrange(300, 1500, 50),
+                "base_city": "Istanbul",
+                "base_district": rng.choice(ISTANBUL_DISTRICTS),
+                "lesson_mode_mask": encode_flags(
+                    rng.sample(modes, rng.randint(1, len(modes))), LESSON_MODE_BITS
+                ),
+                "teaching_level_mask": encode_flags(TEACHING_LEVEL_BITS, TEACHING_LEVEL_BITS),
+                "status": "approved" if rng.random() < 0.85 else "pending",
+                "avg_rating": round(rng.uniform(3.0, 5.0), 1),
+                "rating_count": rng.randint(0, 40),
+                "created_at": now,
+                "updated_at": now,
+            }
+        )
+        for subject_id in rng.sample(subject_ids, rng.randint(1, 4)):
+            tutor_subjects.append({"id": str(uuid.uuid4()), "tutor_id": tutor_id, "subject_id": subject_id})
+        for district in rng.sample(ISTANBUL_DISTRICTS, rng.randint(0, 4)):
+            tutor_districts.append({"id": str(uuid.uuid4()), "tutor_id": tutor_id, "district": district})
+        slots.extend(_random_slots(rng, user_id, slots_per_user))
+    db.session.execute(insert(TutorProfile), tutor_rows)
+    db.session.execute(insert(TutorSubject), tutor_subjects)
+    db.session.execute(insert(TutorDistrict), tutor_districts)
+
+    student_ids = _ids(students)
+    db.session.execute(
+        insert(StudentProfile),
+        [
+            {"id": student_id, "user_id": user_id, "full_name": f"Student {index}",
+             "city": "Istanbul", "district": rng.choice(ISTANBUL_DISTRICTS),
+             "created_at": now, "updated_at": now}
+            for index, (student_id, user_id) in enumerate(zip(student_ids, student_user_ids))
+        ],
+    )
+    for user_id in student_user_ids:
+        slots.extend(_random_slots(rng, user_id, slots_per_user))
+    db.session.execute(insert(AvailabilitySlot), [{**slot, "created_at": now, "updated_at": now} for slot in slots])
+
+    request_ids = _ids(requests)
+    db.session.execute(
+        insert(LessonRequest),
+        [
+            {
+                "id": request_id,
+                "student_id": rng.choice(student_ids),
+                "budget_min": rng.randrange(300, 800, 50),
+                "budget_max": rng.randrange(800, 1500, 50),
+                "weekly_hours": rng.choice([1, 2, 3, 4]),
+                "status": "open",
+                "created_at": now,
+                "updated_at": now,
+            }
+            for request_id in request_ids
+        ],
+    )
+    db.session.execute(
+        insert(LessonRequestSubject),
+        [
+            {"id": str(uuid.uuid4()), "lesson_request_id": request_id, "subject_id": subject_id}
+            for request_id in request_ids
+            for subject_id in rng.sample(subject_ids, rng.randint(1, 3))
+        ],
+    )
+    db.session.execute(
+        insert(LessonRequestMode),
+        [
+            {"id": str(uuid.uuid4()), "lesson_request_id": request_id, "mode": mode}
+            for request_id in request_ids
+            for mode in rng.sample(modes, rng.randint(1, 2))
+        ],
+    )
+    db.session.commit()
+    return request_ids
+
+
+class QueryCounter:
+    def __init__(self, engine) -> None:
+        self.count = 0
+        event.listen(engine, "before_cursor_execute", self._on_execute)
+
+    def _on_execute(self, *args, **kwargs) -> None:
+        self.count += 1
+
+
+@contextmanager
+def _timed(samples: Dict[str, List[float]], stage: str):
+    started = time.perf_counter()
+    yield
+    samples[stage].append((time.perf_counter() - started) * 1000)
+
+
+def _percentiles(values: List[float]) -> str:
+    if not values:
+        return "n/a"
+    if len(values) == 1:
+        return f"p50={values[0]:.2f} p95={values[0]:.2f} p99={values[0]:.2f}"
+    cuts = statistics.quantiles(values, n=100, method="inclusive")
+    return f"p50={cuts[49]:.2f} p95={cuts[94]:.2f} p99={cuts[98]:.2f}"
+
+
+def run_stages(request_ids: List[str], samples: Dict[str, List[float]]) -> None:
+    """Time each pipeline stage separately, mirroring ``rank_job``/``serialize_matches``."""
+    for request_id in request_ids:
+        db.session.expunge_all()
+        with _timed(samples, "load"):
+            lesson_request = LessonRequest.query.get(request_id)
+            student_slots = AvailabilitySlot.query.filter_by(
+                user_id=lesson_request.student.user_id
+            ).all()
+            job = build_match_job(lesson_request, student_slots)
+
+        in_person = bool(job.mode_mask & IN_PERSON_MODE_MASK)
+        with _timed(samples, "candidates"):
+            candidates = matching_index.select(
+                job.subject_ids, job.mode_mask, job.district if in_person else None
+            )
+        with _timed(samples, "scoring"):
+            base_scores = score_candidates(candidates, job.district, job.budget_min, job.budget_max)
+        with _timed(samples, "overlap_topk"):
+            student_mask = week_mask(job.student_windows)
+
+            def overlap_of(position):
+                shared = candidates[position].availability_mask & student_mask
+                return has_run(shared, max(job.min_minutes, 1)), shared.bit_count()
+
+            ranked = [
+                RankedTutor(
+                    candidates[entry.position].tutor_id,
+                    entry.score,
+                    entry.has_overlap,
+                    entry.overlap_minutes,
+                    candidates[entry.position].slots,
+                )
+                for entry in select_top_k(base_scores, overlap_of, 10)
+            ]
+        with _timed(samples, "serialization"):
+            serialize_matches(
+                MatchSnapshot(job.subject_ids, job.mode_mask, job.student_windows, job.min_minutes, ranked), ranked
+            )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--database-url", default=None)
+    parser.add_argument("--tutors", type=int, default=2000)
+    parser.add_argument("--students", type=int, default=500)
+    parser.add_argument("--requests", type=int, default=100)
+    parser.add_argument("--slots-per-user", type=int, default=4)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    database_url = args.database_url
+    if database_url is None:
+        handle, path = tempfile.mkstemp(suffix=".sqlite")
+        os.close(handle)
+        database_url = f"sqlite:///{path}"
+    BenchmarkConfig.SQLALCHEMY_DATABASE_URI = database_url
+
+    app = create_app(BenchmarkConfig)
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+
+        started = time.perf_counter()
+        request_ids = generate_dataset(
+            args.tutors, args.students, args.requests, args.slots_per_user, args.seed
+        )
+        print(f"Generated dataset in {time.perf_counter() - started:.2f}s ({database_url})")
+
+        started = time.perf_counter()
+        matching_index.ensure_built()
+        print(f"Built matching index for {len(matching_index.records)} tutors in "
+              f"{(time.perf_counter() - started) * 1000:.1f}ms")
+
+        counter = QueryCounter(db.engine)
+        tracemalloc.start()
+        client = app.test_client()
+        end_to_end: List[float] = []
+        query_counts: List[int] = []
+        for request_id in request_ids:
+            lesson_request = LessonRequest.query.get(request_id)
+            token = create_access_token(
+                identity=lesson_request.student.user_id, additional_claims={"role": "student"}
+            )
+            match_cache.clear()
+            counter.count = 0
+            started = time.perf_counter()
+            response = client.post(
+                f"/matching/lesson-requests/{request_id}/match",
+                headers={"Authorization": f"Bearer {token}"},
+            )
+            end_to_end.append((time.perf_counter() - started) * 1000)
+            query_counts.append(counter.count)
+            if response.status_code != 200:
+                raise SystemExit(f"Match failed for {request_id}: {response.status_code} {response.data!r}")
+
+        stage_samples: Dict[str, List[float]] = defaultdict(list)
+        run_stages(request_ids, stage_samples)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    print(f"match_tutors end-to-end (ms): {_percentiles(end_to_end)}")
+    for stage in STAGES:
+        print(f"  {stage:<14} (ms): {_percentiles(stage_samples[stage])}")
+    print(f"SQL statements per match: min={min(query_counts)} max={max(query_counts)}")
+    print(f"Peak traced memory: {peak / (1024 * 1024):.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""Benchmark login throughput under the configured password hashing policy.
+
+Run from the backend directory::
+
+    python -m benchmarks.password_benchmark
+    python -m benchmarks.password_benchmark --method pbkdf2:sha256:600000 --workers 4 --threads 16
+
+Prints the raw KDF rate of a single core. Then it drives ``POST /auth/login`` from
+``--threads`` client threads twice: first with hashing in the request thread, then
+in a pool of ``--workers`` processes. Before each run the users are recreated with
+``--legacy-method`` hashes, so the first logins of both runs also pay for the
+rehash-on-login upgrade.
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Tuple
+
+from sqlalchemy import insert
+from werkzeug.security import check_password_hash, generate_password_hash
+
+from app import create_app
+from app.extensions import db
+from app.models import User
+from app.services.password_hashing import canonical_method, password_hasher
+from benchmarks.matching_benchmark import BenchmarkConfig
+
+PASSWORD = "benchmark-password"
+
+
+def _percentiles(values: List[float]) -> str:
+    if len(values) < 2:
+        return "n/a"
+    cuts = statistics.quantiles(values, n=100, method="inclusive")
+    return f"p50={cuts[49]:.1f} p95={cuts[94]:.1f} p99={cuts[98]:.1f}"
+
+
+def kdf_rate(method: str, salt_length: int, samples: int) -> float:
+    """Verifications per second of one ``method`` hash on a single core."""
+    password_hash = generate_password_hash(PASSWORD, method, salt_length)
+    started = time.perf_counter()
+    for _ in range(samples):
+        check_password_hash(password_hash, PASSWORD)
+    return samples / (time.perf_counter() - started)
+
+
+def create_users(count: int, method: str) -> List[str]:
+    password_hash = generate_password_hash(PASSWORD, method)
+    emails = [f"bench-{index}@example.com" for index in range(count)]
+    db.session.execute(
+        insert(User),
+        [
+            {"id": str(uuid.uuid4()), "email": email, "password_hash": password_hash, "role": "student"}
+            for email in emails
+        ],
+    )
+    db.session.commit()
+    return emails
+
+
+def run_logins(app, emails: List[str], logins: int, threads: int, seed: int) -> Tuple[float, List[float]]:
+    """Run ``logins`` logins from ``threads`` threads; return (elapsed seconds, latencies in ms)."""
+    rng = random.Random(seed)
+    picks = [rng.choice(emails) for _ in range(logins)]
+
+    def login(email: str) -> float:
+        client = app.test_client()
+        started = time.perf_counter()
+        response = client.post("/auth/login", json={"email": email, "password": PASSWORD})
+        if response.status_code != 200:
+            raise SystemExit(f"Login failed for {email}: {response.status_code} {response.data!r}")
+        return (time.perf_counter() - started) * 1000
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        latencies = list(executor.map(login, picks))
+    return time.perf_counter() - started, latencies
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--method", default=BenchmarkConfig.PASSWORD_HASH_METHOD)
+    parser.add_argument("--legacy-method", default="pbkdf2:sha256:600000")
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--logins", type=int, default=400)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--samples", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    handle, path = tempfile.mkstemp(suffix=".sqlite")
+    os.close(handle)
+    BenchmarkConfig.SQLALCHEMY_DATABASE_URI = f"sqlite:///{path}"
+    BenchmarkConfig.PASSWORD_HASH_METHOD = args.method
+    BenchmarkConfig.METRICS_ENABLED = False
+
+    cores = os.cpu_count() or 1
+    rate = kdf_rate(args.method, BenchmarkConfig.PASSWORD_SALT_LENGTH, args.samples)
+    print(f"{canonical_method(args.method)}: {rate:.1f} verifications/sec on one core")
+
+    app = create_app(BenchmarkConfig)
+    for label, workers in (("request thread", 0), (f"pool of {args.workers}", args.workers)):
+        # Fresh legacy hashes each run, so both runs pay for the same rehash-on-login upgrades.
+        with app.app_context():
+            db.drop_all()
+            db.create_all()
+            emails = create_users(args.users, args.legacy_method)
+        app.config["PASSWORD_HASH_WORKERS"] = workers
+        password_hasher.init_app(app)
+        try:
+            elapsed, latencies = run_logins(app, emails, args.logins, args.threads, args.seed)
+        finally:
+            password_hasher.shutdown()
+        busy_cores = min(workers or args.threads, cores)
+        print(
+            f"login via {label:<16} {args.logins / elapsed:8.1f} logins/sec "
+            f"({args.logins / elapsed / busy_cores:.1f}/sec per core), latency ms: {_percentiles(latencies)}"
+        )
+
+    with app.app_context():
+        upgraded = sum(
+            1 for user in User.query.all() if not password_hasher.needs_rehash(user.password_hash)
+        )
+    print(f"Hashes on the current policy after the run: {upgraded}/{args.users}")
+
+
+if __name__ == "__main__":
+    main()
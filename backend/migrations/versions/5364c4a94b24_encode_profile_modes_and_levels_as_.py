@@ -0,0 +1,122 @@
+"""encode profile modes and levels as bitmasks
+
+Revision ID: 5364c4a94b24
+Revises: fe7ecaa73d7a
+Create Date: 2026-10-18 08:50:23.705375
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5364c4a94b24'
+down_revision = 'fe7ecaa73d7a'
+branch_labels = None
+depends_on = None
+
+# Frozen copies of app.utils.flags so this revision keeps working if the app changes.
+LESSON_MODE_BITS = {"online": 1, "student_home": 2, "tutor_home": 4, "common_place": 8}
+STUDENT_MODE_BITS = {**LESSON_MODE_BITS, "in_person": 16, "hybrid": 32}
+TEACHING_LEVEL_BITS = {"11": 1, "12": 2, "graduate": 4}
+
+# (table, csv column, mask column, bits)
+FLAG_COLUMNS = (
+    ('tutor_profiles', 'lesson_modes', 'lesson_mode_mask', LESSON_MODE_BITS),
+    ('tutor_profiles', 'teaching_levels', 'teaching_level_mask', TEACHING_LEVEL_BITS),
+    ('student_profiles', 'preferred_modes', 'preferred_mode_mask', STUDENT_MODE_BITS),
+)
+
+
+def _mode_condition(bit):
+    return sa.text(f"status = 'approved' AND (lesson_mode_mask & {bit}) != 0")
+
+
+def _items(value):
+    return [item.strip() for item in (value or "").split(",") if item.strip()]
+
+
+def _encode(value, bits):
+    mask = 0
+    for item in _items(value):
+        mask |= bits[item]
+    return mask
+
+
+def _unmappable_values():
+    bind = op.get_bind()
+    problems = []
+    for table, column, _, bits in FLAG_COLUMNS:
+        rows = bind.execute(sa.text(f"SELECT id, {column} FROM {table} WHERE {column} IS NOT NULL"))
+        for row_id, value in rows.fetchall():
+            unknown = [item for item in _items(value) if item not in bits]
+            if unknown:
+                problems.append(f"{table}.{column} {row_id}: {', '.join(unknown)}")
+    return problems
+
+
+def _decode(mask, bits):
+    return ",".join(item for item, bit in bits.items() if (mask or 0) & bit) or None
+
+
+def _copy_flags(source_index, target_index, convert):
+    bind = op.get_bind()
+    for flag_column in FLAG_COLUMNS:
+        table, bits = flag_column[0], flag_column[3]
+        source, target = flag_column[source_index], flag_column[target_index]
+        rows = bind.execute(sa.text(f"SELECT id, {source} FROM {table} WHERE {source} IS NOT NULL"))
+        for row_id, value in rows.fetchall():
+            bind.execute(
+                sa.text(f"UPDATE {table} SET {target} = :value WHERE id = :id"),
+                {"value": convert(value, bits), "id": row_id},
+            )
+
+
+def upgrade():
+    # A bitmask cannot hold values outside the known sets; fix those rows first.
+    problems = _unmappable_values()
+    if problems:
+        raise RuntimeError(
+            "Cannot encode profile flags, unknown values in:\n  " + "\n  ".join(problems)
+        )
+
+    with op.batch_alter_table('student_profiles', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('preferred_mode_mask', sa.Integer(), server_default='0', nullable=False))
+
+    with op.batch_alter_table('tutor_profiles', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('lesson_mode_mask', sa.Integer(), server_default='0', nullable=False))
+        batch_op.add_column(sa.Column('teaching_level_mask', sa.Integer(), server_default='0', nullable=False))
+
+    _copy_flags(1, 2, _encode)
+
+    with op.batch_alter_table('student_profiles', schema=None) as batch_op:
+        batch_op.drop_column('preferred_modes')
+
+    with op.batch_alter_table('tutor_profiles', schema=None) as batch_op:
+        for mode, bit in LESSON_MODE_BITS.items():
+            batch_op.create_index(
+                f'ix_tutor_profiles_approved_{mode}', ['id'], unique=False,
+                postgresql_where=_mode_condition(bit), sqlite_where=_mode_condition(bit),
+            )
+        batch_op.drop_column('teaching_levels')
+        batch_op.drop_column('lesson_modes')
+
+
+def downgrade():
+    with op.batch_alter_table('tutor_profiles', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('lesson_modes', sa.VARCHAR(length=255), nullable=True))
+        batch_op.add_column(sa.Column('teaching_levels', sa.VARCHAR(length=255), nullable=True))
+        for mode in LESSON_MODE_BITS:
+            batch_op.drop_index(f'ix_tutor_profiles_approved_{mode}')
+
+    with op.batch_alter_table('student_profiles', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('preferred_modes', sa.VARCHAR(length=255), nullable=True))
+
+    _copy_flags(2, 1, _decode)
+
+    with op.batch_alter_table('tutor_profiles', schema=None) as batch_op:
+        batch_op.drop_column('teaching_level_mask')
+        batch_op.drop_column('lesson_mode_mask')
+
+    with op.batch_alter_table('student_profiles', schema=None) as batch_op:
+        batch_op.drop_column('preferred_mode_mask')
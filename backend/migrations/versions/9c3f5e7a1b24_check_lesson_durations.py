@@ -0,0 +1,52 @@
+"""check lesson durations
+
+Revision ID: 9c3f5e7a1b24
+Revises: 72183ffb38c1
+Create Date: 2026-10-18 09:31:40.218406
+
+"""
+from datetime import timedelta
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9c3f5e7a1b24'
+down_revision = '72183ffb38c1'
+branch_labels = None
+depends_on = None
+
+# Frozen copy of app.services.booking.MAX_LESSON_MINUTES. Overlap checks only look
+# that far back for a lesson's start, so no stored lesson may be longer.
+MAX_LESSON_MINUTES = 240
+
+lessons = sa.table(
+    'lessons',
+    sa.column('id', sa.String),
+    sa.column('start_datetime', sa.DateTime),
+    sa.column('end_datetime', sa.DateTime),
+)
+
+
+def _overlong_lessons():
+    rows = op.get_bind().execute(sa.select(lessons.c.id, lessons.c.start_datetime, lessons.c.end_datetime))
+    limit = timedelta(minutes=MAX_LESSON_MINUTES)
+    return [
+        f"{row_id}: {start.isoformat()} - {end.isoformat()}"
+        for row_id, start, end in rows.fetchall()
+        if end - start > limit
+    ]
+
+
+def upgrade():
+    # Shorten or split these lessons first; a longer one would escape conflict checks.
+    problems = _overlong_lessons()
+    if problems:
+        raise RuntimeError(
+            f"Lessons longer than {MAX_LESSON_MINUTES} minutes:\n  " + "\n  ".join(problems)
+        )
+
+
+def downgrade():
+    pass
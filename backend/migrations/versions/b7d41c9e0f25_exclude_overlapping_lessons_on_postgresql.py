@@ -0,0 +1,65 @@
+"""exclude overlapping lessons on postgresql
+
+Revision ID: b7d41c9e0f25
+Revises: ea2b2235d8b3
+Create Date: 2026-10-18 09:02:41.118204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b7d41c9e0f25'
+down_revision = 'ea2b2235d8b3'
+branch_labels = None
+depends_on = None
+
+# Matches app.services.booking.BLOCKING_LESSON_STATUSES: cancelled lessons free their slot.
+CONSTRAINTS = (
+    ('ex_lessons_tutor_no_overlap', 'tutor_id'),
+    ('ex_lessons_student_no_overlap', 'student_id'),
+)
+
+
+def _overlapping_lessons(bind, column):
+    return bind.execute(sa.text(
+        f"SELECT a.id, b.id FROM lessons a JOIN lessons b "
+        f"ON a.{column} = b.{column} AND a.id < b.id "
+        f"AND a.start_datetime < b.end_datetime AND b.start_datetime < a.end_datetime "
+        f"WHERE a.status <> 'cancelled' AND b.status <> 'cancelled' "
+        f"ORDER BY a.id, b.id"
+    )).fetchall()
+
+
+def upgrade():
+    # Other databases rely on the application-level check in app.services.booking.
+    bind = op.get_bind()
+    if bind.dialect.name != 'postgresql':
+        return
+
+    conflicts = []
+    for _, column in CONSTRAINTS:
+        conflicts.extend(
+            f"{column}: {first} overlaps {second}" for first, second in _overlapping_lessons(bind, column)
+        )
+    if conflicts:
+        raise RuntimeError(
+            "Cannot add the lesson overlap constraints; cancel or reschedule these "
+            "overlapping lessons first:\n  " + "\n  ".join(conflicts)
+        )
+
+    op.execute('CREATE EXTENSION IF NOT EXISTS btree_gist')
+    for name, column in CONSTRAINTS:
+        op.execute(
+            f"ALTER TABLE lessons ADD CONSTRAINT {name} EXCLUDE USING gist "
+            f"({column} WITH =, tsrange(start_datetime, end_datetime) WITH &&) "
+            f"WHERE (status <> 'cancelled')"
+        )
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    for name, _ in CONSTRAINTS:
+        op.execute(f'ALTER TABLE lessons DROP CONSTRAINT IF EXISTS {name}')
@@ -0,0 +1,47 @@
+"""add match suggestions table
+
+Revision ID: c4e8a1d2b7f3
+Revises: 2a021d9e3c7c
+Create Date: 2026-10-18 08:47:02.118204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c4e8a1d2b7f3'
+down_revision = '2a021d9e3c7c'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Databases created before this revision was split out of the initial schema
+    # already have the table.
+    if 'match_suggestions' in sa.inspect(op.get_bind()).get_table_names():
+        return
+
+    op.create_table('match_suggestions',
+    sa.Column('id', sa.String(length=36), nullable=False),
+    sa.Column('lesson_request_id', sa.String(length=36), nullable=False),
+    sa.Column('tutor_id', sa.String(length=36), nullable=False),
+    sa.Column('rank', sa.Integer(), nullable=False),
+    sa.Column('score', sa.Float(), nullable=False),
+    sa.Column('has_availability_overlap', sa.Boolean(), nullable=False),
+    sa.Column('overlap_minutes', sa.Integer(), nullable=False),
+    sa.Column('suggested_slots', sa.JSON(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['lesson_request_id'], ['lesson_requests.id'], ),
+    sa.ForeignKeyConstraint(['tutor_id'], ['tutor_profiles.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('match_suggestions', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_match_suggestions_lesson_request_id'), ['lesson_request_id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('match_suggestions', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_match_suggestions_lesson_request_id'))
+
+    op.drop_table('match_suggestions')
@@ -0,0 +1,71 @@
+"""add indexes for hot query paths
+
+Revision ID: ea2b2235d8b3
+Revises: 5364c4a94b24
+Create Date: 2026-10-18 08:51:53.805311
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'ea2b2235d8b3'
+down_revision = '5364c4a94b24'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('availability_slots', schema=None) as batch_op:
+        batch_op.create_index('ix_availability_slots_user_day', ['user_id', 'day_of_week', 'start_time'], unique=False)
+
+    with op.batch_alter_table('lesson_requests', schema=None) as batch_op:
+        batch_op.create_index('ix_lesson_requests_status_created', ['status', 'created_at'], unique=False)
+        batch_op.create_index('ix_lesson_requests_student_created', ['student_id', 'created_at'], unique=False)
+
+    with op.batch_alter_table('lessons', schema=None) as batch_op:
+        batch_op.create_index('ix_lessons_start_datetime', ['start_datetime'], unique=False)
+        batch_op.create_index('ix_lessons_student_start', ['student_id', 'start_datetime'], unique=False)
+        batch_op.create_index('ix_lessons_tutor_start', ['tutor_id', 'start_datetime'], unique=False)
+
+    with op.batch_alter_table('tutor_districts', schema=None) as batch_op:
+        batch_op.create_index('ix_tutor_districts_district_tutor', ['district', 'tutor_id'], unique=False)
+        batch_op.create_index('ix_tutor_districts_tutor_district', ['tutor_id', 'district'], unique=False)
+
+    with op.batch_alter_table('tutor_profiles', schema=None) as batch_op:
+        batch_op.create_index('ix_tutor_profiles_approved', ['id'], unique=False, postgresql_where=sa.text("status = 'approved'"), sqlite_where=sa.text("status = 'approved'"))
+
+    # Drop duplicate tutor/subject pairs so the unique constraint can be created.
+    op.execute(
+        "DELETE FROM tutor_subjects WHERE id NOT IN "
+        "(SELECT MIN(id) FROM tutor_subjects GROUP BY tutor_id, subject_id)"
+    )
+    with op.batch_alter_table('tutor_subjects', schema=None) as batch_op:
+        batch_op.create_index('ix_tutor_subjects_subject_tutor', ['subject_id', 'tutor_id'], unique=False)
+        batch_op.create_unique_constraint('uq_tutor_subjects_tutor_subject', ['tutor_id', 'subject_id'])
+
+
+def downgrade():
+    with op.batch_alter_table('tutor_subjects', schema=None) as batch_op:
+        batch_op.drop_constraint('uq_tutor_subjects_tutor_subject', type_='unique')
+        batch_op.drop_index('ix_tutor_subjects_subject_tutor')
+
+    with op.batch_alter_table('tutor_profiles', schema=None) as batch_op:
+        batch_op.drop_index('ix_tutor_profiles_approved', postgresql_where=sa.text("status = 'approved'"), sqlite_where=sa.text("status = 'approved'"))
+
+    with op.batch_alter_table('tutor_districts', schema=None) as batch_op:
+        batch_op.drop_index('ix_tutor_districts_tutor_district')
+        batch_op.drop_index('ix_tutor_districts_district_tutor')
+
+    with op.batch_alter_table('lessons', schema=None) as batch_op:
+        batch_op.drop_index('ix_lessons_tutor_start')
+        batch_op.drop_index('ix_lessons_student_start')
+        batch_op.drop_index('ix_lessons_start_datetime')
+
+    with op.batch_alter_table('lesson_requests', schema=None) as batch_op:
+        batch_op.drop_index('ix_lesson_requests_student_created')
+        batch_op.drop_index('ix_lesson_requests_status_created')
+
+    with op.batch_alter_table('availability_slots', schema=None) as batch_op:
+        batch_op.drop_index('ix_availability_slots_user_day')
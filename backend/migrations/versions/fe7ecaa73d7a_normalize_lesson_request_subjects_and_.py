@@ -0,0 +1,130 @@
+"""normalize lesson request subjects and modes
+
+Revision ID: fe7ecaa73d7a
+Revises: c4e8a1d2b7f3
+Create Date: 2026-10-18 08:47:04.046116
+
+"""
+import uuid
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'fe7ecaa73d7a'
+down_revision = 'c4e8a1d2b7f3'
+branch_labels = None
+depends_on = None
+
+
+def _split_csv(value):
+    if not value:
+        return []
+    return list(dict.fromkeys(item.strip() for item in value.split(",") if item.strip()))
+
+
+def _unknown_subject_ids():
+    bind = op.get_bind()
+    known_subjects = {row[0] for row in bind.execute(sa.text("SELECT id FROM subjects"))}
+    problems = []
+    rows = bind.execute(sa.text("SELECT id, subject_ids FROM lesson_requests WHERE subject_ids IS NOT NULL"))
+    for request_id, subject_ids in rows.fetchall():
+        unknown = [subject_id for subject_id in _split_csv(subject_ids) if subject_id not in known_subjects]
+        if unknown:
+            problems.append(f"lesson_requests {request_id}: {', '.join(unknown)}")
+    return problems
+
+
+def upgrade():
+    # The link table has a foreign key to subjects and the CSV column is dropped
+    # below, so rows naming unknown subjects must be fixed first.
+    problems = _unknown_subject_ids()
+    if problems:
+        raise RuntimeError(
+            "Cannot normalize lesson request subjects, unknown subject ids in:\n  " + "\n  ".join(problems)
+        )
+
+    op.create_table('lesson_request_modes',
+    sa.Column('id', sa.String(length=36), nullable=False),
+    sa.Column('lesson_request_id', sa.String(length=36), nullable=False),
+    sa.Column('mode', sa.String(length=50), nullable=False),
+    sa.ForeignKeyConstraint(['lesson_request_id'], ['lesson_requests.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('lesson_request_id', 'mode')
+    )
+    with op.batch_alter_table('lesson_request_modes', schema=None) as batch_op:
+        batch_op.create_index('ix_lesson_request_modes_mode_request', ['mode', 'lesson_request_id'], unique=False)
+
+    op.create_table('lesson_request_subjects',
+    sa.Column('id', sa.String(length=36), nullable=False),
+    sa.Column('lesson_request_id', sa.String(length=36), nullable=False),
+    sa.Column('subject_id', sa.String(length=36), nullable=False),
+    sa.ForeignKeyConstraint(['lesson_request_id'], ['lesson_requests.id'], ),
+    sa.ForeignKeyConstraint(['subject_id'], ['subjects.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('lesson_request_id', 'subject_id')
+    )
+    with op.batch_alter_table('lesson_request_subjects', schema=None) as batch_op:
+        batch_op.create_index('ix_lesson_request_subjects_subject_request', ['subject_id', 'lesson_request_id'], unique=False)
+
+    # Backfill the link tables from the CSV columns before dropping them.
+    bind = op.get_bind()
+    subject_rows, mode_rows = [], []
+    for request_id, subject_ids, preferred_modes in bind.execute(
+        sa.text("SELECT id, subject_ids, preferred_modes FROM lesson_requests")
+    ):
+        for subject_id in _split_csv(subject_ids):
+            subject_rows.append(
+                {"id": str(uuid.uuid4()), "lesson_request_id": request_id, "subject_id": subject_id}
+            )
+        for mode in _split_csv(preferred_modes):
+            mode_rows.append({"id": str(uuid.uuid4()), "lesson_request_id": request_id, "mode": mode})
+
+    subjects_table = sa.table(
+        'lesson_request_subjects',
+        sa.column('id', sa.String), sa.column('lesson_request_id', sa.String), sa.column('subject_id', sa.String),
+    )
+    modes_table = sa.table(
+        'lesson_request_modes',
+        sa.column('id', sa.String), sa.column('lesson_request_id', sa.String), sa.column('mode', sa.String),
+    )
+    if subject_rows:
+        op.bulk_insert(subjects_table, subject_rows)
+    if mode_rows:
+        op.bulk_insert(modes_table, mode_rows)
+
+    with op.batch_alter_table('lesson_requests', schema=None) as batch_op:
+        batch_op.drop_column('subject_ids')
+        batch_op.drop_column('preferred_modes')
+
+
+def downgrade():
+    with op.batch_alter_table('lesson_requests', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('preferred_modes', sa.TEXT(), nullable=True))
+        batch_op.add_column(sa.Column('subject_ids', sa.TEXT(), nullable=True))
+
+    bind = op.get_bind()
+    for column, table, value_column in (
+        ('subject_ids', 'lesson_request_subjects', 'subject_id'),
+        ('preferred_modes', 'lesson_request_modes', 'mode'),
+    ):
+        values = {}
+        for request_id, value in bind.execute(
+            sa.text(f"SELECT lesson_request_id, {value_column} FROM {table}")
+        ):
+            values.setdefault(request_id, []).append(value)
+        for request_id, items in values.items():
+            bind.execute(
+                sa.text(f"UPDATE lesson_requests SET {column} = :value WHERE id = :id"),
+                {"value": ",".join(items), "id": request_id},
+            )
+
+    with op.batch_alter_table('lesson_request_subjects', schema=None) as batch_op:
+        batch_op.drop_index('ix_lesson_request_subjects_subject_request')
+
+    op.drop_table('lesson_request_subjects')
+    with op.batch_alter_table('lesson_request_modes', schema=None) as batch_op:
+        batch_op.drop_index('ix_lesson_request_modes_mode_request')
+
+    op.drop_table('lesson_request_modes')
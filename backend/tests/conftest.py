@@ -0,0 +1,105 @@
+import itertools
+
+import pytest
+from flask_jwt_extended import create_access_token
+from sqlalchemy import event
+
+from app import create_app
+from app.extensions import db
+from app.models import StudentProfile, TutorProfile, User
+from app.utils.identity import claims_for_user
+
+
+class TestConfig:
+    TESTING = True
+    SQLALCHEMY_DATABASE_URI = "sqlite://"
+    SQLALCHEMY_TRACK_MODIFICATIONS = False
+    JWT_SECRET_KEY = "test-secret-key-that-is-long-enough"
+    PASSWORD_HASH_METHOD = "pbkdf2:sha256:1000"
+    SUBJECT_CATALOG_PRELOAD = False
+    METRICS_ENABLED = False
+
+
+@pytest.fixture
+def app():
+    app = create_app(TestConfig)
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+_emails = itertools.count()
+
+
+def _user(role: str) -> User:
+    user = User(email=f"{role}-{next(_emails)}@example.com", password_hash="x", role=role)
+    db.session.add(user)
+    db.session.flush()
+    return user
+
+
+@pytest.fixture
+def make_student(app):
+    def make(district: str = "Kadıköy", **fields) -> StudentProfile:
+        fields.setdefault("full_name", "Öğrenci")
+        profile = StudentProfile(user_id=_user("student").id, district=district, **fields)
+        db.session.add(profile)
+        db.session.commit()
+        return profile
+
+    return make
+
+
+@pytest.fixture
+def make_tutor(app):
+    def make(district: str = "Kadıköy", **fields) -> TutorProfile:
+        fields.setdefault("full_name", "Öğretmen")
+        fields.setdefault("hourly_rate", 500)
+        fields.setdefault("status", "approved")
+        profile = TutorProfile(user_id=_user("tutor").id, base_district=district, **fields)
+        db.session.add(profile)
+        db.session.commit()
+        return profile
+
+    return make
+
+
+@pytest.fixture
+def auth_headers(app):
+    """``Authorization`` headers for a user, with the claims login would issue."""
+
+    def headers(user: User) -> dict:
+        token = create_access_token(identity=user.id, additional_claims=claims_for_user(user))
+        return {"Authorization": f"Bearer {token}"}
+
+    return headers
+
+
+class StatementCounter:
+    def __init__(self) -> None:
+        self.count = 0
+
+    def __call__(self, *args) -> None:
+        self.count += 1
+
+
+@pytest.fixture
+def count_statements(app):
+    """Call with a function; returns how many SQL statements it executed."""
+    counter = StatementCounter()
+    event.listen(db.engine, "before_cursor_execute", counter)
+
+    def count(fn) -> int:
+        counter.count = 0
+        fn()
+        return counter.count
+
+    yield count
+    event.remove(db.engine, "before_cursor_execute", counter)
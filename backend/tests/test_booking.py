@@ -0,0 +1,142 @@
+from datetime import datetime, time
+
+import pytest
+
+from app.extensions import db
+from app.models import AvailabilitySlot, Subject
+
+
+@pytest.fixture
+def subject_id(app):
+    subject = Subject(name="Kimya")
+    db.session.add(subject)
+    db.session.commit()
+    return subject.id
+
+
+def _publish(user_id, *windows):
+    db.session.add_all(
+        AvailabilitySlot(user_id=user_id, day_of_week=day, start_time=start, end_time=end)
+        for day, start, end in windows
+    )
+    db.session.commit()
+
+
+def _slots(client, headers, tutor_id, limit=10):
+    response = client.get(
+        "/lessons/bookable-slots",
+        headers=headers,
+        query_string={"tutor_id": tutor_id, "duration": 60, "limit": limit},
+    )
+    assert response.status_code == 200
+    return response.get_json()
+
+
+def _at(slot, hour):
+    """``slot`` moved to start at ``hour`` on the same day, keeping its length."""
+    start = datetime.fromisoformat(slot["start_datetime"])
+    end = datetime.fromisoformat(slot["end_datetime"])
+    moved = datetime.combine(start.date(), time(hour))
+    return {"start_datetime": moved.isoformat(), "end_datetime": (moved + (end - start)).isoformat()}
+
+
+def _book(client, headers, tutor_id, subject_id, slot):
+    return client.post(
+        "/lessons",
+        headers=headers,
+        json={"tutor_id": tutor_id, "subject_id": subject_id, "mode": "online", **slot},
+    )
+
+
+@pytest.mark.parametrize("tutor_publishes", [True, False], ids=["published", "unpublished"])
+@pytest.mark.parametrize("student_publishes", [True, False], ids=["student-set", "student-unset"])
+def test_every_offered_slot_can_be_booked(
+    client, make_student, make_tutor, auth_headers, subject_id, tutor_publishes, student_publishes
+):
+    tutor, student = make_tutor(), make_student()
+    if tutor_publishes:
+        _publish(tutor.user_id, *((day, time(10), time(13)) for day in range(7)))
+    if student_publishes:
+        _publish(student.user_id, *((day, time(11), time(18)) for day in range(7)))
+    tutor_id, headers = tutor.id, auth_headers(student.user)
+
+    booked = []
+    for _ in range(6):
+        # Offered slots overlap each other, so book the first and ask again.
+        slots = _slots(client, headers, tutor_id)
+        assert slots and slots[0] not in booked
+        assert _book(client, headers, tutor_id, subject_id, slots[0]).status_code == 201
+        booked.append(slots[0])
+
+
+def test_time_outside_published_availability_is_rejected(
+    client, make_student, make_tutor, auth_headers, subject_id
+):
+    tutor, student = make_tutor(), make_student()
+    _publish(tutor.user_id, *((day, time(10), time(13)) for day in range(7)))
+    tutor_id, headers = tutor.id, auth_headers(student.user)
+    slot = _slots(client, headers, tutor_id, limit=1)[0]
+    response = _book(client, headers, tutor_id, subject_id, _at(slot, 20))
+
+    assert response.status_code == 409
+    assert "availability" in response.get_json()["errors"]
+
+
+def test_status_changes_survive_an_availability_change(
+    client, make_student, make_tutor, auth_headers, subject_id
+):
+    tutor, student = make_tutor(), make_student()
+    _publish(tutor.user_id, *((day, time(10), time(13)) for day in range(7)))
+    tutor_id, tutor_headers, headers = tutor.id, auth_headers(tutor.user), auth_headers(student.user)
+    slot = _slots(client, headers, tutor_id, limit=1)[0]
+    lesson_id = _book(client, headers, tutor_id, subject_id, slot).get_json()["id"]
+
+    # The tutor moves their weekly availability away from the booked time.
+    AvailabilitySlot.query.filter_by(user_id=tutor.user_id).delete()
+    _publish(tutor.user_id, *((day, time(15), time(18)) for day in range(7)))
+
+    for status in ("confirmed", "completed"):
+        response = client.patch(f"/lessons/{lesson_id}", headers=tutor_headers, json={"status": status})
+        assert response.status_code == 200, response.get_json()
+        assert response.get_json()["status"] == status
+
+    response = client.patch(f"/lessons/{lesson_id}", headers=tutor_headers, json=_at(slot, 8))
+    assert response.status_code == 409
+    assert "availability" in response.get_json()["errors"]
+
+
+def test_uncancelling_still_checks_overlaps(client, make_student, make_tutor, auth_headers, subject_id):
+    tutor, student = make_tutor(), make_student()
+    tutor_id, tutor_headers, headers = tutor.id, auth_headers(tutor.user), auth_headers(student.user)
+    slot = _slots(client, headers, tutor_id, limit=1)[0]
+    first = _book(client, headers, tutor_id, subject_id, slot).get_json()["id"]
+    client.patch(f"/lessons/{first}", headers=tutor_headers, json={"status": "cancelled"})
+    assert _book(client, headers, tutor_id, subject_id, slot).status_code == 201
+
+    response = client.patch(f"/lessons/{first}", headers=tutor_headers, json={"status": "pending"})
+
+    assert response.status_code == 409
+    assert "tutor_id" in response.get_json()["errors"]
+
+
+def test_the_longest_lesson_still_blocks_its_last_minutes(
+    client, make_student, make_tutor, auth_headers, subject_id
+):
+    tutor, student = make_tutor(), make_student()
+    tutor_id, headers = tutor.id, auth_headers(student.user)
+    day = datetime.fromisoformat(_slots(client, headers, tutor_id, limit=1)[0]["start_datetime"]).date()
+    longest = {
+        "start_datetime": datetime.combine(day, time(8)).isoformat(),
+        "end_datetime": datetime.combine(day, time(12)).isoformat(),
+    }
+    assert _book(client, headers, tutor_id, subject_id, longest).status_code == 201
+
+    overlapping = {
+        "start_datetime": datetime.combine(day, time(11, 30)).isoformat(),
+        "end_datetime": datetime.combine(day, time(12, 30)).isoformat(),
+    }
+
+    response = _book(client, headers, tutor_id, subject_id, overlapping)
+
+    assert response.status_code == 409
+    assert "tutor_id" in response.get_json()["errors"]
@@ -0,0 +1,59 @@
+import time
+
+from app.extensions import db
+from app.models import MatchSuggestion, User
+from app.services.bulk_matching import bulk_matching_jobs
+from benchmarks.matching_benchmark import generate_dataset
+
+
+def _wait_for(job_id: str, timeout: float = 60) -> dict:
+    # Poll the registry, not the API: the test thread must stay off the database
+    # while the job uses the shared in-memory connection.
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = bulk_matching_jobs.get(job_id)
+        if job["status"] not in {"queued", "running"}:
+            return job
+        time.sleep(0.05)
+    raise AssertionError(f"bulk matching job {job_id} did not finish")
+
+
+def test_bulk_matching_runs_in_the_background(app, client, auth_headers):
+    request_ids = generate_dataset(tutors=60, students=20, requests=10, slots_per_user=3, seed=7)
+    admin = User(email="admin@example.com", password_hash="x", role="admin")
+    db.session.add(admin)
+    db.session.commit()
+    headers = auth_headers(admin)
+
+    response = client.post("/matching/bulk", headers=headers, json={"workers": 64, "limit": 3})
+
+    assert response.status_code == 202
+    job = response.get_json()
+    assert job["workers"] == bulk_matching_jobs.max_workers
+    assert response.headers["Location"].endswith(f"/matching/bulk/{job['id']}")
+
+    finished = _wait_for(job["id"])
+    assert finished["status"] == "succeeded", finished["error"]
+    assert finished["result"]["requests"] == len(request_ids)
+
+    response = client.get(f"/matching/bulk/{job['id']}", headers=headers)
+    assert response.status_code == 200
+    assert response.get_json()["result"] == finished["result"]
+    assert MatchSuggestion.query.count() == finished["result"]["suggestions"] > 0
+
+
+def test_bulk_matching_allows_one_run_at_a_time(app, client, auth_headers, monkeypatch):
+    admin = User(email="admin@example.com", password_hash="x", role="admin")
+    db.session.add(admin)
+    db.session.commit()
+    headers = auth_headers(admin)
+    # Keep the first job queued by never starting it.
+    monkeypatch.setattr(bulk_matching_jobs, "_run", lambda *args: None)
+
+    first = client.post("/matching/bulk", headers=headers, json={})
+    second = client.post("/matching/bulk", headers=headers, json={})
+
+    assert first.status_code == 202
+    assert second.status_code == 409
+    assert second.get_json()["job"]["id"] == first.get_json()["id"]
+    assert client.get("/matching/bulk/unknown", headers=headers).status_code == 404
@@ -0,0 +1,53 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.api.lessons import DEFAULT_LESSON_LIMIT
+from app.extensions import db
+from app.models import Lesson, Subject
+
+
+@pytest.fixture
+def student_headers(make_student, make_tutor, auth_headers):
+    student, tutor = make_student(), make_tutor()
+    subject = Subject(name="Fizik")
+    db.session.add(subject)
+    db.session.flush()
+    start = datetime(2030, 1, 7, 9, 0)
+    db.session.add_all(
+        Lesson(
+            tutor_id=tutor.id,
+            student_id=student.id,
+            subject_id=subject.id,
+            start_datetime=start + timedelta(hours=index),
+            end_datetime=start + timedelta(hours=index, minutes=45),
+            mode="online",
+        )
+        for index in range(DEFAULT_LESSON_LIMIT + 10)
+    )
+    db.session.commit()
+    return auth_headers(student.user)
+
+
+def test_unpaged_request_returns_every_lesson(client, student_headers):
+    response = client.get("/lessons/me", headers=student_headers)
+
+    assert response.status_code == 200
+    assert len(response.get_json()) == DEFAULT_LESSON_LIMIT + 10
+    assert "X-Next-Cursor" not in response.headers
+
+
+def test_paged_requests_walk_every_lesson_once(client, student_headers):
+    seen, cursor = [], None
+    while True:
+        query_string = {"limit": 25, **({"cursor": cursor} if cursor else {})}
+        response = client.get("/lessons/me", headers=student_headers, query_string=query_string)
+        assert response.status_code == 200
+        page = response.get_json()
+        assert len(page) <= 25
+        seen += [lesson["id"] for lesson in page]
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+
+    assert len(seen) == len(set(seen)) == DEFAULT_LESSON_LIMIT + 10
@@ -0,0 +1,87 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.extensions import db
+from app.models import Lesson, Subject
+
+
+def _book(student, tutor, subject, start):
+    lesson = Lesson(
+        tutor_id=tutor.id,
+        student_id=student.id,
+        subject_id=subject.id,
+        start_datetime=start,
+        end_datetime=start + timedelta(minutes=45),
+        mode="online",
+    )
+    db.session.add(lesson)
+    return lesson
+
+
+@pytest.fixture
+def parties(make_student, make_tutor, auth_headers):
+    """A student and a tutor with one lesson each, and another pair with fifty.
+
+    Every lesson has its own counterpart and subject, so a per-row lazy load of
+    any related name would show up as extra statements.
+    """
+    result = {}
+    for size in (1, 50):
+        student, tutor = make_student(), make_tutor()
+        lessons = {"student": [], "tutor": []}
+        for index in range(size):
+            start = datetime(2030, 1, 7, 9, 0) + timedelta(hours=index)
+            subject = Subject(name=f"Ders {size}-{index}")
+            db.session.add(subject)
+            db.session.flush()
+            lessons["student"].append(_book(student, make_tutor(), subject, start))
+            lessons["tutor"].append(_book(make_student(), tutor, subject, start))
+        db.session.commit()
+        result[size] = {
+            "headers": {"student": auth_headers(student.user), "tutor": auth_headers(tutor.user)},
+            "lesson_ids": {role: [lesson.id for lesson in rows] for role, rows in lessons.items()},
+        }
+    # Requests share the test's app context; start them from an empty session.
+    db.session.remove()
+    return result
+
+
+def _count_per_size(parties, count_statements, request):
+    counts = {}
+    for size, party in parties.items():
+        request(party, warm_up=True)
+        db.session.remove()
+        counts[size] = count_statements(lambda: request(party))
+        db.session.remove()
+    return counts
+
+
+@pytest.mark.parametrize("role", ["student", "tutor"])
+def test_list_my_lessons_query_count_is_independent_of_lesson_count(
+    client, parties, count_statements, role
+):
+    def request(party, warm_up=False):
+        # The warm-up loads the subject catalog and other lazily built state.
+        query_string = {"status": "cancelled"} if warm_up else {}
+        response = client.get("/lessons/me", headers=party["headers"][role], query_string=query_string)
+        assert response.status_code == 200
+        if not warm_up:
+            assert len(response.get_json()) == len(party["lesson_ids"][role])
+
+    counts = _count_per_size(parties, count_statements, request)
+    assert counts[1] == counts[50]
+
+
+@pytest.mark.parametrize("role", ["student", "tutor"])
+def test_get_lesson_query_count_is_independent_of_lesson_count(
+    client, parties, count_statements, role
+):
+    def request(party, warm_up=False):
+        lesson_id = party["lesson_ids"][role][0 if warm_up else -1]
+        response = client.get(f"/lessons/{lesson_id}", headers=party["headers"][role])
+        assert response.status_code == 200
+        assert response.get_json()["subject_name"]
+
+    counts = _count_per_size(parties, count_statements, request)
+    assert counts[1] == counts[50]
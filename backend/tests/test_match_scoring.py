@@ -0,0 +1,109 @@
+import random
+from typing import List, Optional
+
+import numpy as np
+import pytest
+
+from app.services.match_scoring import score_candidates, select_top_k
+from app.services.matching_index import TutorRecord
+
+DISTRICTS = ["Kadıköy", "Beşiktaş", "Üsküdar", "Şişli", "Ataşehir"]
+
+
+def baseline_score(
+    record: TutorRecord,
+    student_district: Optional[str],
+    budget_min: Optional[float],
+    budget_max: Optional[float],
+    has_overlap: bool,
+) -> float:
+    """The per-tutor scoring loop from the original ``match_tutors`` view."""
+    score = 50.0
+    if record.base_district == student_district:
+        score += 30
+    elif student_district in record.districts:
+        score += 20
+
+    if budget_min is not None and budget_max is not None and record.hourly_rate is not None:
+        hourly_rate = float(record.hourly_rate)
+        if budget_min <= hourly_rate <= budget_max:
+            score += 20
+        else:
+            lower_bound = budget_min * 0.8
+            upper_bound = budget_max * 1.2
+            if lower_bound <= hourly_rate <= upper_bound:
+                score += 5
+
+    if has_overlap:
+        score += 20
+
+    if record.avg_rating is not None and record.rating_count is not None:
+        if record.avg_rating >= 4.5 and record.rating_count >= 5:
+            score += 10
+        elif record.avg_rating >= 4.0 and record.rating_count >= 3:
+            score += 5
+    return score
+
+
+def random_record(rng: random.Random, index: int, budget: List[float]) -> TutorRecord:
+    # Rates cluster on the budget edges so the inclusive bounds are exercised.
+    edges = budget + [budget[0] * 0.8, budget[1] * 1.2]
+    rate = rng.choice([None, rng.choice(edges), round(rng.uniform(100, 1500), 2)])
+    return TutorRecord(
+        tutor_id=f"tutor-{index}",
+        user_id=f"user-{index}",
+        base_district=rng.choice(DISTRICTS),
+        districts=frozenset(rng.sample(DISTRICTS, rng.randint(0, 3))),
+        lesson_mode_mask=1,
+        subject_ids=frozenset({"1"}),
+        hourly_rate=rate,
+        avg_rating=rng.choice([None, 3.9, 4.0, 4.2, 4.5, 4.9]),
+        rating_count=rng.choice([None, 0, 2, 3, 4, 5, 12]),
+        slots=(),
+        availability_mask=0,
+    )
+
+
+def random_case(seed: int):
+    rng = random.Random(seed)
+    budget_min = float(rng.choice([300, 450, 500]))
+    budget = [budget_min, budget_min + rng.choice([0, 100, 400])]
+    records = [random_record(rng, index, budget) for index in range(rng.randint(0, 80))]
+    if rng.random() < 0.2:
+        budget = [None, budget[1]] if rng.random() < 0.5 else [None, None]
+    overlaps = [rng.random() < 0.5 for _ in records]
+    return records, rng.choice(DISTRICTS + [None]), budget[0], budget[1], overlaps
+
+
+@pytest.mark.parametrize("seed", range(200))
+def test_scores_match_baseline(seed):
+    records, district, budget_min, budget_max, overlaps = random_case(seed)
+
+    scores = score_candidates(
+        records, district, budget_min, budget_max, np.array(overlaps, dtype=bool)
+    )
+
+    expected = [
+        baseline_score(record, district, budget_min, budget_max, overlap)
+        for record, overlap in zip(records, overlaps)
+    ]
+    assert scores.tolist() == expected
+
+
+@pytest.mark.parametrize("seed", range(200))
+@pytest.mark.parametrize("k", [1, 3, 10])
+def test_top_k_matches_baseline_ranking(seed, k):
+    records, district, budget_min, budget_max, overlaps = random_case(seed)
+
+    base_scores = score_candidates(records, district, budget_min, budget_max)
+    ranked = select_top_k(base_scores, lambda position: (overlaps[position], 0), k)
+
+    expected = [
+        baseline_score(record, district, budget_min, budget_max, overlap)
+        for record, overlap in zip(records, overlaps)
+    ]
+    # The baseline sorted by score only; a stable sort keeps ties in candidate order.
+    order = sorted(range(len(records)), key=lambda position: expected[position], reverse=True)[:k]
+    assert [candidate.position for candidate in ranked] == order
+    assert [candidate.score for candidate in ranked] == [expected[position] for position in order]
+    assert [candidate.has_overlap for candidate in ranked] == [overlaps[position] for position in order]
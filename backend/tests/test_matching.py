@@ -0,0 +1,79 @@
+from datetime import time
+
+import pytest
+
+from app.extensions import db
+from app.models import AvailabilitySlot, LessonRequest, Subject, TutorProfile, TutorSubject
+
+
+@pytest.fixture
+def matching_request(make_student, make_tutor, auth_headers):
+    """A four-hours-a-week request whose only tutor shares a single 60-minute window."""
+    subject = Subject(name="Biyoloji")
+    db.session.add(subject)
+    db.session.flush()
+    student = make_student(district="Kadıköy")
+    tutor = make_tutor(district="Kadıköy", hourly_rate=500, lesson_mode_mask=1)
+    db.session.add(TutorSubject(tutor_id=tutor.id, subject_id=subject.id))
+    db.session.add_all(
+        [
+            AvailabilitySlot(user_id=student.user_id, day_of_week=2, start_time=time(17), end_time=time(19)),
+            AvailabilitySlot(user_id=tutor.user_id, day_of_week=2, start_time=time(18), end_time=time(21)),
+        ]
+    )
+    lesson_request = LessonRequest(student_id=student.id, budget_min=400, budget_max=600, weekly_hours=4)
+    lesson_request.set_subject_id_list([subject.id])
+    lesson_request.set_preferred_modes(["online"])
+    db.session.add(lesson_request)
+    db.session.commit()
+    return lesson_request.id, auth_headers(student.user)
+
+
+def _match(client, matching_request, **query_string):
+    request_id, headers = matching_request
+    response = client.post(
+        f"/matching/lesson-requests/{request_id}/match", headers=headers, query_string=query_string
+    )
+    assert response.status_code == 200, response.get_json()
+    return response.get_json()
+
+
+def test_any_shared_window_counts_without_min_minutes(client, matching_request):
+    (match,) = _match(client, matching_request)
+
+    # 50 base + 30 same district + 20 in budget + 20 availability overlap.
+    assert match["score"] == 120
+    assert match["has_availability_overlap"] is True
+    assert match["overlap_minutes"] == 60
+    assert match["suggested_slots"] == [
+        {"day_of_week": 2, "start_time": "18:00:00", "end_time": "19:00:00"}
+    ]
+
+
+def test_min_minutes_requires_a_long_enough_shared_window(client, matching_request):
+    (match,) = _match(client, matching_request, min_minutes=90)
+
+    assert match["score"] == 100
+    assert match["has_availability_overlap"] is False
+    assert match["suggested_slots"] == []
+    assert _match(client, matching_request, min_minutes=60)[0]["has_availability_overlap"] is True
+
+
+def test_min_minutes_is_validated(client, matching_request):
+    request_id, headers = matching_request
+    response = client.post(
+        f"/matching/lesson-requests/{request_id}/match", headers=headers, query_string={"min_minutes": -5}
+    )
+
+    assert response.status_code == 400
+    assert "min_minutes" in response.get_json()["errors"]
+
+
+def test_tutors_that_dropped_the_requested_mode_are_left_out(client, matching_request):
+    assert len(_match(client, matching_request)) == 1
+
+    # Written behind the index's back, as another worker would.
+    TutorProfile.query.update({TutorProfile.lesson_mode_mask: 2})
+    db.session.commit()
+
+    assert _match(client, matching_request) == []
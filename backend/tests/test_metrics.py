@@ -0,0 +1,25 @@
+import pytest
+
+
+def test_metrics_are_off_without_a_token(client):
+    assert client.get("/metrics").status_code == 404
+
+
+@pytest.mark.parametrize("authorization", [None, "Bearer wrong", "scrape-token"])
+def test_metrics_reject_a_missing_or_wrong_token(app, client, authorization):
+    app.config["METRICS_TOKEN"] = "scrape-token"
+    headers = {"Authorization": authorization} if authorization else {}
+
+    response = client.get("/metrics", headers=headers)
+
+    assert response.status_code == 403
+    assert b"http_request" not in response.data
+
+
+def test_metrics_are_served_to_the_scraper(app, client):
+    app.config["METRICS_TOKEN"] = "scrape-token"
+
+    response = client.get("/metrics", headers={"Authorization": "Bearer scrape-token"})
+
+    assert response.status_code == 200
+    assert response.content_type.startswith("text/plain")
@@ -0,0 +1,39 @@
+import time
+from datetime import datetime
+
+from app.extensions import db
+from app.models import RevokedToken
+from app.services.token_revocation import token_revocation
+
+
+def _payload(jti: str) -> dict:
+    return {"jti": jti, "type": "access", "sub": "user-1", "exp": time.time() + 600}
+
+
+def test_revoking_a_token_stored_concurrently_is_not_an_error(app):
+    payload = _payload("jti-raced")
+    # Another worker stored the same token between our check and insert.
+    db.session.add(
+        RevokedToken(
+            jti=payload["jti"],
+            token_type="access",
+            user_id="user-1",
+            expires_at=datetime.utcfromtimestamp(payload["exp"]),
+            created_at=datetime.utcnow(),
+        )
+    )
+    db.session.commit()
+
+    token_revocation.revoke(payload)
+    token_revocation.revoke(payload)
+
+    assert token_revocation.is_revoked(payload["jti"])
+    assert RevokedToken.query.filter_by(jti=payload["jti"]).count() == 1
+
+
+def test_logout_revokes_the_presented_token(client, make_student, auth_headers):
+    headers = auth_headers(make_student().user)
+
+    assert client.post("/auth/logout", headers=headers).status_code == 200
+    assert client.get("/auth/me", headers=headers).status_code == 401
+    assert RevokedToken.query.count() == 1